@@ -1,19 +1,145 @@
-import time
-from google import genai
 import json
-import config
 import os
+import time
+import config
+
+from llm_limiter import is_available, LLMUnavailableError
+from llm_providers import providers, get_api_key
+
+GROQ_SCRIPT_MODEL = "llama-3.3-70b-versatile"
+
+
+class SceneStreamParser:
+    """
+    스트리밍으로 도착하는 JSON 대본에서 "scenes" 배열의 장면 객체가 닫히는 즉시 꺼내는 점진 파서.
+    문자열/이스케이프 상태와 괄호 깊이만 추적하므로 조각마다 전체 텍스트를 다시 파싱하지 않습니다.
+    (```json 같은 앞뒤 군더더기는 괄호 밖이라 무시됨)
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.stack = []            # 열린 괄호들
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.last_string = None    # 직전에 닫힌 문자열 (':'가 오면 키)
+        self.current_key = None    # 지금 값이 시작될 키
+        self.scenes_depth = None   # "scenes" 배열 안의 괄호 깊이 (배열이 끝나면 -1)
+        self.scene_start = None
+        self.count = 0
+
+    def feed(self, chunk: str) -> list:
+        """조각을 추가하고 이번에 완성된 장면 객체들을 반환합니다."""
+        self.buffer += chunk
+        scenes = []
+        while self.pos < len(self.buffer):
+            ch = self.buffer[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    self.last_string = self.buffer[self.string_start + 1:self.pos]
+            elif ch == '"':
+                self.in_string = True
+                self.string_start = self.pos
+            elif ch == ":":
+                self.current_key, self.last_string = self.last_string, None
+            elif ch in "{[":
+                if ch == "[" and self.scenes_depth is None and self.current_key == "scenes":
+                    self.scenes_depth = len(self.stack) + 1
+                elif ch == "{" and self.scenes_depth == len(self.stack):
+                    self.scene_start = self.pos
+                self.stack.append(ch)
+                self.current_key = None
+            elif ch in "}]":
+                if self.stack:
+                    self.stack.pop()
+                if ch == "}" and self.scene_start is not None and len(self.stack) == self.scenes_depth:
+                    try:
+                        scenes.append(json.loads(self.buffer[self.scene_start:self.pos + 1]))
+                        self.count += 1
+                    except ValueError:
+                        pass
+                    self.scene_start = None
+                elif ch == "]" and self.scenes_depth is not None and len(self.stack) == self.scenes_depth - 1:
+                    self.scenes_depth = -1
+            elif ch == ",":
+                self.current_key = None
+            self.pos += 1
+        return scenes
+
+
+def _normalize_scene(i: int, scene: dict, warn: bool = True) -> dict:
+    """장면에 빠진 필드를 기본값으로 채웁니다."""
+    if 'duration' not in scene:
+        if warn:
+            print(f"  Warning: 장면 {i+1}에 'duration'이 없어 기본값(5)으로 설정합니다.")
+        scene['duration'] = 5
+    
+    if 'visual_keywords' not in scene or not isinstance(scene['visual_keywords'], list) or not scene['visual_keywords']:
+        if warn:
+            print(f"  Warning: 장면 {i+1}에 'visual_keywords'가 유효하지 않아 기본값으로 대체합니다.")
+        desc = scene.get('visual_description', 'video')
+        scene['visual_keywords'] = [desc.split()[0]] if desc else ["general"]
+        
+    if 'narration' not in scene:
+        scene['narration'] = ""
+        
+    if 'on_screen_text' not in scene:
+        scene['on_screen_text'] = ""
+    return scene
+
+
+def _notify(callback, *args) -> None:
+    """스트리밍 콜백 호출. 콜백(UI 큐, 미리 준비 등)의 오류가 정상적인 대본 생성을 실패로 만들지 않게 합니다."""
+    try:
+        callback(*args)
+    except Exception as e:
+        print(f"  ⚠️ 대본 스트리밍 콜백 오류 (대본 생성은 계속): {e}")
+
+
+def _request_script(provider: str, model: str, prompt: str, on_scene=None, on_text=None, **options) -> str:
+    """
+    대본 생성 요청. 콜백이 있고 SCRIPT_STREAMING_ENABLED면 스트리밍으로 받으면서
+    장면 객체가 닫힐 때마다 on_scene(장면 인덱스, 장면)을 호출하고,
+    on_text(지금까지 받은 텍스트)는 SCRIPT_STREAM_TEXT_INTERVAL초마다 한 번(+ 마지막에 한 번)만 호출합니다.
+    Returns: 전체 응답 텍스트
+    """
+    if not (on_scene or on_text) or not getattr(config, 'SCRIPT_STREAMING_ENABLED', True):
+        return providers.generate(provider, model, prompt, **options)
+
+    if provider == "groq":
+        # Groq JSON 모드는 스트리밍을 지원하지 않음 - 프롬프트의 JSON 지시에 맡기고 마지막에 코드 블록 표시를 걷어냄
+        options["json_mode"] = False
+    text_interval = getattr(config, 'SCRIPT_STREAM_TEXT_INTERVAL', 0.25)
+    parser = SceneStreamParser()
+    chunks = []
+    last_text_update = 0.0
+    for chunk in providers.generate_stream(provider, model, prompt, **options):
+        chunks.append(chunk)
+        now = time.monotonic()
+        if on_text and now - last_text_update >= text_interval:
+            last_text_update = now
+            _notify(on_text, "".join(chunks))
+        for scene in parser.feed(chunk):
+            if on_scene:
+                index = parser.count - 1
+                _notify(on_scene, index, _normalize_scene(index, scene, warn=False))
+    text = "".join(chunks)
+    if on_text:
+        _notify(on_text, text)
+    return text
 
-from groq import Groq
 
-def generate_script_with_groq(topic="재미있는 건강 상식", duration=30):
-    """Groq API for Free/Fast inference"""
-    api_key = getattr(config, 'GROQ_API_KEY', None)
-    if not api_key or "YOUR_GROQ_API_KEY" in api_key:
+def generate_script_with_groq(topic="재미있는 건강 상식", duration=30, on_scene=None, on_text=None):
+    """Groq API for Free/Fast inference (on_scene/on_text: 스트리밍 콜백, _request_script 참고)"""
+    if not get_api_key("groq"):
         print("Groq API 키가 설정되지 않았습니다.")
         return None
         
-    client = Groq(api_key=api_key)
     scene_count = max(3, int(duration / 5))
     
     prompt = f"""
@@ -56,41 +182,41 @@ def generate_script_with_groq(topic="재미있는 건강 상식", duration=30):
     print(f"Groq Cloud (llama-3.3-70b)에게 대본 요청 중... (주제: {topic})")
     
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that outputs strictly JSON. You MUST output Korean for text fields. No other languages allowed."},
-                {"role": "user", "content": prompt}
-            ],
+        response_text = _request_script(
+            "groq", GROQ_SCRIPT_MODEL, prompt, on_scene, on_text,
+            system="You are a helpful assistant that outputs strictly JSON. You MUST output Korean for text fields. No other languages allowed.",
             temperature=0.7,
             max_tokens=2048,
-            top_p=1,
-            stream=False,
-            response_format={"type": "json_object"}
+            json_mode=True
         )
         
-        return json.loads(completion.choices[0].message.content)
+        return json.loads(response_text.replace('```json', '').replace('```', '').strip())
         
     except Exception as e:
         print(f"Groq Error: {e}")
         return None
 
-def generate_script_with_ai(topic="재미있는 건강 상식", duration=30, provider="gemini"):
+def generate_script_with_ai(topic="재미있는 건강 상식", duration=30, provider="gemini", on_scene=None, on_text=None):
     """
     AI Provider Switcher (Gemini vs Groq).
     Uses the specified provider to generate the script.
+    on_scene(index, scene) / on_text(partial_text)를 주면 응답을 스트리밍으로 받아
+    장면이 완성되는 대로(대본 전체가 끝나기 전에) 콜백합니다.
     """
     if provider == "groq":
         print(f"Groq AI 에게 대본 요청 중... (주제: {topic})")
-        return generate_script_with_groq(topic, duration)
+        return generate_script_with_groq(topic, duration, on_scene, on_text)
+
+    # Gemini에서 이미 전달한 장면이 있으면 Groq로 전환한 뒤에는 장면을 다시 전달하지 않음 (같은 인덱스 중복 방지)
+    delivered_scenes = [0]
+    def deliver_scene(index, scene):
+        delivered_scenes[0] += 1
+        on_scene(index, scene)
 
     # Default to Gemini if provider is 'gemini' or something else
     script_data = None
     print(f"Gemini AI 에게 대본 요청 중... (주제: {topic})")
-    api_key_gemini = getattr(config, 'GEMINI_API_KEY', None)
-
-    if api_key_gemini and "YOUR_GEMINI_API_KEY" not in api_key_gemini:
-        client = genai.Client(api_key=api_key_gemini)
+    if get_api_key("gemini"):
         model_name = 'gemini-2.5-flash' 
         
         scene_count = max(3, int(duration / 5))
@@ -139,62 +265,36 @@ def generate_script_with_ai(topic="재미있는 건강 상식", duration=30, pro
         6. **Music Mood**: Choose one: "Upbeat", "Phonk", "Suspense", "Energetic".
         """
 
-        max_retries = 3
-        base_delay = 10
-
-        for attempt in range(max_retries):
-            try:
-                response = client.models.generate_content(model=model_name, contents=prompt)
-                text_response = response.text
-                
-                clean_json = text_response.replace('```json', '').replace('```', '').strip()
-                script_data = json.loads(clean_json)
+        try:
+            text_response = _request_script("gemini", model_name, prompt, deliver_scene if on_scene else None, on_text)
+            
+            clean_json = text_response.replace('```json', '').replace('```', '').strip()
+            script_data = json.loads(clean_json)
+            
+            if 'scenes' not in script_data:
+                print("AI 응답에 'scenes' 키가 없습니다.")
+                script_data = None
+            else:
+                if 'metadata' not in script_data:
+                    script_data['metadata'] = { "topic": topic }
                 
-                if 'scenes' not in script_data:
-                    print("AI 응답에 'scenes' 키가 없습니다.")
-                    script_data = None
-                else:
-                    if 'metadata' not in script_data:
-                        script_data['metadata'] = { "topic": topic }
+                if 'music_mood' not in script_data['metadata']:
+                    print("Warning: AI가 music_mood를 반환하지 않아 'Cheerful'로 설정합니다.")
+                    script_data['metadata']['music_mood'] = "Cheerful"
                     
-                    if 'music_mood' not in script_data['metadata']:
-                        print("Warning: AI가 music_mood를 반환하지 않아 'Cheerful'로 설정합니다.")
-                        script_data['metadata']['music_mood'] = "Cheerful"
-                        
-                    for i, scene in enumerate(script_data['scenes']):
-                        if 'duration' not in scene:
-                            print(f"  Warning: 장면 {i+1}에 'duration'이 없어 기본값(5)으로 설정합니다.")
-                            scene['duration'] = 5
-                        
-                        if 'visual_keywords' not in scene or not isinstance(scene['visual_keywords'], list) or not scene['visual_keywords']:
-                            print(f"  Warning: 장면 {i+1}에 'visual_keywords'가 유효하지 않아 기본값으로 대체합니다.")
-                            desc = scene.get('visual_description', 'video')
-                            scene['visual_keywords'] = [desc.split()[0]] if desc else ["general"]
-                            
-                        if 'narration' not in scene:
-                            scene['narration'] = ""
-                            
-                        if 'on_screen_text' not in scene:
-                            scene['on_screen_text'] = ""
-
-                    print("Gemini 대본 생성을 성공적으로 완료하고 검증했습니다!")
-                    break 
-            except Exception as e:
-                error_msg = str(e)
-                if "429" in error_msg or "ResourceExhausted" in error_msg or "Quota" in error_msg:
-                    if attempt < max_retries - 1:
-                        wait_time = base_delay * (2 ** attempt)
-                        print(f"  ⚠️ Gemini Quota Exceeded. {wait_time}초 후 재시도합니다... ({attempt+1}/{max_retries})")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        print("  ❌ Gemini 모든 재시도 실패. (무료 사용량 초과)")
-                        script_data = None
-                else:
-                    print(f"Gemini 대본 생성 중 오류 발생: {e}")
-                    script_data = None
-            if script_data:
-                break
+                for i, scene in enumerate(script_data['scenes']):
+                    _normalize_scene(i, scene)
+
+                print("Gemini 대본 생성을 성공적으로 완료하고 검증했습니다!")
+        except LLMUnavailableError as e:
+            print(f"  ❌ Gemini 대본 생성 불가: {e}")
+            script_data = None
+            if get_api_key("groq") and is_available("groq", GROQ_SCRIPT_MODEL):
+                print("  ↪️ Groq로 전환해 대본을 생성합니다.")
+                return generate_script_with_groq(topic, duration, None if delivered_scenes[0] else on_scene, on_text)
+        except Exception as e:
+            print(f"Gemini 대본 생성 중 오류 발생: {e}")
+            script_data = None
     else:
         print("Gemini API 키가 설정되지 않았거나 유효하지 않습니다.")
 
@@ -203,42 +303,10 @@ def generate_script_with_ai(topic="재미있는 건강 상식", duration=30, pro
 
 def check_api_health(provider="gemini"):
     """
-    API 쿼터 상태를 확인합니다. provider: 'gemini' or 'groq'
+    API 상태를 확인합니다. provider: 'gemini' or 'groq'
+    최근 실제 호출 결과(LLM_HEALTH_TTL_SECONDS 이내)를 재사용하고, 없으면 생성 쿼터를 쓰지 않는 모델 목록 조회로 확인합니다.
     """
-    if provider == "groq":
-        api_key = getattr(config, 'GROQ_API_KEY', None)
-        if not api_key: return False, "Groq Key Missing"
-        
-        try:
-            client = Groq(api_key=api_key)
-            client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": "Hi"}],
-                max_tokens=1
-            )
-            return True, "Groq Status: Healthy 🟢"
-        except Exception as e:
-            return False, f"Groq Error: {str(e)}"
-            
-    else:
-        # Gemini Check
-        api_key = getattr(config, 'GEMINI_API_KEY', None)
-        if not api_key: return False, "Gemini Key Missing"
-
-        try:
-            client = genai.Client(api_key=api_key)
-            # Use a stable model for health check
-            response = client.models.generate_content(
-                model='gemini-2.5-flash', 
-                contents="Hi",
-                config={"max_output_tokens": 1}
-            )
-            if response: return True, "Gemini Status: Healthy 🟢"
-            else: return False, "No Response"
-        except Exception as e:
-            if "429" in str(e) or "Quota" in str(e):
-                return False, "⚠️ Gemini Quota Exceeded"
-            return False, f"Gemini Error: {str(e)}"
+    return providers.check_health("groq" if provider == "groq" else "gemini")
 
 if __name__ == "__main__":
     # 테스트
@@ -1,12 +1,289 @@
+import os
+import re
 import time
-import google.generativeai as genai
+import sqlite3
+import hashlib
+import threading
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 import config
 import json
+from media_prefilter import prefilter_enabled, prefilter_verdict, save_corpus
+from llm_limiter import LLMUnavailableError
+from llm_providers import providers, get_api_key
 
-from groq import Groq
+GROQ_VALIDATION_MODEL = "llama-3.3-70b-versatile"
+GEMINI_VALIDATION_MODEL = 'gemini-2.0-flash-lite-preview-02-05' # Lite Model
+
+# --- 검증 결과 캐시 ---
+# (provider, 정규화된 스크립트 맥락, 미디어 종류, 메타데이터 해시)를 키로 LLM 판정 (valid, suggestion)을 SQLite에 보관합니다.
+# 재렌더링/배치 실행에서 같은 영상이나 BGM을 같은 맥락으로 다시 만나면 LLM 호출(과 쿼터 대기) 없이 바로 돌려줍니다.
+class ValidationCache:
+    """LLM 미디어 검증 판정 캐시. 항목은 VALIDATION_CACHE_TTL_HOURS가 지나면 만료됩니다."""
+    def __init__(self, db_path: str, ttl_seconds: float):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # 장면 병렬 처리 스레드들이 하나의 연결을 잠금으로 나눠 씀
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, provider TEXT, media_hash TEXT, "
+                "valid INTEGER, suggestion TEXT, created_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_media ON verdicts (media_hash)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def normalize_context(script_context: str) -> str:
+        """대소문자/공백/문장부호 차이만 있는 맥락은 같은 키가 되도록 정규화"""
+        return re.sub(r"[\W_]+", " ", (script_context or "").lower()).strip()
+
+    @staticmethod
+    def media_hash(media_metadata: dict) -> str:
+        # 검색어(query)는 같은 영상을 찾아온 경로일 뿐이므로 제외 (다른 키워드로 같은 영상을 만나도 적중)
+        identity = {k: v for k, v in (media_metadata or {}).items() if k != "query"}
+        data = json.dumps(identity, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def make_key(self, provider: str, script_context: str, media_type: str, media_metadata: dict) -> str:
+        data = "\n".join([provider, media_type, self.normalize_context(script_context), self.media_hash(media_metadata)])
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT valid, suggestion FROM verdicts WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return bool(row[0]), row[1]
+
+    def put(self, key: str, provider: str, media_metadata: dict, valid: bool, suggestion: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, provider, media_hash, valid, suggestion, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, self.media_hash(media_metadata), int(valid), suggestion, time.time())
+            )
+            # 만료된 항목 정리
+            conn.execute("DELETE FROM verdicts WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            conn.commit()
+
+    def invalidate(self, provider: Optional[str] = None, media_metadata: Optional[dict] = None) -> int:
+        """조건에 맞는 판정을 삭제하고 삭제한 개수를 반환합니다. 조건이 없으면 전체 삭제."""
+        clauses, params = [], []
+        if provider:
+            clauses.append("provider = ?")
+            params.append(provider)
+        if media_metadata is not None:
+            clauses.append("media_hash = ?")
+            params.append(self.media_hash(media_metadata))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute(f"DELETE FROM verdicts{where}", params).rowcount
+            conn.commit()
+        return deleted
+
+validation_cache = ValidationCache(
+    getattr(config, 'VALIDATION_CACHE_PATH', os.path.join("assets", "cache", "validation.sqlite3")),
+    getattr(config, 'VALIDATION_CACHE_TTL_HOURS', 168) * 3600
+)
+
+def _validation_cache_enabled() -> bool:
+    return getattr(config, 'VALIDATION_CACHE_ENABLED', True)
+
+def invalidate_validation_cache(provider: Optional[str] = None, media_metadata: Optional[dict] = None) -> int:
+    """캐시된 검증 판정을 삭제합니다 (provider/미디어로 범위 지정, 없으면 전체). 삭제 개수 반환."""
+    return validation_cache.invalidate(provider, media_metadata)
+
+def get_validation_cache_stats() -> dict:
+    return {"hits": validation_cache.hits, "misses": validation_cache.misses}
 
 def validate_media_relevance(script_context: str, media_metadata: dict, media_type: str = "video", provider="gemini") -> tuple[bool, str]:
-    """Gemini or Groq (Llama 3) for media validation"""
+    """
+    Gemini or Groq (Llama 3) for media validation
+    같은 provider/맥락/미디어의 판정은 캐시에서 바로 반환합니다. (오류로 통과 처리된 결과는 캐시하지 않음)
+    """
+    if not _validation_cache_enabled():
+        return _request_validation(script_context, media_metadata, media_type, provider)
+
+    key = validation_cache.make_key(provider, script_context, media_type, media_metadata)
+    try:
+        cached = validation_cache.get(key)
+    except sqlite3.Error as e:
+        print(f"  ⚠️ 검증 캐시 조회 실패: {e}")
+        cached = None
+    if cached:
+        print(f"  ♻️ AI 검증 캐시 적중 ({media_type}): {'통과' if cached[0] else '반려 -> ' + cached[1]}")
+        return cached
+
+    is_valid, suggestion = _request_validation(script_context, media_metadata, media_type, provider)
+    _store_verdict(key, provider, media_metadata, is_valid, suggestion)
+    return is_valid, suggestion
+
+def _store_verdict(key: Optional[str], provider: str, media_metadata: dict, is_valid: bool, suggestion: str) -> None:
+    # 오류로 통과 처리된(fail open) 결과는 캐시하지 않고 다음 실행에서 다시 검증
+    if key is None or not (not is_valid or suggestion == "Suitable"):
+        return
+    try:
+        validation_cache.put(key, provider, media_metadata, is_valid, suggestion)
+    except sqlite3.Error as e:
+        print(f"  ⚠️ 검증 캐시 저장 실패: {e}")
+
+def validate_media_batch(items: list, provider: str = "gemini") -> list:
+    """
+    릴스 한 편의 여러 (맥락, 미디어) 쌍을 LLM 한 번의 호출로 검증합니다.
+
+    Args:
+        items: [{"script_context", "media_metadata", "media_type"}] (장면 영상 후보들과 BGM)
+               "keywords"(영어 검색 키워드 목록)와 "description"(장면 설명)이 있으면 로컬 사전 필터로 먼저 판정합니다.
+               "tried_keywords"(장면에서 이미 검색한 키워드)는 로컬 반려 시 다음 검색어 제안에서 제외됩니다.
+        provider: "gemini" 또는 "groq"
+
+    Returns:
+        items 순서대로 (is_valid, suggestion) 목록.
+        로컬에서 확실히 판정된 항목과 캐시에 있는 항목은 요청에서 빼고,
+        모델이 답하지 않은 항목은 validate_media_relevance와 같은 개별 호출로 검증합니다.
+    """
+    results = [None] * len(items)
+    keys = [None] * len(items)
+    if prefilter_enabled():
+        results = [prefilter_verdict(item) for item in items]
+        save_corpus()
+        accepted = sum(1 for verdict in results if verdict and verdict[0])
+        rejected = sum(1 for verdict in results if verdict and not verdict[0])
+        if accepted or rejected:
+            print(f"  [로컬 사전 판정] 통과 {accepted} / 반려 {rejected} / 애매 {len(items) - accepted - rejected} "
+                  f"-> LLM 검증 {accepted + rejected}개 생략")
+    pending = []
+    cache_hits = 0
+    for idx, item in enumerate(items):
+        if results[idx] is not None:
+            continue
+        if _validation_cache_enabled():
+            keys[idx] = validation_cache.make_key(provider, item["script_context"], item.get("media_type", "video"), item["media_metadata"])
+            try:
+                results[idx] = validation_cache.get(keys[idx])
+            except sqlite3.Error as e:
+                print(f"  ⚠️ 검증 캐시 조회 실패: {e}")
+        if results[idx] is None:
+            pending.append(idx)
+        else:
+            cache_hits += 1
+    if cache_hits:
+        print(f"  ♻️ AI 검증 캐시 적중 {cache_hits}/{len(items)}개")
+
+    answers = _request_batch_validation([(idx, items[idx]) for idx in pending], provider) if len(pending) > 1 else {}
+    for idx in pending:
+        if idx in answers:
+            results[idx] = answers[idx]
+            _store_verdict(keys[idx], provider, items[idx]["media_metadata"], *answers[idx])
+
+    # 모델이 답하지 않은 항목(또는 요청 실패)은 개별 호출로 검증
+    missing = [idx for idx in pending if results[idx] is None]
+    if missing:
+        if len(pending) > 1:
+            print(f"  ⚠️ 일괄 검증에서 {len(missing)}개 항목의 답이 없어 개별 검증합니다.")
+
+        def validate_one(idx):
+            item = items[idx]
+            verdict = _request_validation(item["script_context"], item["media_metadata"], item.get("media_type", "video"), provider)
+            _store_verdict(keys[idx], provider, item["media_metadata"], *verdict)
+            return verdict
+
+        workers = max(1, min(len(missing), getattr(config, 'VALIDATION_MAX_CONCURRENCY', 2)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate") as executor:
+            for idx, verdict in zip(missing, executor.map(validate_one, missing)):
+                results[idx] = verdict
+    return results
+
+def _request_batch_validation(indexed_items: list, provider: str) -> dict:
+    """
+    여러 항목을 하나의 JSON 프롬프트로 검증합니다.
+    Returns: {항목 인덱스: (is_valid, suggestion)} - 모델이 답한 항목만 포함 (요청 실패 시 빈 dict)
+    """
+    payload = [
+        {
+            "id": idx,
+            "media_type": item.get("media_type", "video"),
+            "script_context": item["script_context"],
+            "media_metadata": item["media_metadata"],
+        }
+        for idx, item in indexed_items
+    ]
+    prompt = f"""
+    You are a strict creative director for a Reels video.
+    Check EACH media asset below against its own script context.
+
+    [Items]
+    {json.dumps(payload, ensure_ascii=False)}
+
+    Task:
+    1. For every item, evaluate if the media is relevant to its script context.
+    2. If YES: {{"id": <id>, "valid": true}}
+    3. If NO (irrelevant, wrong mood, conflicting visuals), give a better SINGLE English search keyword to find the right media:
+       {{"id": <id>, "valid": false, "suggestion": "better_keyword"}}
+
+    Output JSON only, with one entry per item: {{"results": [ ... ]}}
+    """
+
+    try:
+        if provider == "groq":
+            if not get_api_key("groq"):
+                return {}
+            response_text = providers.generate(
+                "groq", GROQ_VALIDATION_MODEL, prompt,
+                system="You are a validator that outputs strictly JSON.",
+                max_tokens=60 + 40 * len(payload),
+                json_mode=True
+            )
+        else:
+            if not get_api_key("gemini"):
+                return {}
+            response_text = providers.generate("gemini", GEMINI_VALIDATION_MODEL, prompt)
+            response_text = response_text.replace('```json', '').replace('```', '').strip()
+        entries = json.loads(response_text).get("results", [])
+    except Exception as e:
+        print(f"  ⚠️ AI 일괄 검증 실패 ({provider}): {e}")
+        return {}
+
+    expected = {idx for idx, _ in indexed_items}
+    answers = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or "valid" not in entry:
+            continue
+        try:
+            idx = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if idx not in expected:
+            continue
+        valid = entry["valid"]
+        if isinstance(valid, str):
+            valid = valid.strip().lower() == "true"
+        if valid:
+            answers[idx] = (True, "Suitable")
+        else:
+            answers[idx] = (False, entry.get("suggestion") or "abstract")
+    print(f"  [AI 일괄 검증] {len(answers)}/{len(payload)}개 판정 ({provider})")
+    return answers
+
+def _request_validation(script_context: str, media_metadata: dict, media_type: str, provider: str) -> tuple[bool, str]:
+    """LLM에 검증을 요청합니다. 키 없음/오류/쿼터 초과 시에는 통과(True)로 처리합니다."""
 
     prompt = f"""
     You are a strict creative director for a Reels video.
@@ -29,63 +306,46 @@ def validate_media_relevance(script_context: str, media_metadata: dict, media_ty
 
     # --- GROQ Implementation ---
     if provider == "groq":
-        api_key = getattr(config, 'GROQ_API_KEY', None)
-        if not api_key: return True, "No Groq Key" # Fail open
+        if not get_api_key("groq"): return True, "No Groq Key" # Fail open
         
         try:
-            client = Groq(api_key=api_key)
-            completion = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": "You are a validator that outputs strictly JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+            response_text = providers.generate(
+                "groq", GROQ_VALIDATION_MODEL, prompt,
+                system="You are a validator that outputs strictly JSON.",
                 max_tokens=150,
-                response_format={"type": "json_object"}
+                json_mode=True
             )
-            result = json.loads(completion.choices[0].message.content)
+            result = json.loads(response_text)
             if result.get('valid'): return True, "Suitable"
             else: return False, result.get('suggestion', 'abstract')
+        except LLMUnavailableError:
+            print("Warning: Groq 검증 쿼터 초과 (검증 생략 - 통과 처리)")
+            return True, "Quota Exceeded" # Fail open
         except Exception as e:
             print(f"Groq Validation Error: {e}")
             return True, "Groq Error" # Fail open
 
     # --- GEMINI Implementation ---
-    if not config.GEMINI_API_KEY:
+    if not get_api_key("gemini"):
         print("Warning: Gemini API Key가 없어 검증을 건너뜁니다.")
         return True, "No API Key"
 
-    genai.configure(api_key=config.GEMINI_API_KEY)
-    model = genai.GenerativeModel('gemini-2.0-flash-lite-preview-02-05') # Lite Model
-
-    max_retries = 3
-    base_delay = 10 # 10초 대기 (쿼터 회복)
-
-    for attempt in range(max_retries):
+    try:
+        response_text = providers.generate("gemini", GEMINI_VALIDATION_MODEL, prompt)
+        response_text = response_text.replace('```json', '').replace('```', '').strip()
+        
         try:
-            response = model.generate_content(prompt)
-            response_text = response.text.replace('```json', '').replace('```', '').strip()
-            
-            try:
-                result = json.loads(response_text)
-                if result.get('valid'):
-                    return True, "Suitable"
-                else:
-                    return False, result.get('suggestion', 'abstract')
-            except json.JSONDecodeError:
-                return True, "JSON Error" # Fail open
-            
-        except Exception as e:
-            error_msg = str(e)
-            if "429" in error_msg or "ResourceExhausted" in error_msg or "Quota" in error_msg:
-                if attempt < max_retries - 1:
-                    wait_time = base_delay * (2 ** attempt)
-                    print(f"  ⚠️ Validation Quota Issue. {wait_time}초 대기... ({attempt+1}/{max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print("Warning: AI 검증 쿼터 초과 (검증 생략 - 통과 처리)")
-                    return True, "Quota Exceeded" # Fail open
+            result = json.loads(response_text)
+            if result.get('valid'):
+                return True, "Suitable"
             else:
-                 print(f"AI Validation Error: {e}")
-                 return True, "API Error"
+                return False, result.get('suggestion', 'abstract')
+        except json.JSONDecodeError:
+            return True, "JSON Error" # Fail open
+        
+    except LLMUnavailableError:
+        print("Warning: AI 검증 쿼터 초과 (검증 생략 - 통과 처리)")
+        return True, "Quota Exceeded" # Fail open
+    except Exception as e:
+        print(f"AI Validation Error: {e}")
+        return True, "API Error"
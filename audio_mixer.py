@@ -0,0 +1,190 @@
+# audio_mixer.py
+# 이 파일은 릴스의 최종 오디오(나레이션 + 배경음악 + 효과음)를 NumPy로 한 번에 믹싱하는 모듈입니다.
+# 모든 소스를 한 번씩만 PCM 배열로 디코딩한 뒤, 나레이션 음량을 기준으로 배경음악을 자동으로 줄이고(ducking)
+# 장면 경계에 효과음을 샘플 단위로 정확히 배치하고 페이드를 적용해 하나의 WAV 파일로 저장합니다.
+
+import os
+import subprocess
+import wave
+from typing import List, Optional
+
+import numpy as np
+
+import config
+from ffmpeg_renderer import get_ffmpeg_binary
+from sfx_downloader import download_sfx
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+NARRATION_VOLUME = 3.0
+BGM_FADE_SECONDS = 2.0
+SFX_VOLUME = 0.5
+SFX_MAX_SECONDS = 1.5
+SFX_LEAD_SECONDS = 0.2  # 장면 전환 0.2초 전에 효과음 시작
+
+# 더킹 엔벨로프 (제어 신호는 10ms 단위로 계산 후 샘플 단위로 보간)
+DUCK_WINDOW_SECONDS = 0.01
+DUCK_THRESHOLD_DB = -40.0   # 나레이션이 이보다 크면 말하는 중으로 판단
+DUCK_ATTACK_SECONDS = 0.08  # 말이 시작되면 빠르게 줄이고
+DUCK_RELEASE_SECONDS = 0.4  # 말이 끝나면 천천히 복귀
+DUCK_HOLD_SECONDS = 0.25    # 단어 사이 짧은 쉼에는 복귀하지 않음
+
+
+def decode_audio(path: str, ffmpeg_binary: Optional[str] = None) -> Optional[np.ndarray]:
+    """오디오 파일을 44.1kHz 스테레오 float32 배열 (samples, 2)로 디코딩합니다. 실패 시 None."""
+    cmd = [
+        ffmpeg_binary or get_ffmpeg_binary() or "ffmpeg", "-v", "error", "-i", path,
+        "-f", "f32le", "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-",
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    except OSError as e:
+        print(f"    ⚠️ 오디오 디코딩 실패 ({os.path.basename(path)}): {e}")
+        return None
+    if result.returncode != 0:
+        print(f"    ⚠️ 오디오 디코딩 실패 ({os.path.basename(path)}): {result.stderr.decode(errors='ignore').strip()[-200:]}")
+        return None
+    samples = np.frombuffer(result.stdout, dtype=np.float32)
+    return samples[:len(samples) - len(samples) % CHANNELS].reshape(-1, CHANNELS)
+
+
+def _scene_offsets(scenes_data: List[dict]) -> list:
+    """장면별 시작 샘플 위치 (마지막 원소는 전체 길이)"""
+    offsets = [0]
+    elapsed = 0.0
+    for scene in scenes_data:
+        elapsed += scene.get('duration', 0)
+        offsets.append(int(round(elapsed * SAMPLE_RATE)))
+    return offsets
+
+
+def duck_envelope(voice: np.ndarray, normal: float, ducked: float) -> np.ndarray:
+    """
+    나레이션 트랙에서 배경음악 게인 엔벨로프(샘플별)를 계산합니다.
+    말하는 구간은 ducked, 나머지는 normal로 가며 attack/release/hold로 부드럽게 전환합니다.
+    """
+    total = len(voice)
+    window = int(DUCK_WINDOW_SECONDS * SAMPLE_RATE)
+    frames = max(1, -(-total // window))
+    mono = np.pad(np.abs(voice).max(axis=1), (0, frames * window - total))
+    rms = np.sqrt(np.mean(np.square(mono.reshape(frames, window)), axis=1) + 1e-12)
+    speaking = 20 * np.log10(rms) > DUCK_THRESHOLD_DB
+
+    # hold: 말이 끊겨도 잠시 동안은 말하는 중으로 유지 (짧은 쉼마다 음악이 튀어오르지 않도록)
+    hold = int(DUCK_HOLD_SECONDS / DUCK_WINDOW_SECONDS)
+    if hold > 0 and speaking.any():
+        held = np.convolve(speaking.astype(np.float32), np.ones(hold + 1, dtype=np.float32))[:frames]
+        speaking = held > 0
+
+    target = np.where(speaking, ducked, normal).astype(np.float32)
+    attack = 1.0 - np.exp(-DUCK_WINDOW_SECONDS / DUCK_ATTACK_SECONDS)
+    release = 1.0 - np.exp(-DUCK_WINDOW_SECONDS / DUCK_RELEASE_SECONDS)
+    gain = np.empty(frames, dtype=np.float32)
+    level = normal
+    for i, goal in enumerate(target):  # 10ms 단위 제어 신호라 30초 릴스도 3천 번 정도의 반복
+        level += (goal - level) * (attack if goal < level else release)
+        gain[i] = level
+
+    frame_centers = (np.arange(frames) + 0.5) * window
+    return np.interp(np.arange(total), frame_centers, gain).astype(np.float32)
+
+
+def _fade(track: np.ndarray, seconds: float, fade_in: bool) -> None:
+    length = min(len(track), int(seconds * SAMPLE_RATE))
+    if length <= 0:
+        return
+    ramp = np.linspace(0.0, 1.0, length, dtype=np.float32)[:, None]
+    if fade_in:
+        track[:length] *= ramp
+    else:
+        track[-length:] *= ramp[::-1]
+
+
+def write_wav(path: str, samples: np.ndarray) -> None:
+    """float32 (samples, 2) 배열을 16bit PCM WAV로 저장합니다."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    with wave.open(path, "wb") as w:
+        w.setnchannels(CHANNELS)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm.tobytes())
+
+
+def mix_reel_audio(scenes_data: List[dict], output_path: str,
+                   bgm_path: Optional[str] = None) -> Optional[str]:
+    """
+    릴스 전체 오디오를 하나의 WAV로 믹싱합니다.
+
+    Args:
+        scenes_data: 장면 목록 (duration은 영상과 같은 최종 길이, audio_path는 나레이션)
+        output_path: 저장할 WAV 경로
+        bgm_path: 배경음악 경로 (있을 때만 배경음악과 장면 전환 효과음을 함께 믹싱)
+
+    Returns:
+        성공 시 output_path, 실패하면 None
+    """
+    ffmpeg_binary = get_ffmpeg_binary()
+    if not ffmpeg_binary or not scenes_data:
+        return None
+
+    offsets = _scene_offsets(scenes_data)
+    total = offsets[-1]
+    if total <= 0:
+        return None
+
+    # 1. 나레이션: 장면 시작 위치에 배치 (장면보다 길면 자름)
+    voice = np.zeros((total, CHANNELS), dtype=np.float32)
+    for scene, start, end in zip(scenes_data, offsets, offsets[1:]):
+        narration_path = scene.get('audio_path')
+        if not narration_path or not os.path.exists(narration_path):
+            continue
+        samples = decode_audio(narration_path, ffmpeg_binary)
+        if samples is None:
+            continue
+        length = min(len(samples), end - start)
+        voice[start:start + length] += samples[:length] * NARRATION_VOLUME
+
+    mix = voice
+    if bgm_path and os.path.exists(bgm_path):
+        bgm = decode_audio(bgm_path, ffmpeg_binary)
+        if bgm is not None and len(bgm):
+            # 2. 배경음악: 전체 길이만큼 반복 후 나레이션 기반 더킹 + 페이드 인
+            bgm = np.tile(bgm, (-(-total // len(bgm)), 1))[:total]
+            envelope = duck_envelope(
+                voice,
+                normal=getattr(config, 'BGM_NORMAL_VOLUME', 0.35),
+                ducked=getattr(config, 'BGM_DUCK_VOLUME', 0.1)
+            )
+            bgm *= envelope[:, None]
+            _fade(bgm, BGM_FADE_SECONDS, fade_in=True)
+            mix = voice + bgm
+
+            # 3. 효과음: 장면 경계 직전에 샘플 단위로 배치
+            whoosh = None
+            if len(scenes_data) > 1:
+                try:
+                    whoosh_path = download_sfx("whoosh")
+                    if whoosh_path:
+                        whoosh = decode_audio(whoosh_path, ffmpeg_binary)
+                except Exception as e:
+                    print(f"  ⚠️ 효과음 로드 실패: {e}")
+            if whoosh is not None and len(whoosh):
+                whoosh = whoosh[:int(SFX_MAX_SECONDS * SAMPLE_RATE)] * SFX_VOLUME
+                lead = int(SFX_LEAD_SECONDS * SAMPLE_RATE)
+                for boundary in offsets[1:-1]:
+                    start = max(0, boundary - lead)
+                    length = min(len(whoosh), total - start)
+                    mix[start:start + length] += whoosh[:length]
+
+            # 4. 전체 페이드 아웃
+            _fade(mix, BGM_FADE_SECONDS, fade_in=False)
+
+    temp_path = output_path + ".part"
+    try:
+        write_wav(temp_path, mix)
+        os.replace(temp_path, output_path)
+    except OSError as e:
+        print(f"  ⚠️ 믹싱 오디오 저장 실패: {e}")
+        return None
+    print(f"  [오디오 믹싱] {total / SAMPLE_RATE:.2f}s, 배경음악 {'더킹 적용' if mix is not voice else '없음'}")
+    return output_path
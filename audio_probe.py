@@ -0,0 +1,199 @@
+# audio_probe.py
+# 이 파일은 오디오를 디코딩하지 않고 파일 헤더만 읽어 재생 길이를 측정하는 모듈입니다.
+# MP3는 Xing/Info/VBRI 태그 또는 프레임 헤더를, WAV는 RIFF 헤더를 순수 파이썬으로 읽고,
+# 그 외 형식이나 해석 실패 시에만 ffprobe를 호출합니다. 결과는 파일별로 메모이즈됩니다.
+
+import os
+import struct
+import subprocess
+import threading
+import wave
+from typing import Optional
+
+# 프레임 헤더를 끝까지 순회할 최대 파일 크기 (이보다 크면 CBR로 추정)
+MAX_FRAME_WALK_BYTES = 8 * 1024 * 1024
+
+_BITRATES = {
+    # (MPEG1 여부, layer) -> kbps 테이블
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG1
+    2: [22050, 24000, 16000],  # MPEG2
+    0: [11025, 12000, 8000],   # MPEG2.5
+}
+
+_duration_cache = {}
+_duration_cache_lock = threading.Lock()
+
+
+def _parse_frame_header(data: bytes, pos: int) -> Optional[dict]:
+    """pos 위치의 MPEG 오디오 프레임 헤더를 해석합니다. 유효하지 않으면 None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    header = struct.unpack(">I", data[pos:pos + 4])[0]
+    version_bits = (header >> 19) & 0x3
+    layer_bits = (header >> 17) & 0x3
+    bitrate_index = (header >> 12) & 0xF
+    sample_rate_index = (header >> 10) & 0x3
+    padding = (header >> 9) & 0x1
+    channel_mode = (header >> 6) & 0x3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    is_mpeg1 = version_bits == 3
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[(is_mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or is_mpeg1:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    return {
+        "is_mpeg1": is_mpeg1,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples": samples,
+        "length": length,
+        "mono": channel_mode == 3,
+    }
+
+
+def _id3v2_size(data: bytes) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _find_first_frame(data: bytes, start: int) -> tuple:
+    """start 이후 다음 프레임도 유효하게 이어지는 첫 프레임 위치와 헤더를 찾습니다."""
+    pos = data.find(b"\xff", start)
+    while pos != -1 and pos + 4 <= len(data):
+        frame = _parse_frame_header(data, pos)
+        if frame and frame["length"] > 0:
+            nxt = pos + frame["length"]
+            if nxt + 4 > len(data) or _parse_frame_header(data, nxt):
+                return pos, frame
+        pos = data.find(b"\xff", pos + 1)
+    return -1, None
+
+
+def _vbr_frame_count(data: bytes, pos: int, frame: dict) -> Optional[int]:
+    """첫 프레임의 Xing/Info 또는 VBRI 태그에서 전체 프레임 수를 읽습니다."""
+    if frame["is_mpeg1"]:
+        side_info = 17 if frame["mono"] else 32
+    else:
+        side_info = 9 if frame["mono"] else 17
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x1:
+            return struct.unpack(">I", data[xing + 8:xing + 12])[0]
+
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        return struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+    return None
+
+
+def _probe_mp3(path: str) -> Optional[float]:
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(10)
+        audio_start = _id3v2_size(head)
+        f.seek(0)
+        # 프레임 순회가 가능한 크기면 전체를, 아니면 첫 프레임 탐색에 충분한 앞부분만 읽음
+        data = f.read() if file_size <= MAX_FRAME_WALK_BYTES else f.read(audio_start + 64 * 1024)
+
+    pos, frame = _find_first_frame(data, audio_start)
+    if frame is None:
+        return None
+
+    frame_count = _vbr_frame_count(data, pos, frame)
+    if frame_count:
+        return frame_count * frame["samples"] / frame["sample_rate"]
+
+    if file_size <= MAX_FRAME_WALK_BYTES:
+        # 모든 프레임 헤더를 따라가며 샘플 수 합산 (VBR도 정확)
+        sample_rate = frame["sample_rate"]
+        total_samples = 0
+        while frame:
+            total_samples += frame["samples"]
+            pos += frame["length"]
+            frame = _parse_frame_header(data, pos)
+        return total_samples / sample_rate
+
+    # 큰 CBR 파일: 오디오 바이트 수 / 비트레이트로 추정
+    audio_bytes = file_size - pos
+    if file_size >= 128:
+        with open(path, "rb") as f:
+            f.seek(-128, os.SEEK_END)
+            if f.read(3) == b"TAG":
+                audio_bytes -= 128
+    return audio_bytes * 8 / frame["bitrate"]
+
+
+def _probe_wav(path: str) -> Optional[float]:
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / w.getframerate()
+
+
+def _probe_ffprobe(path: str) -> Optional[float]:
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    value = result.stdout.strip()
+    return float(value) if value else None
+
+
+def get_audio_duration(path: str) -> Optional[float]:
+    """
+    오디오 파일의 재생 길이(초)를 반환합니다. 측정할 수 없으면 None.
+    같은 파일(경로, 수정 시각, 크기)에 대한 결과는 메모이즈됩니다.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    cache_key = os.path.abspath(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _duration_cache_lock:
+        cached = _duration_cache.get(cache_key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    duration = None
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".mp3":
+            duration = _probe_mp3(path)
+        elif ext == ".wav":
+            duration = _probe_wav(path)
+    except (OSError, EOFError, wave.Error, struct.error) as e:
+        print(f"    Warning: 오디오 헤더 해석 실패 ({os.path.basename(path)}): {e}")
+
+    if duration is None:
+        try:
+            duration = _probe_ffprobe(path)
+        except (OSError, ValueError, subprocess.SubprocessError) as e:
+            print(f"    Warning: ffprobe 길이 측정 실패 ({os.path.basename(path)}): {e}")
+            return None
+
+    with _duration_cache_lock:
+        _duration_cache[cache_key] = (signature, duration)
+    return duration
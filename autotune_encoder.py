@@ -0,0 +1,201 @@
+# autotune_encoder.py
+# 이 기기에서 인코더 설정(코덱/프리셋/CRF·비트레이트/스레드/tune) 조합을 직접 측정해
+# 속도-용량-화질의 파레토 최적 프로필을 settings.json의 ENCODER_PROFILE로 저장하는 스크립트입니다.
+#
+# 사용법:
+#   python autotune_encoder.py                 # 최근 완성 릴스(없으면 합성 영상)를 기준으로 측정 후 저장
+#   python autotune_encoder.py reel.mp4        # 지정한 영상을 기준으로 측정
+#   python autotune_encoder.py --dry-run       # 측정 결과만 출력하고 저장하지 않음
+#
+# 선택 기준: 파레토 최적 후보 중 ENCODER_MIN_FPS(처리량 예산)와 ENCODER_MIN_SSIM(최소 화질)을
+# 만족하는 가장 작은 파일. 만족하는 후보가 없으면 화질 기준을 만족하는 가장 빠른 후보를 고릅니다.
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import tempfile
+import itertools
+import subprocess
+
+import config
+from settings_manager import settings_manager
+from ffmpeg_renderer import get_ffmpeg_binary, encoder_quality_args
+
+REFERENCE_SECONDS = 8
+RESULTS_PATH = os.path.join(config.ASSETS_DIR, "benchmark", "encoder_autotune.json")
+
+X264_PRESETS = ["ultrafast", "superfast", "veryfast", "faster", "fast", "medium"]
+X264_CRFS = [20, 23, 26]
+X264_TUNES = ["film"]
+HARDWARE_ENCODERS = ["h264_videotoolbox", "h264_nvenc", "h264_qsv"]
+HARDWARE_BITRATES = ["4M", "6M", "8M"]
+
+
+def _run(cmd: list) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, capture_output=True, text=True)
+
+
+def prepare_reference(ffmpeg: str, source: str, work_dir: str) -> str:
+    """기준 영상을 릴스 규격의 무손실 파일로 만들어 모든 조합이 같은 입력(같은 디코딩 비용)을 쓰게 합니다."""
+    width, height, fps = config.REELS_WIDTH, config.REELS_HEIGHT, config.REELS_FPS
+    reference = os.path.join(work_dir, "reference.mkv")
+    if source:
+        inputs = ["-t", str(REFERENCE_SECONDS), "-i", source]
+    else:
+        # 움직임 + 세밀한 질감이 있는 합성 영상 (실제 스톡 영상보다 압축이 어려운 편)
+        inputs = ["-f", "lavfi", "-i",
+                  f"testsrc2=s={width}x{height}:r={fps}:d={REFERENCE_SECONDS},noise=alls=4:allf=t"]
+    cmd = [ffmpeg, "-y", "-v", "error", *inputs,
+           "-vf", f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height},fps={fps}",
+           "-an", "-c:v", "libx264", "-preset", "ultrafast", "-qp", "0", "-pix_fmt", "yuv420p", reference]
+    result = _run(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"기준 영상 준비 실패: {result.stderr.strip()[-300:]}")
+    return reference
+
+
+def available_hardware_encoders(ffmpeg: str) -> list:
+    listed = _run([ffmpeg, "-hide_banner", "-encoders"]).stdout
+    return [name for name in HARDWARE_ENCODERS if re.search(rf"\b{name}\b", listed)]
+
+
+def build_grid(hardware: list) -> list:
+    cpu_count = os.cpu_count() or 1
+    thread_options = sorted({cpu_count, max(1, cpu_count // 2)}, reverse=True)
+    grid = []
+    # 프리셋 x CRF (전체 스레드)
+    for preset, crf in itertools.product(X264_PRESETS, X264_CRFS):
+        grid.append({"codec": "libx264", "preset": preset, "crf": crf, "tune": None, "threads": cpu_count})
+    # 프리셋 x tune / 스레드 수 (CRF 23 고정)
+    for preset, tune in itertools.product(X264_PRESETS, X264_TUNES):
+        grid.append({"codec": "libx264", "preset": preset, "crf": 23, "tune": tune, "threads": cpu_count})
+    for preset, threads in itertools.product(X264_PRESETS, thread_options[1:]):
+        grid.append({"codec": "libx264", "preset": preset, "crf": 23, "tune": None, "threads": threads})
+    for codec, bitrate in itertools.product(hardware, HARDWARE_BITRATES):
+        grid.append({"codec": codec, "preset": None, "bitrate": bitrate, "tune": None, "threads": cpu_count})
+    return grid
+
+
+def _frame_count(ffmpeg: str, path: str) -> int:
+    result = _run([ffmpeg, "-v", "error", "-i", path, "-map", "0:v",
+                   "-f", "null", "-progress", "pipe:1", "-"])
+    counts = re.findall(r"^frame=(\d+)", result.stdout, re.MULTILINE)
+    return int(counts[-1]) if counts else 0
+
+
+def measure_quality(ffmpeg: str, encoded: str, reference: str) -> tuple:
+    """(SSIM All, PSNR average) - ffmpeg ssim/psnr 필터로 기준 영상과 비교"""
+    cmd = [ffmpeg, "-v", "info", "-i", encoded, "-i", reference, "-lavfi",
+           "[0:v]split[e0][e1];[1:v]split[r0][r1];[e0][r0]ssim;[e1][r1]psnr", "-f", "null", "-"]
+    stderr = _run(cmd).stderr
+    ssim = re.search(r"SSIM .*All:([\d.]+)", stderr)
+    psnr = re.search(r"PSNR .*average:([\d.]+|inf)", stderr)
+    return (float(ssim.group(1)) if ssim else 0.0,
+            float(psnr.group(1)) if psnr else 0.0)
+
+
+def run_profile(ffmpeg: str, profile: dict, reference: str, frames: int, work_dir: str):
+    output = os.path.join(work_dir, "encoded.mp4")
+    cmd = [ffmpeg, "-y", "-v", "error", "-i", reference, "-an",
+           "-c:v", profile["codec"], *encoder_quality_args(profile),
+           "-pix_fmt", "yuv420p", "-threads", str(profile["threads"]), output]
+    start = time.perf_counter()
+    result = _run(cmd)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        return None
+    ssim, psnr = measure_quality(ffmpeg, output, reference)
+    size = os.path.getsize(output)
+    return {
+        "profile": profile,
+        "fps": frames / elapsed,
+        "kbps": size * 8 / 1000 / REFERENCE_SECONDS,
+        "ssim": ssim,
+        "psnr": psnr,
+    }
+
+
+def pareto_front(results: list) -> list:
+    """속도(높을수록), 용량(낮을수록), SSIM(높을수록) 기준으로 다른 결과에 완전히 밀리지 않는 결과들"""
+    def dominates(a, b):
+        no_worse = a["fps"] >= b["fps"] and a["kbps"] <= b["kbps"] and a["ssim"] >= b["ssim"]
+        better = a["fps"] > b["fps"] or a["kbps"] < b["kbps"] or a["ssim"] > b["ssim"]
+        return no_worse and better
+    return [r for r in results if not any(dominates(other, r) for other in results)]
+
+
+def choose_profile(front: list, min_fps: float, min_ssim: float) -> dict:
+    within_budget = [r for r in front if r["fps"] >= min_fps and r["ssim"] >= min_ssim]
+    if within_budget:
+        return min(within_budget, key=lambda r: r["kbps"])
+    good_enough = [r for r in front if r["ssim"] >= min_ssim]
+    return max(good_enough or front, key=lambda r: r["fps"])
+
+
+def _describe(profile: dict) -> str:
+    quality = f"crf {profile['crf']}" if profile.get("crf") is not None else f"{profile.get('bitrate')}"
+    tune = f" tune={profile['tune']}" if profile.get("tune") else ""
+    return f"{profile['codec']} {profile.get('preset') or '-'} {quality}{tune} x{profile['threads']}"
+
+
+def autotune(source: str = None, save: bool = True) -> dict:
+    ffmpeg = get_ffmpeg_binary()
+    if not ffmpeg:
+        print("ffmpeg 실행 파일을 찾을 수 없습니다.")
+        return None
+
+    if source is None:
+        reels = sorted((path for path in glob.glob(os.path.join(config.FINAL_REELS_DIR, "*.mp4"))
+                        if not path.endswith("_draft.mp4")), key=os.path.getmtime)
+        source = reels[-1] if reels else None
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        reference = prepare_reference(ffmpeg, source, work_dir)
+        frames = _frame_count(ffmpeg, reference)
+        grid = build_grid(available_hardware_encoders(ffmpeg))
+        print(f"기준 영상: {source or '합성 영상'} ({frames} frames), 조합 {len(grid)}개 측정")
+        print(f"{'profile':<44}{'fps':>8}{'kbps':>9}{'SSIM':>8}{'PSNR':>7}")
+
+        results = []
+        for profile in grid:
+            result = run_profile(ffmpeg, profile, reference, frames, work_dir)
+            if result is None:
+                print(f"{_describe(profile):<44}  (사용 불가)")
+                continue
+            results.append(result)
+            print(f"{_describe(profile):<44}{result['fps']:>8.1f}{result['kbps']:>9.0f}"
+                  f"{result['ssim']:>8.4f}{result['psnr']:>7.1f}")
+
+    if not results:
+        print("측정 가능한 인코더 설정이 없습니다.")
+        return None
+
+    front = pareto_front(results)
+    min_fps = getattr(config, 'ENCODER_MIN_FPS', 48)
+    min_ssim = getattr(config, 'ENCODER_MIN_SSIM', 0.97)
+    best = choose_profile(front, min_fps, min_ssim)
+
+    print("-" * 76)
+    print(f"파레토 최적 {len(front)}개:")
+    for r in sorted(front, key=lambda r: -r["fps"]):
+        marker = " <- 선택" if r is best else ""
+        print(f"  {_describe(r['profile']):<42}{r['fps']:>8.1f}{r['kbps']:>9.0f}{r['ssim']:>8.4f}{marker}")
+    print(f"예산: ≥{min_fps} fps, SSIM ≥{min_ssim}")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding='utf-8') as f:
+        json.dump({"source": source, "results": results, "selected": best}, f, ensure_ascii=False, indent=2)
+
+    profile = {key: value for key, value in best["profile"].items() if value is not None}
+    if save:
+        settings_manager.set('ENCODER_PROFILE', profile)
+        print(f"ENCODER_PROFILE 저장 완료: {profile}")
+    return profile
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    autotune(args[0] if args else None, save="--dry-run" not in sys.argv)
@@ -1,7 +1,13 @@
 import os
 import json
-import time
+import config
 from main import generate_script_pipeline, generate_video_pipeline
+from tts_generator import warmup_whisper_model, get_whisper_stats
+from media_downloader import get_download_stats, get_media_cache_stats
+from scene_cache import get_scene_cache_stats
+from ai_validator import get_validation_cache_stats
+from media_prefilter import get_prefilter_stats
+from llm_limiter import get_limiter_stats
 
 def process_batch(topics_file: str, provider: str = "gemini"):
     """
@@ -15,6 +21,10 @@ def process_batch(topics_file: str, provider: str = "gemini"):
         topics = [line.strip() for line in f if line.strip()]
 
     print(f"🚀 총 {len(topics)}건의 배치 작업을 시작합니다.")
+
+    # 스크립트 생성 동안 Whisper 모델을 백그라운드에서 미리 로드
+    if getattr(config, 'WHISPER_WARMUP', True):
+        warmup_whisper_model()
     
     results = []
     for i, topic in enumerate(topics):
@@ -36,11 +46,29 @@ def process_batch(topics_file: str, provider: str = "gemini"):
                 
         except Exception as e:
             print(f"❌ '{topic}' 처리 중 예상치 못한 오류: {e}")
-        
-        # API 쿼터 보호를 위한 짧은 휴식
-        time.sleep(5)
+        # API 쿼터 보호는 공유 호출 제한기(llm_limiter)가 호출 단위로 맡으므로 주제 사이에 따로 쉬지 않음
 
     print(f"\n✨ 배치 작업 종료! 총 {len(results)}개의 영상이 생성되었습니다.")
+    stats = get_whisper_stats()
+    print(f"  [Whisper] 모델 로드 {stats['loads']}회 ({stats['load_seconds']:.1f}s), "
+          f"전사 {stats['transcribes']}회 ({stats['transcribe_seconds']:.1f}s)")
+    download = get_download_stats()
+    print(f"  [다운로드] {download['files']}개, {download['megabytes']:.1f}MB, 평균 {download['mb_per_second']:.1f}MB/s, "
+          f"p50 {download['p50_seconds']:.1f}s / p95 {download['p95_seconds']:.1f}s")
+    media_cache = get_media_cache_stats()
+    print(f"  [Pexels 캐시] 검색 적중 {media_cache['search_hits']} / 미스 {media_cache['search_misses']}, "
+          f"다운로드 적중 {media_cache['download_hits']} / 미스 {media_cache['download_misses']}")
+    scene_cache = get_scene_cache_stats()
+    print(f"  [장면 캐시] 미디어 재사용 {scene_cache['media_hits']} / 새로 선택 {scene_cache['media_misses']}, "
+          f"세그먼트 재사용 {scene_cache['segment_hits']} / 새로 렌더링 {scene_cache['segment_misses']}")
+    validation_cache = get_validation_cache_stats()
+    print(f"  [AI 검증 캐시] 적중 {validation_cache['hits']} / LLM 호출 {validation_cache['misses']}")
+    prefilter = get_prefilter_stats()
+    print(f"  [로컬 사전 판정] 통과 {prefilter['accepted']} / 반려 {prefilter['rejected']} / 애매(LLM 검증) {prefilter['ambiguous']} "
+          f"-> LLM 검증 {prefilter['accepted'] + prefilter['rejected']}개 생략")
+    for label, limiter in get_limiter_stats().items():
+        print(f"  [LLM 호출 제한] {label}: 호출 {limiter['calls']}, 대기 {limiter['waits']}회 ({limiter['wait_seconds']:.1f}s), "
+              f"429 {limiter['rate_limited']}, 서킷 차단 {limiter['rejected']}")
     return results
 
 if __name__ == "__main__":
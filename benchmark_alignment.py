@@ -0,0 +1,119 @@
+# benchmark_alignment.py
+# 대본 강제 정렬(forced_aligner)과 Whisper 타이밍 추출의 속도와 타이밍 오차를 비교하는 벤치마크 스크립트입니다.
+#
+# 사용법:
+#   python benchmark_alignment.py                # 픽스처가 없으면 edge-tts로 생성 후 비교
+#   python benchmark_alignment.py <fixture_dir>  # <이름>.mp3 + <이름>.txt 쌍이 들어있는 폴더 사용
+
+import os
+import sys
+import time
+import difflib
+import statistics
+
+import config
+from forced_aligner import align_text_to_audio, load_audio
+from tts_generator import create_narration, extract_timing_with_whisper, get_whisper_model
+
+DEFAULT_FIXTURE_DIR = os.path.join(config.ASSETS_DIR, "benchmark", "alignment")
+
+FIXTURE_SENTENCES = [
+    "물 한 잔이 아침을 바꿉니다.",
+    "유통기한 지난 약, 아직도 먹고 계신가요?",
+    "하루 세 번, 식후 삼십 분. 이 규칙만 지키세요.",
+    "비타민 D는 햇빛만으로 충분할까요? 정답은 아닙니다.",
+    "저장해두고 친구에게도 공유하세요!",
+    "거북목, 스마트폰 높이만 바꿔도 달라집니다.",
+]
+
+
+def generate_fixtures(fixture_dir: str) -> None:
+    os.makedirs(fixture_dir, exist_ok=True)
+    for idx, sentence in enumerate(FIXTURE_SENTENCES):
+        stem = os.path.join(fixture_dir, f"fixture_{idx + 1:02d}")
+        if os.path.exists(stem + ".mp3"):
+            continue
+        create_narration(sentence, stem + ".mp3", extract_timing=False)
+        with open(stem + ".txt", "w", encoding='utf-8') as f:
+            f.write(sentence)
+
+
+def load_fixtures(fixture_dir: str) -> list:
+    fixtures = []
+    for name in sorted(os.listdir(fixture_dir)):
+        if not name.endswith(".mp3"):
+            continue
+        txt_path = os.path.join(fixture_dir, name[:-4] + ".txt")
+        if os.path.exists(txt_path):
+            with open(txt_path, encoding='utf-8') as f:
+                fixtures.append((os.path.join(fixture_dir, name), f.read().strip()))
+    return fixtures
+
+
+def _normalize(word: str) -> str:
+    return ''.join(ch for ch in word if ch.isalnum())
+
+
+def timing_error(reference: list, candidate: list) -> tuple:
+    """단어 문자열로 두 타이밍 목록을 매칭해 (시작/끝 평균 절대 오차(초), 매칭된 단어 수)를 반환합니다."""
+    ref_words = [_normalize(t["word"]) for t in reference]
+    cand_words = [_normalize(t["word"]) for t in candidate]
+    matcher = difflib.SequenceMatcher(a=ref_words, b=cand_words, autojunk=False)
+    errors = []
+    for block in matcher.get_matching_blocks():
+        for k in range(block.size):
+            ref = reference[block.a + k]
+            cand = candidate[block.b + k]
+            errors.append(abs(ref["start"] - cand["start"]))
+            errors.append(abs(ref["end"] - cand["end"]))
+    if not errors:
+        return float('nan'), 0
+    return statistics.mean(errors), len(errors) // 2
+
+
+def run_benchmark(fixture_dir: str) -> None:
+    fixtures = load_fixtures(fixture_dir)
+    if not fixtures:
+        print(f"픽스처가 없습니다: {fixture_dir}")
+        return
+
+    # 모델 로드 시간은 비교에서 제외 (풀에 미리 로드)
+    get_whisper_model()
+    min_confidence = getattr(config, 'FORCED_ALIGN_MIN_CONFIDENCE', 0.6)
+
+    forced_times, whisper_times, errors = [], [], []
+    print(f"{'fixture':<16}{'forced(ms)':>12}{'whisper(ms)':>13}{'conf':>7}{'MAE(ms)':>10}{'matched':>9}")
+    for audio_path, text in fixtures:
+        samples = load_audio(audio_path)
+
+        start = time.perf_counter()
+        forced, confidence = align_text_to_audio(text, samples)
+        forced_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        reference = extract_timing_with_whisper(audio_path)
+        whisper_ms = (time.perf_counter() - start) * 1000
+
+        mae, matched = timing_error(reference, forced)
+        forced_times.append(forced_ms)
+        whisper_times.append(whisper_ms)
+        if matched:
+            errors.append(mae)
+        flag = "" if confidence >= min_confidence else " (폴백)"
+        print(f"{os.path.basename(audio_path):<16}{forced_ms:>12.1f}{whisper_ms:>13.1f}{confidence:>7.2f}"
+              f"{mae * 1000:>10.1f}{matched:>9}{flag}")
+
+    print("-" * 67)
+    print(f"평균 지연: 강제 정렬 {statistics.mean(forced_times):.1f}ms / Whisper {statistics.mean(whisper_times):.1f}ms "
+          f"(x{statistics.mean(whisper_times) / max(statistics.mean(forced_times), 1e-6):.0f})")
+    if errors:
+        print(f"Whisper 대비 평균 타이밍 오차: {statistics.mean(errors) * 1000:.1f}ms (중앙값 {statistics.median(errors) * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        target_dir = sys.argv[1]
+    else:
+        target_dir = DEFAULT_FIXTURE_DIR
+        generate_fixtures(target_dir)
+    run_benchmark(target_dir)
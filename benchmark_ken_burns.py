@@ -0,0 +1,87 @@
+# benchmark_ken_burns.py
+# Ken Burns 프레임 생성 속도(frames/s)를 기존 방식(원본 해상도 crop + LANCZOS)과 비교하는 마이크로 벤치마크입니다.
+#
+# 사용법:
+#   python benchmark_ken_burns.py              # 6000x4000 합성 이미지로 측정
+#   python benchmark_ken_burns.py photo.jpg    # 지정한 이미지로 측정
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+import config
+from video_assembler import KenBurnsRenderer, KEN_BURNS_RESAMPLE
+
+FRAMES = 48
+TARGET_RESOLUTION = (config.REELS_WIDTH, config.REELS_HEIGHT)
+
+
+def make_test_image(path: str, size=(6000, 4000)) -> None:
+    width, height = size
+    x = np.linspace(0, 255, width, dtype=np.uint8)
+    y = np.linspace(0, 255, height, dtype=np.uint8)
+    rgb = np.stack([
+        np.broadcast_to(x, (height, width)),
+        np.broadcast_to(y[:, None], (height, width)),
+        np.random.randint(0, 255, (height, width), dtype=np.uint8),
+    ], axis=-1)
+    Image.fromarray(np.ascontiguousarray(rgb)).save(path, quality=90)
+
+
+def legacy_frames_per_second(image_path: str, duration: float) -> float:
+    """기존 create_ken_burns_clip의 프레임 생성 방식 (매 프레임 원본에서 crop 후 LANCZOS 리사이즈)"""
+    img = Image.open(image_path)
+    img_width, img_height = img.size
+    target_aspect = TARGET_RESOLUTION[0] / TARGET_RESOLUTION[1]
+    start_w, end_w = img_width / 1.0, img_width / 1.2
+    start_h, end_h = start_w / target_aspect, end_w / target_aspect
+    if start_h > img_height:
+        start_h, start_w = img_height, img_height * target_aspect
+    if end_h > img_height:
+        end_h, end_w = img_height, img_height * target_aspect
+    start_left, start_top = (img_width - start_w) / 2, (img_height - start_h) / 2
+    end_left, end_top = (img_width - end_w) / 2, (img_height - end_h) / 2
+
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        progress = i / FRAMES
+        left = start_left + (end_left - start_left) * progress
+        top = start_top + (end_top - start_top) * progress
+        width = start_w + (end_w - start_w) * progress
+        height = start_h + (end_h - start_h) * progress
+        cropped = img.crop((left, top, left + width, top + height))
+        np.array(cropped.resize(TARGET_RESOLUTION, Image.LANCZOS))
+    return FRAMES / (time.perf_counter() - start)
+
+
+def renderer_frames_per_second(image_path: str, duration: float, quality: str) -> tuple:
+    start = time.perf_counter()
+    renderer = KenBurnsRenderer(image_path, duration, TARGET_RESOLUTION, quality=quality)
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        renderer.frame(duration * i / FRAMES)
+    return FRAMES / (time.perf_counter() - start), setup
+
+
+if __name__ == "__main__":
+    duration = 5.0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 1:
+            image_path = sys.argv[1]
+        else:
+            image_path = os.path.join(temp_dir, "ken_burns_source.jpg")
+            make_test_image(image_path)
+
+        print(f"원본: {Image.open(image_path).size}, 출력: {TARGET_RESOLUTION}, 프레임 {FRAMES}개")
+        before = legacy_frames_per_second(image_path, duration)
+        print(f"  기존 (crop + LANCZOS)   : {before:7.1f} frames/s")
+        for quality in KEN_BURNS_RESAMPLE:
+            after, setup = renderer_frames_per_second(image_path, duration, quality)
+            print(f"  KenBurnsRenderer {quality:<6}: {after:7.1f} frames/s "
+                  f"(x{after / before:.1f}, 준비 {setup * 1000:.0f}ms)")
@@ -1,12 +1,9 @@
-from google import genai
-import config
-import os
+from llm_providers import providers
 
-api_key = getattr(config, 'GEMINI_API_KEY', None)
-if not api_key:
+client = providers.client("gemini")
+if not client:
     print("No API Key found")
 else:
-    client = genai.Client(api_key=api_key)
     print("Listing available models...")
     for m in client.models.list():
         print(f"Model Name: {m.name}")
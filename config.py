@@ -33,9 +33,14 @@ GROQ_API_KEY = get_api_key('GROQ_API_KEY', 'GROQ_API_KEY')
 
 # Pexels API Settings
 PEXELS_API_URL = "https://api.pexels.com/videos/search"
+PEXELS_VIDEO_URL = "https://api.pexels.com/videos/videos/{video_id}" # 영상 ID로 렌디션 목록 조회
 PEXELS_SEARCH_PER_PAGE = 15
 PEXELS_SEARCH_ORIENTATION = "portrait"
 PEXELS_SEARCH_SIZE = "large"
+PARALLEL_DOWNLOAD_THRESHOLD_MB = settings_manager.get('PARALLEL_DOWNLOAD_THRESHOLD_MB', 16) # 이보다 큰 영상은 구간 병렬 다운로드
+PARALLEL_DOWNLOAD_PARTS = settings_manager.get('PARALLEL_DOWNLOAD_PARTS', 4)
+PEXELS_SEARCH_CACHE_TTL_HOURS = settings_manager.get('PEXELS_SEARCH_CACHE_TTL_HOURS', 72) # 같은 검색어 재사용 기간
+RENDITION_MAX_UPSCALE = settings_manager.get('RENDITION_MAX_UPSCALE', 1.05) # 렌디션 선택 시 허용할 최대 업스케일 배율
 
 # Directory Settings
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -43,6 +48,14 @@ ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 DOWNLOADED_MEDIA_DIR = os.path.join(ASSETS_DIR, "downloaded_media")
 NARRATION_AUDIO_DIR = os.path.join(ASSETS_DIR, "narration_audio")
 FINAL_REELS_DIR = os.path.join(ASSETS_DIR, "final_reels")
+CACHE_DIR = os.path.join(ASSETS_DIR, "cache")
+NARRATION_CACHE_DIR = os.path.join(CACHE_DIR, "narration")
+PEXELS_SEARCH_CACHE_DIR = os.path.join(CACHE_DIR, "pexels_search")
+OVERLAY_CACHE_DIR = os.path.join(CACHE_DIR, "overlays")
+SCENE_CACHE_DIR = os.path.join(CACHE_DIR, "scenes")
+VALIDATION_CACHE_PATH = os.path.join(CACHE_DIR, "validation.sqlite3")
+PROVIDER_HEALTH_PATH = os.path.join(CACHE_DIR, "provider_health.json")
+PREFILTER_CORPUS_PATH = os.path.join(CACHE_DIR, "prefilter_corpus.json")
 
 # Reels Settings
 REELS_WIDTH = settings_manager.get('REELS_WIDTH', 1080)
@@ -63,6 +76,7 @@ TEXT_STROKE_COLOR = settings_manager.get('TEXT_STROKE_COLOR', 'black')
 TEXT_STROKE_WIDTH = settings_manager.get('TEXT_STROKE_WIDTH', 4) # 테두리 가독성 확보
 HIGHLIGHT_TEXT_COLOR = settings_manager.get('HIGHLIGHT_TEXT_COLOR', 'yellow')
 TEXT_POSITION_Y_RATIO = settings_manager.get('TEXT_POSITION_Y_RATIO', 0.7) # 자막 위치를 위로 올림 (0.7 ~ 0.8 추천)
+OVERLAY_CACHE_MAX_FILES = settings_manager.get('OVERLAY_CACHE_MAX_FILES', 1000) # 자막 PNG 캐시 최대 개수 (초과 시 오래 안 쓴 것부터 삭제)
 
 TEXT_BG_ENABLED = settings_manager.get('TEXT_BG_ENABLED', True)
 TEXT_BG_COLOR = settings_manager.get('TEXT_BG_COLOR', (0, 0, 0, 180)) # 가독성 위해 조금 더 어둡게
@@ -72,6 +86,16 @@ TEXT_BORDER_RADIUS = settings_manager.get('TEXT_BORDER_RADIUS', 25)
 # TTS Settings
 TTS_VOICE = settings_manager.get('TTS_VOICE', "ko-KR-SunHiNeural")
 TTS_RATE = settings_manager.get('TTS_RATE', "+25%")
+TTS_MAX_CONCURRENCY = settings_manager.get('TTS_MAX_CONCURRENCY', 6) # 릴스 1편의 나레이션 동시 합성 수
+NARRATION_CACHE_ENABLED = settings_manager.get('NARRATION_CACHE_ENABLED', True)
+NARRATION_CACHE_MAX_MB = settings_manager.get('NARRATION_CACHE_MAX_MB', 500) # 초과 시 오래 안 쓴 항목부터 삭제 (LRU)
+
+# Whisper Settings (단어 타이밍 추출)
+WHISPER_MODEL_SIZE = settings_manager.get('WHISPER_MODEL_SIZE', "base")
+WHISPER_WARMUP = settings_manager.get('WHISPER_WARMUP', True) # 앱/배치 시작 시 백그라운드 사전 로드
+WHISPER_ALIGN_MODE = settings_manager.get('WHISPER_ALIGN_MODE', "reel") # "reel": 릴스 단위 1회 전사, "scene": 장면별 전사
+TIMING_ENGINE = settings_manager.get('TIMING_ENGINE', "whisper") # "whisper": 항상 Whisper (기본), "forced": 대본 강제 정렬 우선 (benchmark_alignment.py로 정확도 확인 후 사용)
+FORCED_ALIGN_MIN_CONFIDENCE = settings_manager.get('FORCED_ALIGN_MIN_CONFIDENCE', 0.6) # 미만이면 Whisper로 폴백
 
 # Audio Ducking Settings
 BGM_DUCK_VOLUME = settings_manager.get('BGM_DUCK_VOLUME', 0.1)
@@ -79,4 +103,41 @@ BGM_NORMAL_VOLUME = settings_manager.get('BGM_NORMAL_VOLUME', 0.35)
 
 # Performance & Robustness (Roadmap 4)
 GPU_ACCELERATION = settings_manager.get('GPU_ACCELERATION', False) # 충돌 방지를 위해 확실히 꺼둠
-FFMPEG_VIDEO_CODEC = "h264_videotoolbox" if GPU_ACCELERATION else "libx264"
\ No newline at end of file
+FFMPEG_VIDEO_CODEC = "h264_videotoolbox" if GPU_ACCELERATION else "libx264"
+ENCODER_PROFILE = settings_manager.get('ENCODER_PROFILE', None) # autotune_encoder.py가 저장한 인코더 설정 {"codec", "preset", "crf", "bitrate", "tune", "threads"}
+ENCODER_MIN_FPS = settings_manager.get('ENCODER_MIN_FPS', 48) # 자동 튜닝 처리량 예산: 최소 인코딩 속도 (frames/s)
+ENCODER_MIN_SSIM = settings_manager.get('ENCODER_MIN_SSIM', 0.97) # 자동 튜닝 최소 화질 (SSIM)
+KEN_BURNS_QUALITY = settings_manager.get('KEN_BURNS_QUALITY', "high") # "high"(lanczos) / "fast"(bilinear) / "draft"(nearest)
+RENDER_BACKEND = settings_manager.get('RENDER_BACKEND', "segments") # "segments": 장면별 병렬 렌더링 후 연결 / "ffmpeg": 단일 filter_complex 렌더링 / "moviepy" (ffmpeg 계열 실패 시 MoviePy 폴백)
+RENDER_MAX_WORKERS = settings_manager.get('RENDER_MAX_WORKERS', 0) # 동시에 렌더링할 세그먼트 수 (0: CPU 코어 수)
+DRAFT_WIDTH = settings_manager.get('DRAFT_WIDTH', 360) # 초안(미리보기) 렌더링 해상도/프레임레이트
+DRAFT_HEIGHT = settings_manager.get('DRAFT_HEIGHT', 640)
+DRAFT_FPS = settings_manager.get('DRAFT_FPS', 12)
+SCENE_CACHE_ENABLED = settings_manager.get('SCENE_CACHE_ENABLED', True) # 장면 지문 캐시 (바뀐 장면만 다시 검색/렌더링)
+SEGMENT_CACHE_MAX_MB = settings_manager.get('SEGMENT_CACHE_MAX_MB', 2000) # 렌더링 세그먼트 캐시 최대 용량 (초과 시 LRU 삭제)
+INGEST_NORMALIZE_ENABLED = settings_manager.get('INGEST_NORMALIZE_ENABLED', True) # 다운로드 직후 영상을 릴스 규격으로 미리 변환
+INGEST_MAX_WORKERS = settings_manager.get('INGEST_MAX_WORKERS', 2) # 백그라운드 정규화 동시 실행 수
+INGEST_TRIM_MARGIN_SECONDS = settings_manager.get('INGEST_TRIM_MARGIN_SECONDS', 1.0) # 장면 길이보다 더 변환해 두는 여유 (초)
+
+# 장면 병렬 처리 (미디어 검색/다운로드/AI 검증)
+SCENE_MAX_WORKERS = settings_manager.get('SCENE_MAX_WORKERS', 4) # 동시에 처리할 장면 수
+PEXELS_MAX_CONCURRENCY = settings_manager.get('PEXELS_MAX_CONCURRENCY', 3) # Pexels 검색/다운로드 동시 실행 수
+VALIDATION_MAX_CONCURRENCY = settings_manager.get('VALIDATION_MAX_CONCURRENCY', 2) # LLM 검증 동시 요청 수
+VALIDATION_CACHE_ENABLED = settings_manager.get('VALIDATION_CACHE_ENABLED', True) # 같은 미디어/맥락의 AI 검증 결과 재사용
+VALIDATION_CACHE_TTL_HOURS = settings_manager.get('VALIDATION_CACHE_TTL_HOURS', 168) # AI 검증 판정 보관 기간
+PREFILTER_ENABLED = settings_manager.get('PREFILTER_ENABLED', True) # 태그/URL 단어 일치(BM25)로 확실한 후보는 LLM 없이 판정
+PREFILTER_ACCEPT_SCORE = settings_manager.get('PREFILTER_ACCEPT_SCORE', 0.5) # 이 점수 이상이면 로컬에서 통과 (0~1)
+PREFILTER_REJECT_SCORE = settings_manager.get('PREFILTER_REJECT_SCORE', 0.05) # 이 점수 이하면 로컬에서 반려 (다음 장면 키워드로 재검색)
+PREFILTER_MIN_TERMS = settings_manager.get('PREFILTER_MIN_TERMS', 4) # 후보의 내용 단어가 이보다 적으면 판단하지 않고 LLM에 넘김
+
+# LLM 호출 제한 (provider/모델별로 프로세스 전체가 공유)
+LLM_RATE_LIMITS = settings_manager.get('LLM_RATE_LIMITS', {}) # {"gemini": {"rpm": 10, "tpm": 250000}, "groq:llama-3.3-70b-versatile": {...}} 형식, 비우면 무료 티어 기본값
+LLM_MAX_RETRIES = settings_manager.get('LLM_MAX_RETRIES', 3) # 429 응답 시 재시도 횟수
+LLM_BACKOFF_BASE_SECONDS = settings_manager.get('LLM_BACKOFF_BASE_SECONDS', 5) # Retry-After가 없을 때 지수 백오프 시작 값
+LLM_MAX_WAIT_SECONDS = settings_manager.get('LLM_MAX_WAIT_SECONDS', 90) # 이보다 오래 기다려야 하면 대기하지 않고 바로 실패
+LLM_CIRCUIT_COOLDOWN_SECONDS = settings_manager.get('LLM_CIRCUIT_COOLDOWN_SECONDS', 60) # 쿼터 소진 시 호출을 멈추는 최소 시간
+LLM_CIRCUIT_FAILURE_THRESHOLD = settings_manager.get('LLM_CIRCUIT_FAILURE_THRESHOLD', 5) # 연속 오류가 이 횟수에 닿으면 서킷 열림
+LLM_HEALTH_TTL_SECONDS = settings_manager.get('LLM_HEALTH_TTL_SECONDS', 600) # 실제 호출로 확인한 provider 상태를 재사용하는 시간 (앱 시작 시 상태 확인 요청 생략)
+SCRIPT_STREAMING_ENABLED = settings_manager.get('SCRIPT_STREAMING_ENABLED', True) # 대본을 스트리밍으로 받아 장면이 완성되는 대로 처리
+SCRIPT_STREAM_PREFETCH = settings_manager.get('SCRIPT_STREAM_PREFETCH', True) # 스트리밍 중 완성된 장면의 나레이션/영상을 미리 준비
+SCRIPT_STREAM_TEXT_INTERVAL = settings_manager.get('SCRIPT_STREAM_TEXT_INTERVAL', 0.25) # 생성 중인 대본 텍스트를 화면에 갱신하는 최소 간격 (초)
@@ -65,6 +65,7 @@ TkinterVideo._load = safe_tk_load
 from main import generate_script_pipeline, generate_video_pipeline
 import config
 from ai_script_generator import check_api_health
+from tts_generator import warmup_whisper_model
 
 
 class ReelsApp(tk.Tk):
@@ -134,6 +135,10 @@ class ReelsApp(tk.Tk):
         # API 상태 확인 시작
         self.check_api_status()
 
+        # 대본 작성 동안 Whisper 모델을 백그라운드에서 미리 로드
+        if getattr(config, 'WHISPER_WARMUP', True):
+            warmup_whisper_model()
+
     def configure_styles(self):
         """UI 스타일을 설정합니다."""
         self.style.configure('TFrame', background='#f0f0f0')
@@ -198,6 +203,9 @@ class ReelsApp(tk.Tk):
         self.generate_video_button = ttk.Button(step3_frame, text="🎬 2단계: 영상 제작 시작", command=self.start_video_generation, state=tk.DISABLED, style='Primary.TButton')
         self.generate_video_button.pack(pady=10)
 
+        self.draft_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(step3_frame, text="⚡ 빠른 초안 (저해상도 미리보기)", variable=self.draft_var).pack()
+
         # API 상태 (작게 표시)
         api_status_frame = ttk.Frame(self.left_panel)
         api_status_frame.pack(pady=5, fill=tk.X)
@@ -253,12 +261,18 @@ class ReelsApp(tk.Tk):
         self.progress_bar["value"] = 5
         self.status_var.set("AI 작가가 스크립트를 작성 중입니다...")
         
+        draft = self.draft_var.get() # 초안 모드면 미리 받는 영상도 초안 규격으로
+
         def run():
             try:
                 def progress_callback(percent, message):
                     self.progress_queue.put(("progress", (percent, message)))
 
-                script_data = generate_script_pipeline("내우약", theme, duration, provider, progress_callback)
+                def script_text_callback(text):
+                    self.progress_queue.put(("script_stream", text))
+
+                script_data = generate_script_pipeline("내우약", theme, duration, provider, progress_callback,
+                                                       script_text_callback=script_text_callback, draft=draft)
                 if script_data:
                     self.progress_queue.put(("script_ready", script_data))
                 else:
@@ -284,9 +298,10 @@ class ReelsApp(tk.Tk):
         except ValueError:
             duration = 30
 
-        self.generate_video_button.config(state=tk.DISABLED, text="📹 영상 제작 중...")
+        draft = self.draft_var.get()
+        self.generate_video_button.config(state=tk.DISABLED, text="📹 초안 제작 중..." if draft else "📹 영상 제작 중...")
         self.generate_script_button.config(state=tk.DISABLED)
-        self.status_var.set("영상 제작을 시작합니다...")
+        self.status_var.set("초안 제작을 시작합니다..." if draft else "영상 제작을 시작합니다...")
         
         # 이전 재생 중지
         self.stop_playback()
@@ -300,7 +315,7 @@ class ReelsApp(tk.Tk):
                 def progress_callback(percent, message):
                     self.progress_queue.put(("progress", (percent, message)))
 
-                final_path = generate_video_pipeline(self.current_script_data, target_duration=duration, progress_callback=progress_callback)
+                final_path = generate_video_pipeline(self.current_script_data, target_duration=duration, progress_callback=progress_callback, draft=draft)
                 if final_path:
                     self.progress_queue.put(("complete", final_path))
                 else:
@@ -319,6 +334,11 @@ class ReelsApp(tk.Tk):
                     percent, message = data
                     self.progress_bar["value"] = percent
                     self.status_var.set(message)
+                elif msg_type == "script_stream":
+                    # 생성 중인 대본을 편집기에 실시간으로 표시 (완료되면 script_ready에서 정리된 JSON으로 교체)
+                    self.script_text.delete(1.0, tk.END)
+                    self.script_text.insert(tk.END, data)
+                    self.script_text.see(tk.END)
                 elif msg_type == "script_ready":
                     self.current_script_data = data
                     self.script_text.delete(1.0, tk.END)
@@ -0,0 +1,429 @@
+# ffmpeg_renderer.py
+# 이 파일은 장면 데이터를 하나의 ffmpeg filter_complex 명령으로 컴파일하여 릴스 영상을 렌더링하는 모듈입니다.
+# 디코딩 -> 크기 조정/자르기 -> 자막 합성 -> 연결 -> 인코딩이 모두 ffmpeg 내부에서 처리되므로
+# 파이썬으로 프레임을 주고받는 MoviePy 방식보다 훨씬 빠릅니다. 실패 시 video_assembler가 MoviePy로 폴백합니다.
+# 오디오는 audio_mixer가 미리 믹싱한 WAV를 그대로 인코딩합니다.
+# 세그먼트 모드는 장면마다 별도 ffmpeg 프로세스로 렌더링한 뒤 concat demuxer로 이어 붙여 여러 코어를 사용합니다.
+# 초안(draft) 모드는 같은 그래프를 저해상도/저fps 규격, 저렴한 스케일러, 가장 빠른 프리셋으로 렌더링합니다.
+
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import config
+from scene_cache import scene_cache_enabled, segment_fingerprint, segment_path, lookup_segment, evict_segments
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+AUDIO_SAMPLE_RATE = 44100
+TRANSITION_SECONDS = 0.5
+
+# Ken Burns 샘플링 품질별 ffmpeg 스케일러 (video_assembler.KEN_BURNS_RESAMPLE과 대응)
+KEN_BURNS_SCALER = {
+    "high": "lanczos",
+    "fast": "bilinear",
+    "draft": "neighbor",
+}
+KEN_BURNS_START_ZOOM = 1.0
+KEN_BURNS_END_ZOOM = 1.2
+
+# 초안(미리보기) 렌더링은 화질보다 속도 우선: 가장 빠른 프리셋 + 높은 CRF
+DRAFT_ENCODER_PROFILE = {"codec": "libx264", "preset": "ultrafast", "crf": 30, "bitrate": None, "tune": None, "threads": None}
+DRAFT_SCALER = "fast_bilinear"
+
+
+def get_ffmpeg_binary() -> Optional[str]:
+    """시스템 ffmpeg를 우선 사용하고, 없으면 MoviePy가 쓰는 imageio-ffmpeg 바이너리를 사용합니다."""
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def get_encoder_profile() -> dict:
+    """
+    영상 인코더 설정. 기본값(ultrafast, GPU 사용 시 하드웨어 인코더) 위에
+    autotune_encoder.py가 측정해 저장한 config.ENCODER_PROFILE을 덮어씁니다.
+    """
+    gpu = getattr(config, 'GPU_ACCELERATION', False)
+    profile = {
+        "codec": getattr(config, 'FFMPEG_VIDEO_CODEC', config.REELS_CODEC),
+        "preset": None if gpu else "ultrafast",
+        "crf": None,
+        "bitrate": None,
+        "tune": None,
+        "threads": None,
+    }
+    profile.update(getattr(config, 'ENCODER_PROFILE', None) or {})
+    return profile
+
+
+def encoder_quality_args(profile: dict) -> list:
+    """프로필의 속도/화질 옵션 (-preset, -crf, -b:v, -tune)"""
+    args = []
+    if profile.get("preset"):
+        args += ["-preset", profile["preset"]]
+    if profile.get("crf") is not None:
+        args += ["-crf", str(profile["crf"])]
+    if profile.get("bitrate"):
+        args += ["-b:v", str(profile["bitrate"])]
+    if profile.get("tune"):
+        args += ["-tune", profile["tune"]]
+    return args
+
+
+def _video_encoder_args(profile: Optional[dict] = None, fps: Optional[int] = None) -> list:
+    profile = profile or get_encoder_profile()
+    return ["-c:v", profile["codec"], *encoder_quality_args(profile),
+            "-pix_fmt", "yuv420p", "-r", str(fps or config.REELS_FPS)]
+
+
+def get_render_format(draft: bool = False) -> dict:
+    """
+    출력 규격 {"width", "height", "fps", "scaler", "ken_burns", "profile"}.
+    draft=True면 미리보기용 저해상도/저fps 규격에 가장 저렴한 리샘플링과 가장 빠른 인코더 설정을 사용합니다.
+    """
+    if draft:
+        return {
+            "width": getattr(config, 'DRAFT_WIDTH', 360),
+            "height": getattr(config, 'DRAFT_HEIGHT', 640),
+            "fps": getattr(config, 'DRAFT_FPS', 12),
+            "scaler": DRAFT_SCALER,
+            "ken_burns": "draft",
+            "profile": dict(DRAFT_ENCODER_PROFILE),
+        }
+    return {
+        "width": config.REELS_WIDTH,
+        "height": config.REELS_HEIGHT,
+        "fps": config.REELS_FPS,
+        "scaler": None,  # ffmpeg 기본(bicubic)
+        "ken_burns": getattr(config, 'KEN_BURNS_QUALITY', "high"),
+        "profile": get_encoder_profile(),
+    }
+
+
+def _audio_encoder_args() -> list:
+    return ["-c:a", config.REELS_AUDIO_CODEC, "-b:a", "192k", "-ar", str(AUDIO_SAMPLE_RATE)]
+
+
+class FilterGraph:
+    """ffmpeg 입력 목록과 filter_complex 체인을 함께 쌓아가는 빌더"""
+    def __init__(self):
+        self.inputs = []
+        self.chains = []
+
+    def add_input(self, path: str, *options: str) -> int:
+        self.inputs.append([*options, "-i", path])
+        return len(self.inputs) - 1
+
+    def add_chain(self, chain: str) -> None:
+        self.chains.append(chain)
+
+    def input_args(self) -> list:
+        return [arg for options in self.inputs for arg in options]
+
+    def filter_complex(self) -> str:
+        return ";\n".join(self.chains)
+
+
+def _add_scene_video(graph: FilterGraph, idx: int, scene: dict, overlay_path: Optional[str],
+                     render_format: dict) -> str:
+    """장면 하나의 영상 체인을 추가하고 출력 라벨을 반환합니다."""
+    width, height, fps = render_format["width"], render_format["height"], render_format["fps"]
+    media_path = scene.get('media_path')
+    duration = scene.get('duration', 5)
+    flags = f":flags={render_format['scaler']}" if render_format.get("scaler") else ""
+    fit = f"scale={width}:{height}:force_original_aspect_ratio=increase{flags},crop={width}:{height}"
+    base = f"v{idx}base"
+
+    if media_path and os.path.exists(media_path) and media_path.lower().endswith(IMAGE_EXTENSIONS):
+        # Ken Burns: 단일 이미지 프레임에서 zoompan으로 매 프레임 확대 (중앙 기준 1.0 -> 1.2)
+        quality = render_format["ken_burns"]
+        scaler = KEN_BURNS_SCALER.get(quality, "lanczos")
+        supersample = 2 if quality == "high" else 1  # zoompan 좌표 반올림 떨림 완화
+        frames = max(1, round(duration * fps))
+        zoom_step = (KEN_BURNS_END_ZOOM - KEN_BURNS_START_ZOOM) / frames
+        k = graph.add_input(media_path)
+        graph.add_chain(
+            f"[{k}:v]scale={width * supersample}:{height * supersample}:force_original_aspect_ratio=increase"
+            f":flags={scaler},crop={width * supersample}:{height * supersample},"
+            f"zoompan=z='{KEN_BURNS_START_ZOOM}+{zoom_step:.8f}*on':x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+            f":d={frames}:s={width}x{height}:fps={fps},"
+            f"trim=duration={duration:.3f},setpts=PTS-STARTPTS,setsar=1[{base}]"
+        )
+    elif media_path and os.path.exists(media_path):
+        # 인제스트에서 정규화된 영상은 이미 출력 규격이므로 크기 조정/프레임레이트 변환을 생략
+        prepare = "" if scene.get('normalized') else f"{fit},fps={fps},"
+        # 영상이 장면보다 짧으면 마지막 프레임을 유지
+        k = graph.add_input(media_path, "-t", f"{duration:.3f}")
+        graph.add_chain(
+            f"[{k}:v]{prepare}tpad=stop_mode=clone:stop_duration={duration:.3f},"
+            f"trim=duration={duration:.3f},setpts=PTS-STARTPTS,setsar=1[{base}]"
+        )
+    else:
+        print(f"  ⚠️ 미디어 파일 없음, 검은 화면으로 대체: {media_path}")
+        graph.add_chain(f"color=c=black:s={width}x{height}:r={fps}:d={duration:.3f},setsar=1[{base}]")
+
+    label = base
+    if overlay_path:
+        k = graph.add_input(overlay_path)
+        text_y = int(height * config.TEXT_POSITION_Y_RATIO)
+        graph.add_chain(f"[{label}][{k}:v]overlay=x=(W-w)/2:y={text_y}:format=auto[v{idx}text]")
+        label = f"v{idx}text"
+
+    transition = scene.get('transition', 'cut')
+    post = ["format=yuv420p"]
+    if transition in ("fade", "crossfade"):
+        post.insert(0, f"fade=t=in:st=0:d={TRANSITION_SECONDS}")
+    graph.add_chain(f"[{label}]{','.join(post)}[v{idx}]")
+    return f"v{idx}"
+
+
+def build_render_command(scenes_data: List[dict], output_filepath: str, audio_path: str,
+                         overlay_paths: Optional[List[Optional[str]]] = None,
+                         ffmpeg_binary: Optional[str] = None, draft: bool = False) -> list:
+    """장면 데이터를 하나의 ffmpeg 명령(filter_complex)으로 컴파일합니다. 오디오는 믹싱된 audio_path를 사용합니다."""
+    render_format = get_render_format(draft)
+    overlay_paths = overlay_paths or [None] * len(scenes_data)
+    graph = FilterGraph()
+
+    video_labels = [
+        f"[{_add_scene_video(graph, idx, scene, overlay_paths[idx], render_format)}]"
+        for idx, scene in enumerate(scenes_data)
+    ]
+    graph.add_chain(f"{''.join(video_labels)}concat=n={len(scenes_data)}:v=1:a=0[vout]")
+    audio_input = graph.add_input(audio_path)
+    profile = render_format["profile"]
+
+    return [
+        ffmpeg_binary or get_ffmpeg_binary() or "ffmpeg",
+        "-y", "-hide_banner", "-loglevel", "error",
+        *graph.input_args(),
+        "-filter_complex", graph.filter_complex(),
+        "-map", "[vout]", "-map", f"{audio_input}:a",
+        *_video_encoder_args(profile, render_format["fps"]),
+        *_audio_encoder_args(),
+        "-threads", str(profile.get("threads") or os.cpu_count() or 1),
+        "-movflags", "+faststart",
+        "-f", "mp4",
+        output_filepath,
+    ]
+
+
+def render_reel_ffmpeg(scenes_data: List[dict], output_filepath: str, audio_path: str,
+                       overlay_paths: Optional[List[Optional[str]]] = None, draft: bool = False) -> Optional[str]:
+    """
+    ffmpeg 한 번의 실행으로 릴스를 렌더링합니다.
+
+    Args:
+        scenes_data: assemble_reel과 같은 장면 목록 (duration은 이미 정규화된 값)
+        output_filepath: 출력 mp4 경로
+        audio_path: audio_mixer로 믹싱한 최종 오디오(WAV)
+        overlay_paths: 장면별 자막 PNG 경로 (없으면 None)
+        draft: True면 미리보기용 저해상도 규격으로 렌더링 (get_render_format 참고)
+
+    Returns:
+        성공 시 출력 경로, ffmpeg가 없거나 실패하면 None (호출 측에서 MoviePy로 폴백)
+    """
+    if not scenes_data:
+        return None
+    ffmpeg_binary = get_ffmpeg_binary()
+    if not ffmpeg_binary:
+        print("  ⚠️ ffmpeg 실행 파일을 찾을 수 없습니다.")
+        return None
+
+    output_dir = os.path.dirname(output_filepath)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    temp_path = output_filepath + ".part"
+
+    cmd = build_render_command(scenes_data, temp_path, audio_path, overlay_paths, ffmpeg_binary, draft)
+    print(f"  [ffmpeg 렌더링] 장면 {len(scenes_data)}개, 입력 {cmd.count('-i')}개")
+    if not _run_ffmpeg(cmd, temp_path, "ffmpeg 렌더링"):
+        return None
+    os.replace(temp_path, output_filepath)
+    return output_filepath
+
+
+def _run_ffmpeg(cmd: list, temp_path: str, label: str) -> bool:
+    """ffmpeg 명령을 실행하고 temp_path가 만들어졌는지 확인합니다. 실패 시 오류 끝부분을 출력하고 임시 파일을 지웁니다."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except OSError as e:
+        print(f"  ❌ {label} 실행 실패: {e}")
+        return False
+
+    if result.returncode != 0 or not os.path.exists(temp_path):
+        error_tail = "\n".join(result.stderr.strip().splitlines()[-10:])
+        print(f"  ❌ {label} 실패 (code {result.returncode}):\n{error_tail}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def quantize_scene_durations(scenes_data: List[dict], fps: int) -> List[dict]:
+    """
+    장면 길이를 프레임 단위로 맞춘 사본을 반환합니다.
+    영상의 장면 경계와 믹싱 오디오의 장면 경계(나레이션, 효과음 위치)가 정확히 같아야 어긋나지 않습니다.
+    """
+    return [{**scene, 'duration': max(1, round(scene.get('duration', 5) * fps)) / fps} for scene in scenes_data]
+
+
+def build_segment_command(scene: dict, overlay_path: Optional[str], output_filepath: str,
+                          threads: int, ffmpeg_binary: Optional[str] = None,
+                          render_format: Optional[dict] = None) -> list:
+    """
+    장면 하나를 독립 영상 세그먼트로 렌더링하는 명령을 만듭니다.
+    모든 세그먼트가 같은 코덱 설정과 닫힌 GOP를 사용하므로 concat demuxer로 재인코딩 없이 이어 붙일 수 있습니다.
+    (오디오는 릴스 전체를 한 번에 믹싱하므로 세그먼트에는 넣지 않음)
+    """
+    render_format = render_format or get_render_format()
+    fps = render_format["fps"]
+    graph = FilterGraph()
+    video_label = _add_scene_video(graph, 0, scene, overlay_path, render_format)
+    return [
+        ffmpeg_binary or get_ffmpeg_binary() or "ffmpeg",
+        "-y", "-hide_banner", "-loglevel", "error",
+        *graph.input_args(),
+        "-filter_complex", graph.filter_complex(),
+        "-map", f"[{video_label}]", "-an",
+        *_video_encoder_args(render_format["profile"], fps),
+        "-g", str(fps), "-flags", "+cgop",
+        "-threads", str(threads),
+        "-f", "matroska",
+        output_filepath,
+    ]
+
+
+def render_segment(scene: dict, overlay_path: Optional[str], output_filepath: str,
+                   threads: int = 1, ffmpeg_binary: Optional[str] = None,
+                   render_format: Optional[dict] = None) -> Optional[str]:
+    """장면 하나를 세그먼트(.mkv)로 렌더링합니다. 실패 시 None."""
+    temp_path = f"{output_filepath}.{uuid.uuid4().hex}.part"  # 다른 실행이 같은 세그먼트를 만들어도 충돌하지 않도록
+    cmd = build_segment_command(scene, overlay_path, temp_path, threads, ffmpeg_binary, render_format)
+    if not _run_ffmpeg(cmd, temp_path, f"세그먼트 렌더링 ({os.path.basename(output_filepath)})"):
+        return None
+    os.replace(temp_path, output_filepath)
+    return output_filepath
+
+
+def _concat_list_line(path: str) -> str:
+    escaped = os.path.abspath(path).replace("'", "'\\''")
+    return f"file '{escaped}'"
+
+
+def concat_segments(segment_paths: List[str], output_filepath: str, audio_path: str,
+                    ffmpeg_binary: Optional[str] = None) -> Optional[str]:
+    """세그먼트를 concat demuxer로 이어 붙입니다. 영상은 스트림 복사하고, 믹싱된 오디오만 AAC로 인코딩합니다."""
+    ffmpeg_binary = ffmpeg_binary or get_ffmpeg_binary() or "ffmpeg"
+    temp_path = output_filepath + ".part"
+    list_path = output_filepath + ".concat.txt"
+    with open(list_path, "w", encoding='utf-8') as f:
+        f.write("\n".join(_concat_list_line(path) for path in segment_paths) + "\n")
+
+    cmd = [
+        ffmpeg_binary, "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "concat", "-safe", "0", "-i", list_path,
+        "-i", audio_path,
+        "-map", "0:v", "-map", "1:a",
+        "-c:v", "copy",
+        *_audio_encoder_args(),
+        "-movflags", "+faststart",
+        "-f", "mp4",
+        temp_path,
+    ]
+    try:
+        if not _run_ffmpeg(cmd, temp_path, "세그먼트 연결"):
+            return None
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+    os.replace(temp_path, output_filepath)
+    return output_filepath
+
+
+def render_reel_segments(scenes_data: List[dict], output_filepath: str, audio_path: str,
+                         overlay_paths: Optional[List[Optional[str]]] = None,
+                         max_workers: Optional[int] = None, draft: bool = False) -> Optional[str]:
+    """
+    장면별 세그먼트를 병렬로 렌더링한 뒤 concat demuxer로 이어 붙입니다.
+    세그먼트마다 별도의 ffmpeg 프로세스가 실행되므로 렌더링 시간이 CPU 코어 수에 비례해 줄어듭니다.
+    세그먼트는 장면 지문으로 캐시되어, 다시 제작할 때는 바뀐 장면만 렌더링하고 다시 이어 붙입니다.
+
+    Returns:
+        성공 시 출력 경로, 실패하면 None (호출 측에서 폴백)
+    """
+    if not scenes_data:
+        return None
+    ffmpeg_binary = get_ffmpeg_binary()
+    if not ffmpeg_binary:
+        print("  ⚠️ ffmpeg 실행 파일을 찾을 수 없습니다.")
+        return None
+
+    render_format = get_render_format(draft)
+    scenes = quantize_scene_durations(scenes_data, render_format["fps"])
+    overlay_paths = overlay_paths or [None] * len(scenes)
+
+    output_dir = os.path.dirname(output_filepath)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # 세그먼트 캐시: 지문이 같은 장면은 이전에 렌더링한 세그먼트를 재사용하고 바뀐 장면만 렌더링
+    use_cache = scene_cache_enabled()
+    temp_dir = None
+    segment_paths, jobs = [], []
+    render_settings = _segment_render_settings(render_format)
+    for idx, (scene, overlay_path) in enumerate(zip(scenes, overlay_paths)):
+        if use_cache:
+            fingerprint = segment_fingerprint(scene, overlay_path, render_settings)
+            cached = lookup_segment(fingerprint)
+            if cached:
+                segment_paths.append(cached)
+                continue
+            path = segment_path(fingerprint)
+        else:
+            temp_dir = temp_dir or tempfile.mkdtemp(prefix="segments_", dir=output_dir or None)
+            path = os.path.join(temp_dir, f"scene_{idx:03d}.mkv")
+        segment_paths.append(path)
+        jobs.append((scene, overlay_path, path))
+
+    cpu_count = os.cpu_count() or 1
+    workers = max(1, min(len(jobs) or 1, max_workers or getattr(config, 'RENDER_MAX_WORKERS', 0) or cpu_count))
+    threads = max(1, cpu_count // workers)
+    print(f"  [세그먼트 렌더링] 장면 {len(scenes)}개 중 {len(jobs)}개 렌더링 (재사용 {len(scenes) - len(jobs)}개), "
+          f"동시 {workers}개 x 인코더 스레드 {threads}개")
+    try:
+        if jobs:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment") as executor:
+                results = list(executor.map(
+                    lambda job: render_segment(job[0], job[1], job[2], threads, ffmpeg_binary, render_format),
+                    jobs
+                ))
+            if not all(results):
+                return None
+        return concat_segments(segment_paths, output_filepath, audio_path, ffmpeg_binary)
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        if use_cache:
+            evict_segments()
+
+
+def _segment_render_settings(render_format: dict) -> dict:
+    """세그먼트 결과에 영향을 주는 렌더링 설정 (세그먼트 캐시 지문에 포함)"""
+    return {
+        "video": _video_encoder_args(render_format["profile"], render_format["fps"]),
+        "size": [render_format["width"], render_format["height"]],
+        "scaler": render_format["scaler"],
+        "text_y": config.TEXT_POSITION_Y_RATIO,
+        "ken_burns": [render_format["ken_burns"], KEN_BURNS_START_ZOOM, KEN_BURNS_END_ZOOM],
+        "transition": TRANSITION_SECONDS,
+    }
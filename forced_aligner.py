@@ -0,0 +1,180 @@
+# forced_aligner.py
+# 이 파일은 이미 알고 있는 나레이션 대본을 TTS 오디오에 정렬하여 단어별 타이밍을 계산하는 모듈입니다.
+# 전체 음성 인식(Whisper) 없이 에너지 기반 음성 구간 검출(VAD)만 사용하므로 CPU에서 수 밀리초 안에 끝납니다.
+
+import re
+from typing import Union
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02   # 에너지 측정 윈도우
+HOP_SECONDS = 0.01     # 프레임 간격
+MIN_PAUSE_SECONDS = 0.12   # 이보다 긴 무음만 문장/구 사이 쉼으로 인정
+MIN_VOICED_SECONDS = 0.05  # 이보다 짧은 유성 구간은 잡음으로 간주
+BOUNDARY_SNAP_SECONDS = 0.06  # 단어 경계를 주변 에너지 최저점으로 맞출 탐색 범위
+
+# 쉼이 예상되는 구두점 (단어 끝에 붙은 경우)
+_BREAK_PUNCTUATION = re.compile(r'[.,!?…~;:]["\')\]]*$')
+
+
+def load_audio(audio_path: str) -> np.ndarray:
+    """오디오 파일을 16kHz 모노 float32 배열로 디코딩합니다. (Whisper와 같은 ffmpeg 디코더 사용)"""
+    import whisper
+    return whisper.load_audio(audio_path, sr=SAMPLE_RATE)
+
+
+def _frame_energy_db(samples: np.ndarray) -> np.ndarray:
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    hop = int(HOP_SECONDS * SAMPLE_RATE)
+    if len(samples) < frame:
+        samples = np.pad(samples, (0, frame - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame)[::hop]
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1) + 1e-12)
+    return 20 * np.log10(rms)
+
+
+def _voiced_segments(energy_db: np.ndarray) -> list:
+    """에너지 임계값으로 유성 구간 [(start_sec, end_sec), ...]을 찾습니다."""
+    peak = np.percentile(energy_db, 95)
+    floor = np.percentile(energy_db, 10)
+    threshold = max(floor + 6.0, peak - 35.0)
+    voiced = energy_db > threshold
+
+    segments = []
+    start = None
+    for idx, is_voiced in enumerate(voiced):
+        if is_voiced and start is None:
+            start = idx
+        elif not is_voiced and start is not None:
+            segments.append([start, idx])
+            start = None
+    if start is not None:
+        segments.append([start, len(voiced)])
+
+    # 짧은 무음(자음 폐쇄 등)은 하나의 구간으로 병합
+    min_pause_frames = int(MIN_PAUSE_SECONDS / HOP_SECONDS)
+    merged = []
+    for seg in segments:
+        if merged and seg[0] - merged[-1][1] < min_pause_frames:
+            merged[-1][1] = seg[1]
+        else:
+            merged.append(seg)
+
+    min_voiced_frames = int(MIN_VOICED_SECONDS / HOP_SECONDS)
+    return [(s * HOP_SECONDS, e * HOP_SECONDS + (FRAME_SECONDS - HOP_SECONDS))
+            for s, e in merged if e - s >= min_voiced_frames]
+
+
+def _tokenize(text: str) -> tuple:
+    """대본을 단어 목록과 단어별 가중치(발음되는 글자 수), 쉼 위치로 나눕니다."""
+    words = text.replace('*', '').split()
+    weights = [max(1, len(re.sub(r'[^\w]', '', w))) for w in words]
+    breaks = [bool(_BREAK_PUNCTUATION.search(w)) for w in words]
+    return words, weights, breaks
+
+
+def _distribute(words: list, weights: list, segments: list) -> list:
+    """유성 구간들의 '발화 시간 축' 위에 단어를 글자 수 비례로 배치합니다. (쉼에는 단어를 배정하지 않음)"""
+    seg_durations = [end - start for start, end in segments]
+    total_voiced = sum(seg_durations)
+    total_weight = sum(weights)
+
+    def to_wall_time(voiced_pos: float, prefer_next: bool) -> float:
+        cursor = 0.0
+        for (start, end), dur in zip(segments, seg_durations):
+            if voiced_pos < cursor + dur or (not prefer_next and voiced_pos <= cursor + dur):
+                return start + (voiced_pos - cursor)
+            cursor += dur
+        return segments[-1][1]
+
+    timings = []
+    cumulative = 0
+    for word, weight in zip(words, weights):
+        start = to_wall_time(total_voiced * cumulative / total_weight, prefer_next=True)
+        cumulative += weight
+        end = to_wall_time(total_voiced * cumulative / total_weight, prefer_next=False)
+        timings.append({"word": word, "start": start, "end": max(end, start)})
+    return timings
+
+
+def _snap_boundaries(timings: list, energy_db: np.ndarray) -> None:
+    """같은 유성 구간 안에서 맞닿은 단어 경계를 주변 에너지 최저점으로 옮깁니다."""
+    window = int(BOUNDARY_SNAP_SECONDS / HOP_SECONDS)
+    for prev, nxt in zip(timings, timings[1:]):
+        if abs(nxt["start"] - prev["end"]) > HOP_SECONDS:
+            continue  # 쉼으로 분리된 경계는 이미 정확함
+        center = int(prev["end"] / HOP_SECONDS)
+        lo = max(center - window, int(prev["start"] / HOP_SECONDS) + 1)
+        hi = min(center + window, int(nxt["end"] / HOP_SECONDS) - 1, len(energy_db) - 1)
+        if lo >= hi:
+            continue
+        boundary = (lo + int(np.argmin(energy_db[lo:hi + 1]))) * HOP_SECONDS
+        prev["end"] = boundary
+        nxt["start"] = boundary
+
+
+def _confidence(segments: list, weights: list, breaks: list) -> float:
+    """
+    정렬 신뢰도(0~1)를 계산합니다.
+    - 감지된 쉼 개수가 대본의 구두점 개수와 일치하는지
+    - 발화 속도(초당 글자 수)가 TTS로서 자연스러운 범위인지
+    """
+    expected_pauses = sum(breaks[:-1])
+    detected_pauses = len(segments) - 1
+    pause_score = max(0.0, 1.0 - abs(detected_pauses - expected_pauses) / (expected_pauses + 1))
+
+    voiced = sum(end - start for start, end in segments)
+    rate = sum(weights) / voiced if voiced > 0 else 0.0
+    if 4.0 <= rate <= 11.0:
+        rate_score = 1.0
+    elif rate < 4.0:
+        rate_score = max(0.0, (rate - 2.0) / 2.0)
+    else:
+        rate_score = max(0.0, (16.0 - rate) / 5.0)
+    return pause_score * rate_score
+
+
+def align_text_to_audio(text: str, audio: Union[str, np.ndarray]) -> tuple:
+    """
+    알려진 대본 텍스트를 오디오에 정렬합니다.
+
+    Args:
+        text: 나레이션 대본
+        audio: 오디오 파일 경로 또는 16kHz 모노 float32 배열
+
+    Returns:
+        (word_timings, confidence): word_timings는 [{"word", "start", "end", "duration"}, ...],
+        confidence는 0~1 (낮으면 Whisper로 폴백 권장)
+    """
+    samples = load_audio(audio) if isinstance(audio, str) else audio
+    words, weights, breaks = _tokenize(text)
+    if not words or len(samples) == 0:
+        return [], 0.0
+
+    energy_db = _frame_energy_db(samples)
+    segments = _voiced_segments(energy_db)
+    if not segments:
+        return [], 0.0
+
+    # 쉼 개수가 구두점 개수와 맞으면 구(phrase)별로 유성 구간에 고정, 아니면 전체 발화 구간에 비례 배치
+    groups = [[]]
+    for idx, is_break in enumerate(breaks):
+        groups[-1].append(idx)
+        if is_break and idx < len(words) - 1:
+            groups.append([])
+
+    if len(groups) == len(segments):
+        timings = []
+        for group, segment in zip(groups, segments):
+            timings.extend(_distribute([words[i] for i in group], [weights[i] for i in group], [segment]))
+    else:
+        timings = _distribute(words, weights, segments)
+
+    _snap_boundaries(timings, energy_db)
+    for timing in timings:
+        timing["start"] = round(timing["start"], 3)
+        timing["end"] = round(timing["end"], 3)
+        timing["duration"] = round(timing["end"] - timing["start"], 3)
+
+    return timings, _confidence(segments, weights, breaks)
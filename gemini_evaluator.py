@@ -1,11 +1,10 @@
 # gemini_evaluator.py
 import os
-import time # Added for sleep in retry logic
-from google import genai
 import json
 import config # Import config module
-from groq import Groq # Import Groq
 from prompt_generator import PromptGenerator
+from llm_limiter import LLMUnavailableError
+from llm_providers import providers, get_api_key
 
 class GeminiEvaluator:
     """
@@ -15,7 +14,6 @@ class GeminiEvaluator:
     def __init__(self, model_name: str = "gemini-pro-latest"):
         # Gemini setup is done on demand in evaluate_reporter_suitability due to fallback logic
         self.gemini_model_name = model_name
-        self.groq_client = None # Initialize Groq client later if needed
 
     def _call_gemini_api(self, prompt: str) -> dict:
         """Internal helper to call Gemini API - currently disabled, always returns empty dict."""
@@ -27,61 +25,36 @@ class GeminiEvaluator:
     def _call_groq_api(self, prompt: str) -> dict:
         """Internal helper to call Groq API with retry mechanism."""
         print("DEBUG: _call_groq_api called.")
-        api_key = config.GROQ_API_KEY
-        if not api_key or "YOUR_GROQ_API_KEY" in api_key:
+        if not get_api_key("groq"):
             print("Warning: Groq API 키가 설정되지 않았습니다. Groq 호출 건너뛰기.")
             return {}
 
-        max_retries = 3
-        base_delay = 5 # seconds
-
-        for attempt in range(max_retries):
-            try:
-                if not self.groq_client:
-                    self.groq_client = Groq(api_key=api_key)
-                
-                print(f"DEBUG: Calling Groq chat.completions.create (Attempt {attempt + 1}/{max_retries})...")
-                completion = self.groq_client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant that evaluates reporter suitability. You MUST output JSON with 'score' (int) and 'reason' (string) fields. No other languages allowed."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=500,
-                    top_p=1,
-                    stream=False,
-                    response_format={"type": "json_object"}
-                )
-                print("DEBUG: Groq chat.completions.create responded.")
-                
-                response_text = completion.choices[0].message.content
-                evaluation_result = json.loads(response_text)
-
-                if "score" in evaluation_result and "reason" in evaluation_result:
-                    print(f"DEBUG: Groq API call successful on attempt {attempt + 1} and response parsed.")
-                    return evaluation_result
-                else:
-                    print(f"Warning: Groq response missing 'score' or 'reason' keys on attempt {attempt + 1}: {evaluation_result}")
-                    return {} # Consider this a failure for the current attempt
-
-            except Exception as e:
-                error_msg = str(e)
-                if "429" in error_msg or "Rate limit" in error_msg:
-                    if attempt < max_retries - 1:
-                        wait_time = base_delay * (2 ** attempt)
-                        print(f"  ⚠️ Groq Rate Limit Exceeded. {wait_time}초 후 재시도합니다... (시도 {attempt+1}/{max_retries})")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        print(f"  ❌ 모든 Groq 재시도 실패. (Rate Limit 초과)")
-                        return {}
-                else:
-                    print(f"ERROR: Groq API call failed with exception on attempt {attempt + 1}: {e}")
-                    return {} # Other errors are immediate failures
-
-        print("DEBUG: All Groq attempts failed. Returning empty result.")
-        return {} # Should not be reached if max_retries is > 0 and a path always returns
+        try:
+            print("DEBUG: Calling Groq chat.completions.create...")
+            response_text = providers.generate(
+                "groq", "llama-3.3-70b-versatile", prompt,
+                system="You are a helpful assistant that evaluates reporter suitability. You MUST output JSON with 'score' (int) and 'reason' (string) fields. No other languages allowed.",
+                temperature=0.7,
+                max_tokens=500,
+                json_mode=True
+            )
+            print("DEBUG: Groq chat.completions.create responded.")
+            
+            evaluation_result = json.loads(response_text)
+
+            if "score" in evaluation_result and "reason" in evaluation_result:
+                print("DEBUG: Groq API call successful and response parsed.")
+                return evaluation_result
+            else:
+                print(f"Warning: Groq response missing 'score' or 'reason' keys: {evaluation_result}")
+                return {}
+
+        except LLMUnavailableError as e:
+            print(f"  ❌ 모든 Groq 재시도 실패. (Rate Limit 초과: {e})")
+            return {}
+        except Exception as e:
+            print(f"ERROR: Groq API call failed with exception: {e}")
+            return {} # Other errors are immediate failures
 
 
     def evaluate_reporter_suitability(self, prompt: str) -> dict:
@@ -0,0 +1,249 @@
+# llm_limiter.py
+# 이 파일은 모든 LLM 호출(Gemini/Groq)이 함께 쓰는 프로세스 전역 호출 제한기입니다.
+# provider+모델마다 제한기 하나가 분당 요청 수(RPM)/토큰 수(TPM) 토큰 버킷으로 호출 간격을 맞추고,
+# 429 응답의 Retry-After를 모든 스레드가 공유하며, 쿼터가 바닥난 provider는 서킷 브레이커로 즉시 실패시킵니다.
+# 호출하는 쪽은 LLMUnavailableError를 받으면 다른 provider로 돌리거나 통과(fail open) 처리합니다.
+
+import re
+import time
+import random
+import threading
+from typing import Callable, Optional
+
+import config
+
+# 무료 티어 기준 기본값. settings.json의 LLM_RATE_LIMITS로 "provider" 또는 "provider:model" 단위로 덮어씁니다.
+DEFAULT_RATE_LIMITS = {
+    "gemini": {"rpm": 10, "tpm": 250000},
+    "gemini:gemini-2.0-flash-lite-preview-02-05": {"rpm": 30, "tpm": 1000000},
+    "groq": {"rpm": 30, "tpm": 12000},
+}
+
+RATE_LIMIT_MARKERS = ("429", "ResourceExhausted", "RESOURCE_EXHAUSTED", "Quota", "quota", "Rate limit", "rate_limit")
+
+
+class LLMUnavailableError(Exception):
+    """쿼터 소진(재시도 실패) 또는 서킷이 열려 있어 LLM을 호출하지 않았을 때 발생합니다."""
+    def __init__(self, provider: str, model: str, retry_after: float):
+        self.provider = provider
+        self.model = model
+        self.retry_after = retry_after
+        super().__init__(f"{provider}/{model} 쿼터 소진 ({retry_after:.0f}초 후 다시 시도 가능)")
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    if type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests"):
+        return True
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    message = str(error)
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    429 오류에서 서버가 알려준 대기 시간(초)을 찾습니다.
+    Groq: 응답 헤더 retry-after / "Please try again in 7.5s", Gemini: "retryDelay: '38s'" / "Please retry in 38.1s"
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is not None:
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+            if value is not None:
+                return max(0.0, float(value))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    match = re.search(r"(?:retry[ _-]?(?:after|delay|in)|try again in)[\"':\s]*(?:(\d+)m)?(\d+(?:\.\d+)?)\s*(ms)?",
+                      str(error), re.IGNORECASE)
+    if not match:
+        return None
+    seconds = float(match.group(2)) / (1000 if match.group(3) else 1)
+    return int(match.group(1) or 0) * 60 + seconds
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int = 0) -> int:
+    """TPM 버킷에서 미리 차감할 토큰 수 (한글이 섞인 프롬프트 기준 대략 3자당 1토큰 + 최대 출력)"""
+    return len(prompt) // 3 + max_output_tokens
+
+
+class TokenBucket:
+    """분당 한도를 초당 보충 속도로 바꾼 토큰 버킷. 잔량이 음수가 되도록 예약해 먼저 온 호출부터 순서대로 대기합니다."""
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """amount를 차감하고 그만큼 쓸 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다."""
+        amount = min(amount, self.capacity)
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + min(amount, self.capacity))
+
+
+class ProviderLimiter:
+    """
+    provider+모델 하나의 호출 제한기 (RPM/TPM 버킷 + 공유 Retry-After + 서킷 브레이커).
+    서킷: 429 재시도를 다 쓰거나 연속 오류가 LLM_CIRCUIT_FAILURE_THRESHOLD에 닿으면 열림 ->
+    대기 시간 동안 즉시 LLMUnavailableError -> 이후 시험 호출 하나만 통과시켜 성공하면 닫힘.
+    """
+    def __init__(self, provider: str, model: str, rpm: Optional[float], tpm: Optional[float]):
+        self.provider = provider
+        self.model = model
+        self.rpm = TokenBucket(rpm) if rpm else None
+        self.tpm = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0.0
+        self.open_until = 0.0
+        self.failures = 0
+        self.probing = False
+        self.stats = {"calls": 0, "waits": 0, "wait_seconds": 0.0, "rate_limited": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def label(self) -> str:
+        return f"{self.provider}/{self.model}"
+
+    def is_available(self) -> bool:
+        with self._lock:
+            return not self.open_until or (time.monotonic() >= self.open_until and not self.probing)
+
+    def _reject(self, retry_after: float) -> LLMUnavailableError:
+        self.stats["rejected"] += 1
+        return LLMUnavailableError(self.provider, self.model, retry_after)
+
+    def _acquire(self, tokens: int) -> None:
+        max_wait = getattr(config, 'LLM_MAX_WAIT_SECONDS', 90)
+        with self._lock:
+            now = time.monotonic()
+            if self.open_until:
+                if now < self.open_until or self.probing:
+                    raise self._reject(max(0.0, self.open_until - now))
+                self.probing = True  # 반열림: 시험 호출 하나만 통과
+            wait = max(0.0, self.blocked_until - now)
+            if self.rpm:
+                wait = max(wait, self.rpm.reserve(1, now))
+            if self.tpm:
+                wait = max(wait, self.tpm.reserve(tokens, now))
+            if wait > max_wait:
+                # 예산보다 오래 기다려야 하면 자리를 돌려주고 바로 실패 (호출 측이 다른 provider로 전환)
+                if self.rpm:
+                    self.rpm.refund(1)
+                if self.tpm:
+                    self.tpm.refund(tokens)
+                self.probing = False
+                raise self._reject(wait)
+            self.stats["calls"] += 1
+            if wait > 0:
+                self.stats["waits"] += 1
+                self.stats["wait_seconds"] += wait
+        if wait > 0:
+            # 같은 순간에 풀려난 스레드들이 한꺼번에 몰리지 않도록 약간의 지터
+            time.sleep(wait + random.uniform(0, min(1.0, wait * 0.1)))
+
+    def _record_success(self) -> None:
+        with self._lock:
+            if self.open_until:
+                print(f"  🔌 {self.label} 서킷 닫힘 (호출 재개)")
+            self.failures = 0
+            self.open_until = 0.0
+            self.probing = False
+
+    def _trip(self, retry_after: float) -> float:
+        """호출 측 잠금 안에서 불림. 서킷이 열려 있을 시간(초)을 반환합니다."""
+        cooldown = max(getattr(config, 'LLM_CIRCUIT_COOLDOWN_SECONDS', 60), retry_after)
+        self.open_until = time.monotonic() + cooldown
+        self.probing = False
+        print(f"  🔌 {self.label} 서킷 열림: {cooldown:.0f}초 동안 호출하지 않습니다.")
+        return cooldown
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= getattr(config, 'LLM_CIRCUIT_FAILURE_THRESHOLD', 5):
+                self._trip(0.0)
+
+    def _record_rate_limit(self, delay: float, exhausted: bool) -> float:
+        with self._lock:
+            self.stats["rate_limited"] += 1
+            if exhausted:
+                return self._trip(delay)
+            # 다른 스레드도 같은 시각까지 기다리도록 공유
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.probing = False
+            return delay
+
+    def call(self, fn: Callable, tokens: int = 0, max_retries: Optional[int] = None):
+        """
+        제한에 맞춰 fn()을 호출합니다. 429면 Retry-After(없으면 지수 백오프)만큼 기다려 재시도하고,
+        재시도를 다 쓰면 서킷을 열고 LLMUnavailableError를 냅니다. 그 밖의 오류는 그대로 전달됩니다.
+        """
+        if max_retries is None:
+            max_retries = getattr(config, 'LLM_MAX_RETRIES', 3)
+        base_delay = getattr(config, 'LLM_BACKOFF_BASE_SECONDS', 5)
+        max_wait = getattr(config, 'LLM_MAX_WAIT_SECONDS', 90)
+
+        for attempt in range(max_retries + 1):
+            self._acquire(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    self._record_failure()
+                    raise
+                retry_after = parse_retry_after(e)
+                delay = retry_after if retry_after is not None else base_delay * (2 ** attempt)
+                delay += random.uniform(0, min(1.0, delay * 0.1))
+                exhausted = attempt >= max_retries or delay > max_wait
+                delay = self._record_rate_limit(delay, exhausted)
+                if exhausted:
+                    raise LLMUnavailableError(self.provider, self.model, delay) from e
+                print(f"  ⚠️ {self.label} 쿼터 제한(429). {delay:.1f}초 후 재시도합니다... ({attempt+1}/{max_retries})")
+                continue
+            self._record_success()
+            return result
+
+
+_limiters = {}
+_registry_lock = threading.Lock()
+
+
+def _limits_for(provider: str, model: str) -> dict:
+    configured = getattr(config, 'LLM_RATE_LIMITS', None) or {}
+    for key in (f"{provider}:{model}", provider):
+        if key in configured:
+            return configured[key]
+        if key in DEFAULT_RATE_LIMITS:
+            return DEFAULT_RATE_LIMITS[key]
+    return {}
+
+
+def get_limiter(provider: str, model: str) -> ProviderLimiter:
+    with _registry_lock:
+        limiter = _limiters.get((provider, model))
+        if limiter is None:
+            limits = _limits_for(provider, model)
+            limiter = ProviderLimiter(provider, model, limits.get("rpm"), limits.get("tpm"))
+            _limiters[(provider, model)] = limiter
+        return limiter
+
+
+def call_llm(provider: str, model: str, fn: Callable, tokens: int = 0, max_retries: Optional[int] = None):
+    """provider/model의 공유 제한기를 거쳐 fn()을 호출합니다. (LLMUnavailableError: 쿼터 소진/서킷 열림)"""
+    return get_limiter(provider, model).call(fn, tokens, max_retries)
+
+
+def is_available(provider: str, model: str) -> bool:
+    """서킷이 닫혀 있어 지금 호출해 볼 수 있는지"""
+    return get_limiter(provider, model).is_available()
+
+
+def get_limiter_stats() -> dict:
+    """{'provider/model': {calls, waits, wait_seconds, rate_limited, rejected}}"""
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {limiter.label: dict(limiter.stats) for limiter in limiters}
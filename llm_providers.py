@@ -0,0 +1,241 @@
+# llm_providers.py
+# 이 파일은 Gemini/Groq 클라이언트를 프로세스당 한 번만 만들어 재사용하는 provider 레지스트리입니다.
+# 클라이언트는 내부 HTTP 연결 풀(httpx)을 유지하므로 대본 생성/미디어 검증/기자 평가가 연결을 함께 재사용합니다.
+# 모든 생성 요청은 generate()로 모여 공유 호출 제한기(llm_limiter)를 거치고,
+# 그 결과(성공/쿼터 초과/오류)가 provider 상태 캐시에 그대로 기록됩니다. (상태 확인용 생성 요청을 따로 보내지 않음)
+
+import os
+import json
+import time
+import threading
+from typing import Optional
+
+from google import genai
+from groq import Groq
+
+import config
+from llm_limiter import call_llm, estimate_tokens, LLMUnavailableError
+
+PROVIDER_NAMES = {"gemini": "Gemini", "groq": "Groq"}
+API_KEY_NAMES = {"gemini": "GEMINI_API_KEY", "groq": "GROQ_API_KEY"}
+
+
+def get_api_key(provider: str) -> Optional[str]:
+    """설정된 API 키 (없거나 예시 값이면 None)"""
+    api_key = getattr(config, API_KEY_NAMES[provider], None)
+    if not api_key or f"YOUR_{API_KEY_NAMES[provider]}" in api_key:
+        return None
+    return api_key
+
+
+class ProviderRegistry:
+    """
+    provider별 장수명 클라이언트와 상태 캐시.
+    클라이언트는 API 키가 바뀔 때만 다시 만들고, 상태는 실제 호출 결과로 갱신되어 LLM_HEALTH_TTL_SECONDS 동안 유효합니다.
+    """
+    def __init__(self, health_path: str, health_ttl_seconds: float):
+        self.health_path = health_path
+        self.health_ttl_seconds = health_ttl_seconds
+        self._clients = {}
+        self._health = None
+        self._lock = threading.Lock()
+
+    def _create_client(self, provider: str, api_key: str):
+        if provider == "groq":
+            # 429 재시도는 공유 제한기가 맡으므로 SDK 자체 재시도는 끔
+            return Groq(api_key=api_key, max_retries=0)
+        return genai.Client(api_key=api_key)
+
+    def client(self, provider: str):
+        """provider 클라이언트 (키가 없으면 None)"""
+        api_key = get_api_key(provider)
+        if api_key is None:
+            return None
+        with self._lock:
+            cached = self._clients.get(provider)
+            if cached and cached[0] == api_key:
+                return cached[1]
+            client = self._create_client(provider, api_key)
+            self._clients[provider] = (api_key, client)
+            return client
+
+    def generate(self, provider: str, model: str, prompt: str, system: Optional[str] = None,
+                 max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                 json_mode: bool = False, max_retries: Optional[int] = None) -> str:
+        """
+        provider 공통 생성 요청. 응답 텍스트를 반환합니다.
+        Raises: LLMUnavailableError (쿼터 소진/서킷 열림), RuntimeError (키 없음), 그 밖의 SDK 오류
+        """
+        client = self.client(provider)
+        if client is None:
+            raise RuntimeError(f"{PROVIDER_NAMES[provider]} API 키가 설정되지 않았습니다.")
+
+        def request():
+            if provider == "groq":
+                messages = [{"role": "system", "content": system}] if system else []
+                messages.append({"role": "user", "content": prompt})
+                options = {"model": model, "messages": messages, "stream": False}
+                if max_tokens is not None:
+                    options["max_tokens"] = max_tokens
+                if temperature is not None:
+                    options["temperature"] = temperature
+                if json_mode:
+                    options["response_format"] = {"type": "json_object"}
+                return client.chat.completions.create(**options).choices[0].message.content
+            options = {}
+            if system:
+                options["system_instruction"] = system
+            if max_tokens is not None:
+                options["max_output_tokens"] = max_tokens
+            if temperature is not None:
+                options["temperature"] = temperature
+            if json_mode:
+                options["response_mime_type"] = "application/json"
+            return client.models.generate_content(model=model, contents=prompt, config=options or None).text
+
+        name = PROVIDER_NAMES[provider]
+        tokens = estimate_tokens(prompt + (system or ""), max_tokens or 1024)
+        try:
+            text = call_llm(provider, model, request, tokens=tokens, max_retries=max_retries)
+        except LLMUnavailableError:
+            self.record(provider, False, f"⚠️ {name} Quota Exceeded")
+            raise
+        except Exception as e:
+            self.record(provider, False, f"{name} Error: {e}")
+            raise
+        self.record(provider, True, f"{name} Status: Healthy 🟢")
+        return text
+
+    def generate_stream(self, provider: str, model: str, prompt: str, system: Optional[str] = None,
+                        max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                        json_mode: bool = False, max_retries: Optional[int] = None):
+        """
+        generate()의 스트리밍 버전. 응답 텍스트 조각을 도착하는 대로 내보내는 제너레이터입니다.
+        429는 첫 조각을 받을 때 나타나므로 스트림 열기 + 첫 조각까지만 공유 제한기 안에서 재시도합니다.
+        """
+        client = self.client(provider)
+        if client is None:
+            raise RuntimeError(f"{PROVIDER_NAMES[provider]} API 키가 설정되지 않았습니다.")
+
+        def chunks():
+            if provider == "groq":
+                messages = [{"role": "system", "content": system}] if system else []
+                messages.append({"role": "user", "content": prompt})
+                options = {"model": model, "messages": messages, "stream": True}
+                if max_tokens is not None:
+                    options["max_tokens"] = max_tokens
+                if temperature is not None:
+                    options["temperature"] = temperature
+                if json_mode:
+                    options["response_format"] = {"type": "json_object"}
+                for chunk in client.chat.completions.create(**options):
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                return
+            options = {}
+            if system:
+                options["system_instruction"] = system
+            if max_tokens is not None:
+                options["max_output_tokens"] = max_tokens
+            if temperature is not None:
+                options["temperature"] = temperature
+            if json_mode:
+                options["response_mime_type"] = "application/json"
+            for chunk in client.models.generate_content_stream(model=model, contents=prompt, config=options or None):
+                if chunk.text:
+                    yield chunk.text
+
+        def open_stream():
+            stream = chunks()
+            return stream, next(stream, None)
+
+        name = PROVIDER_NAMES[provider]
+        tokens = estimate_tokens(prompt + (system or ""), max_tokens or 1024)
+        try:
+            stream, first = call_llm(provider, model, open_stream, tokens=tokens, max_retries=max_retries)
+            if first is not None:
+                yield first
+            yield from stream
+        except LLMUnavailableError:
+            self.record(provider, False, f"⚠️ {name} Quota Exceeded")
+            raise
+        except Exception as e:
+            self.record(provider, False, f"{name} Error: {e}")
+            raise
+        self.record(provider, True, f"{name} Status: Healthy 🟢")
+
+    # --- 상태 캐시 ---
+    def _load_health(self) -> dict:
+        """호출 측 잠금 안에서 불림"""
+        if self._health is None:
+            try:
+                with open(self.health_path, encoding='utf-8') as f:
+                    self._health = json.load(f)
+            except (OSError, ValueError):
+                self._health = {}
+        return self._health
+
+    def record(self, provider: str, healthy: bool, message: str) -> None:
+        """실제 호출 결과로 provider 상태를 갱신합니다. 상태가 바뀌었거나 오래됐을 때만 디스크에 씁니다."""
+        now = time.time()
+        with self._lock:
+            health = self._load_health()
+            previous = health.get(provider)
+            health[provider] = {"healthy": healthy, "message": message, "checked_at": now}
+            if previous and previous["healthy"] == healthy and previous["message"] == message \
+                    and now - previous["checked_at"] < 60:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.health_path), exist_ok=True)
+                temp_path = f"{self.health_path}.{threading.get_ident()}.tmp"
+                with open(temp_path, "w", encoding='utf-8') as f:
+                    json.dump(health, f, ensure_ascii=False)
+                os.replace(temp_path, self.health_path)
+            except OSError as e:
+                print(f"  ⚠️ provider 상태 저장 실패: {e}")
+
+    def cached_health(self, provider: str) -> Optional[tuple]:
+        """TTL 안의 상태 (healthy, message), 없으면 None"""
+        with self._lock:
+            entry = self._load_health().get(provider)
+        if entry and time.time() - entry["checked_at"] < self.health_ttl_seconds:
+            return entry["healthy"], entry["message"]
+        return None
+
+    def check_health(self, provider: str) -> tuple:
+        """
+        provider 상태 (healthy, message). 최근 실제 호출 결과가 있으면 그대로 쓰고,
+        없을 때만 모델 목록 조회(생성 쿼터를 쓰지 않음)로 키와 연결을 확인합니다.
+        """
+        name = PROVIDER_NAMES[provider]
+        client = self.client(provider)
+        if client is None:
+            return False, f"{name} Key Missing"
+        cached = self.cached_health(provider)
+        if cached:
+            return cached
+        try:
+            if provider == "groq":
+                client.models.list()
+            else:
+                next(iter(client.models.list()), None)
+        except Exception as e:
+            message = f"⚠️ {name} Quota Exceeded" if "429" in str(e) or "Quota" in str(e) else f"{name} Error: {e}"
+            self.record(provider, False, message)
+            return False, message
+        self.record(provider, True, f"{name} Status: Healthy 🟢")
+        return True, f"{name} Status: Healthy 🟢"
+
+
+providers = ProviderRegistry(
+    getattr(config, 'PROVIDER_HEALTH_PATH', os.path.join("assets", "cache", "provider_health.json")),
+    getattr(config, 'LLM_HEALTH_TTL_SECONDS', 600)
+)
+
+
+def generate(provider: str, model: str, prompt: str, **options) -> str:
+    return providers.generate(provider, model, prompt, **options)
+
+
+def check_health(provider: str) -> tuple:
+    return providers.check_health(provider)
@@ -6,16 +6,19 @@ import json
 import datetime
 import config
 import math
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from ai_script_generator import generate_script_with_ai
 from script_generator import generate_reel_script # Fallback
-from media_downloader import search_and_download_video
-from tts_generator import create_narration
+from media_downloader import search_and_download_video, download_pexels_video
+from media_normalizer import schedule_normalization, cancel_normalization
+from scene_cache import media_fingerprint, load_media_selection, store_media_selection
+from tts_generator import create_narration, create_narrations, align_narrations, get_narration_duration
 from video_assembler import assemble_reel
-from moviepy.audio.io.AudioFileClip import AudioFileClip
-from video_assembler import assemble_reel
-from moviepy.audio.io.AudioFileClip import AudioFileClip
+from audio_probe import get_audio_duration
 from bgm_downloader import download_bgm
-from ai_validator import validate_media_relevance
+from ai_validator import validate_media_batch
 
 # API 키 확인
 if not config.PEXELS_API_KEY:
@@ -26,9 +29,60 @@ os.makedirs(config.DOWNLOADED_MEDIA_DIR, exist_ok=True)
 os.makedirs(config.NARRATION_AUDIO_DIR, exist_ok=True)
 os.makedirs(config.FINAL_REELS_DIR, exist_ok=True)
 
-def generate_script_pipeline(app_name: str, theme: str, target_duration: int, provider: str = "gemini", progress_callback=None) -> dict:
+# 장면 병렬 처리 시 외부 자원별 동시 사용 수 제한 (프로세스 전역)
+_pexels_slots = threading.BoundedSemaphore(max(1, getattr(config, 'PEXELS_MAX_CONCURRENCY', 3)))
+
+# 대본 스트리밍 중 먼저 완성된 장면의 나레이션/영상을 미리 받아두는 작업자
+# (결과는 나레이션 캐시와 Pexels 검색/다운로드 캐시에 남아 영상 제작 단계에서 그대로 재사용됨)
+_prefetch_executor = None
+_prefetch_lock = threading.Lock()
+
+def prefetch_scene(scene: dict, draft: bool = False):
+    """장면 하나의 나레이션 합성(나레이션 캐시 사용 시)과 첫 키워드 영상 검색/다운로드를 백그라운드에서 시작합니다."""
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=max(1, getattr(config, 'SCENE_MAX_WORKERS', 4)),
+                                                    thread_name_prefix="prefetch")
+    return _prefetch_executor.submit(_prefetch_scene, dict(scene), draft)
+
+def _prefetch_scene(scene: dict, draft: bool) -> None:
+    try:
+        # 영상 제작 단계와 같은 방식으로 장면 길이를 정해야 같은 영상이 골라져 다운로드 캐시가 적중함
+        scene_duration = scene.get('duration', 5)
+        narration_text = scene.get('narration')
+        # 미리 합성한 나레이션은 나레이션 캐시를 통해서만 재사용되므로, 캐시가 꺼져 있으면 TTS를 두 번 하지 않도록
+        # 합성을 건너뛰고 대본의 장면 길이로 영상만 미리 받음
+        if narration_text and getattr(config, 'NARRATION_CACHE_ENABLED', True):
+            text_hash = hashlib.sha256(narration_text.encode('utf-8')).hexdigest()[:16]
+            prefetch_path = os.path.join(config.NARRATION_AUDIO_DIR, f"prefetch_{text_hash}_{threading.get_ident()}.mp3")
+            if create_narration(narration_text, prefetch_path, extract_timing=False):
+                audio_duration = get_narration_duration(prefetch_path) or get_audio_duration(prefetch_path)
+                if audio_duration:
+                    scene_duration = math.ceil(audio_duration + 0.5)
+                for path in (prefetch_path, prefetch_path.replace(".mp3", ".json")):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+        visual_keywords = scene.get('visual_keywords') or []
+        if config.PEXELS_API_KEY:
+            with _pexels_slots:
+                search_and_download_video(
+                    keyword=visual_keywords[0] if visual_keywords else "general",
+                    output_dir=config.DOWNLOADED_MEDIA_DIR,
+                    duration=scene_duration,
+                    draft=draft
+                )
+    except Exception as e:
+        print(f"  ⚠️ 장면 미리 준비 실패 (영상 제작 단계에서 다시 시도): {e}")
+
+def generate_script_pipeline(app_name: str, theme: str, target_duration: int, provider: str = "gemini", progress_callback=None,
+                             script_text_callback=None, draft: bool = False) -> dict:
     """
     1단계: 스크립트 생성 파이프라인
+    AI 응답은 스트리밍으로 받아 장면이 완성될 때마다 나레이션/영상을 미리 준비하고(SCRIPT_STREAM_PREFETCH),
+    script_text_callback(지금까지 받은 대본 텍스트)으로 생성 중인 대본을 실시간으로 전달합니다.
+    draft=True면 미리 받는 영상도 초안 규격 렌디션으로 받습니다.
     """
     # Helper to safely call callback
     def update_progress(p, msg):
@@ -36,11 +90,17 @@ def generate_script_pipeline(app_name: str, theme: str, target_duration: int, pr
             progress_callback(p, msg)
         print(f"[{p}%] {msg}")
 
+    def on_scene(index, scene):
+        update_progress(min(14, 6 + index), f"장면 {index+1} 대본 수신: '{scene['visual_keywords'][0]}'")
+        if getattr(config, 'SCRIPT_STREAM_PREFETCH', True):
+            prefetch_scene(scene, draft)
+
     update_progress(0, f"스크립트 생성 시작 (주제: {theme}, AI 엔진: {provider})")
     
     # 1. 스크립트 생성 (AI 우선 시도)
     update_progress(5, "AI 작가가 릴스 스크립트를 생성 중입니다...")
-    script_data = generate_script_with_ai(topic=theme, duration=target_duration, provider=provider)
+    script_data = generate_script_with_ai(topic=theme, duration=target_duration, provider=provider,
+                                          on_scene=on_scene, on_text=script_text_callback)
     
     if script_data is None:
         update_progress(10, "AI 생성 실패 또는 API 키 미설정. 기본 스크립트를 사용합니다.")
@@ -62,9 +122,12 @@ def generate_script_pipeline(app_name: str, theme: str, target_duration: int, pr
     
     return script_data
 
-def generate_video_pipeline(script_data: dict, target_duration: int = None, mood_override: str = None, progress_callback=None) -> str:
+def generate_video_pipeline(script_data: dict, target_duration: int = None, mood_override: str = None, progress_callback=None,
+                            draft: bool = False) -> str:
     """
     2단계: 확정된 스크립트 데이터를 받아 영상 제작
+    draft=True면 미리보기용 저해상도 초안(DRAFT_WIDTH x DRAFT_HEIGHT, DRAFT_FPS)을 빠르게 만듭니다.
+    나레이션/미디어 선택은 캐시되므로 같은 스크립트로 본 렌더링을 하면 TTS와 검색/AI 검증을 다시 하지 않습니다.
     """
     if not script_data:
         return None
@@ -73,12 +136,18 @@ def generate_video_pipeline(script_data: dict, target_duration: int = None, mood
     provider = script_data.get('metadata', {}).get('provider', 'gemini')
 
     # Helper to safely call callback
+    # (장면이 병렬로 처리되므로 여러 스레드에서 호출됨 - 진척률이 뒤로 가지 않도록 유지)
+    progress_lock = threading.Lock()
+    last_percent = [0]
     def update_progress(p, msg):
-        if progress_callback:
-            progress_callback(p, msg)
-        print(f"[{p}%] {msg}")
-
-    update_progress(20, f"영상 제작 프로세스 시작... (AI Engine: {provider})")
+        with progress_lock:
+            p = max(p, last_percent[0])
+            last_percent[0] = p
+            if progress_callback:
+                progress_callback(p, msg)
+            print(f"[{p}%] {msg}")
+
+    update_progress(20, f"{'초안 ' if draft else ''}영상 제작 프로세스 시작... (AI Engine: {provider})")
     
     # 작업 디렉토리 생성 (이미 위에서 처리되었지만, 함수 내에서 다시 확인)
     for path in [config.DOWNLOADED_MEDIA_DIR, config.NARRATION_AUDIO_DIR, config.FINAL_REELS_DIR]:
@@ -86,47 +155,27 @@ def generate_video_pipeline(script_data: dict, target_duration: int = None, mood
 
     theme = script_data.get('metadata', {}).get('theme', 'Unknown')
 
-    # 1.5. 배경음악 준비 (옵션)
+    # 1.5. 배경음악 준비 (옵션) - 다운로드만 먼저 하고 AI 검증은 장면 영상 후보들과 함께 일괄 요청
     bgm_path = None
+    bgm_metadata = None
+    bgm_pending = False # 검증 대기 중인 BGM 후보가 있는지
     music_mood = script_data.get('metadata', {}).get('music_mood', 'Cheerful')
     update_progress(25, f"배경음악 준비 중... ({music_mood})")
 
-    try:
-        # BGM 다운로드 및 검증 (최대 2회 시도)
-        current_mood_query = music_mood
-        for attempt in range(2):
-            bgm_path, bgm_metadata = download_bgm(mood=current_mood_query)
-            
-            if not bgm_path: # 다운로드 실패
-                break
-                
-            # 검증
-            if bgm_metadata.get("source") == "existing":
-                print("  ℹ️ 기존 BGM 파일 사용 (검증 생략)")
-                update_progress(27, "기존 BGM 파일 사용 (AI 검증 생략)")
-                break
-
-            # AI 검증
-            update_progress(28 + attempt, f"AI 검증관이 BGM을 확인 중입니다... (시도 {attempt+1})")
-            is_valid, suggestion = validate_media_relevance(
-                script_context=f"Theme: {theme}. Mood: {music_mood}",
-                media_metadata=bgm_metadata,
-                media_type="audio",
-                provider=provider # Provider 전달
-            )
-            
-            if is_valid:
-                update_progress(29, "✅ BGM 승인 완료!")
-                break
-            else:
-                update_progress(28 + attempt, f"❌ BGM 반려됨. AI 재검색 제안: {suggestion}")
-                current_mood_query = suggestion 
-                if os.path.exists(bgm_path):
-                    os.remove(bgm_path)
-                    bgm_path = None
-
-    except Exception as e:
-        print(f"BGM 다운로드 실패: {e}")
+    def fetch_bgm(mood_query):
+        nonlocal bgm_path, bgm_metadata, bgm_pending
+        try:
+            bgm_path, bgm_metadata = download_bgm(mood=mood_query)
+        except Exception as e:
+            print(f"BGM 다운로드 실패: {e}")
+            bgm_path, bgm_metadata = None, None
+        bgm_pending = bool(bgm_path)
+        if bgm_path and bgm_metadata.get("source") == "existing":
+            print("  ℹ️ 기존 BGM 파일 사용 (검증 생략)")
+            update_progress(27, "기존 BGM 파일 사용 (AI 검증 생략)")
+            bgm_pending = False
+
+    fetch_bgm(music_mood)
 
     # 2. 각 장면에 대한 미디어 및 나레이션 생성
     processed_scenes = []
@@ -138,9 +187,42 @@ def generate_video_pipeline(script_data: dict, target_duration: int = None, mood
     # 생성 프로세스를 구분하기 위한 고유 ID
     process_id = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
 
+    # "reel" 모드에서는 장면별 Whisper 전사 대신 모든 나레이션을 모아 1회만 정렬
+    batch_align = getattr(config, 'WHISPER_ALIGN_MODE', "reel") == "reel"
+
+    # 2-1. 모든 장면의 나레이션을 먼저 동시 생성 (장면 길이 측정을 위해 미디어 검색보다 먼저)
+    narration_jobs = []
     for i, scene in enumerate(scenes):
+        if scene.get('narration'):
+            narration_filename = f"narration_{process_id}_scene_{i+1}.mp3"
+            narration_jobs.append((i, scene['narration'], os.path.join(config.NARRATION_AUDIO_DIR, narration_filename)))
+
+    narration_results = {}
+    if narration_jobs:
+        update_progress(30, f"나레이션 {len(narration_jobs)}개 동시 생성 중...")
+        created_paths = create_narrations([(text, path) for _, text, path in narration_jobs], extract_timing=not batch_align)
+        narration_results = {i: path for (i, _, _), path in zip(narration_jobs, created_paths)}
+
+    # "reel" 모드 타이밍 정렬은 나레이션만 있으면 되므로 미디어 검색과 겹쳐서 백그라운드 실행
+    align_thread = None
+    if batch_align:
+        narrated = [(narration_results[i], text) for i, text, _ in narration_jobs if narration_results.get(i)]
+        if narrated:
+            update_progress(30, f"나레이션 {len(narrated)}개 타이밍 일괄 추출 시작 (백그라운드)...")
+            align_thread = threading.Thread(
+                target=align_narrations,
+                args=([path for path, _ in narrated],),
+                kwargs={"texts": [text for _, text in narrated]},
+                name="narration-align",
+                daemon=True
+            )
+            align_thread.start()
+
+    completed = [0] # 완료된 장면 수 (progress_lock으로 보호)
+
+    def prepare_scene(i, scene):
+        """장면 길이 측정과 미디어 선택 캐시 확인. 이후 검색/검증 라운드에서 쓰는 장면 상태를 반환합니다."""
         scene_num = scene.get('scene_number', i+1)
-        narr_text = scene.get('narration', '')
         visual_keywords = scene.get('visual_keywords', [])
         keyword = visual_keywords[0] if visual_keywords else "general"
         scene_duration = scene.get('duration', 5)
@@ -151,23 +233,19 @@ def generate_video_pipeline(script_data: dict, target_duration: int = None, mood
 
         print(f"  장면 {scene_num} 처리 중...")
         
-        # 2-1. 나레이션 먼저 생성 (길이 측정을 위해)
+        # 미리 생성된 나레이션으로 장면 길이 측정
         narration_text = scene.get('narration')
-        generated_narration_path = None
-        # scene_duration = scene['duration'] # 기본값 (혹은 최소값) # This line is now handled by the new scene_duration variable
+        generated_narration_path = narration_results.get(i)
 
         if narration_text:
-            update_progress(current_percent + 1, f"장면 {scene_num} 나레이션 생성 중...")
-            narration_filename = f"narration_{process_id}_scene_{i+1}.mp3"
-            narration_filepath = os.path.join(config.NARRATION_AUDIO_DIR, narration_filename)
-            generated_narration_path = create_narration(narration_text, narration_filepath)
-            
             if generated_narration_path:
                 try:
-                    # 오디오 길이 측정
-                    audio_clip = AudioFileClip(generated_narration_path)
-                    audio_duration = audio_clip.duration
-                    audio_clip.close()
+                    # 오디오 길이 측정 (캐시에 기록된 길이 우선, 없으면 MP3 헤더로 측정 - 디코딩 없음)
+                    audio_duration = get_narration_duration(generated_narration_path)
+                    if audio_duration is None:
+                        audio_duration = get_audio_duration(generated_narration_path)
+                    if audio_duration is None:
+                        raise ValueError("오디오 길이를 측정할 수 없습니다.")
                     
                     # 씬 길이를 오디오 길이 + 여유(0.5초)로 업데이트
                     scene_duration = math.ceil(audio_duration + 0.5)
@@ -179,69 +257,186 @@ def generate_video_pipeline(script_data: dict, target_duration: int = None, mood
         else:
             update_progress(current_percent + 1, f"장면 {scene_num}에 나레이션 텍스트가 없습니다.")
 
-        # 2-2. 미디어 다운로드 (AI 검증 및 재시도 포함)
-        downloaded_media_path = None
-        current_keyword = keyword
-        
-        # 최후의 수단으로 사용할 파일 경로 (항상 유지)
-        last_downloaded_path = None
-        
-        for attempt in range(3): # 최대 3회 시도
-            update_progress(current_percent + 3 + attempt, f"장면 {scene_num} 미디어 검색/다운로드 중... (키워드: '{current_keyword}', 시도 {attempt+1})")
+        # 키워드/나레이션/장면 설명/길이가 이전 실행과 같으면 검색과 AI 검증 없이 이전에 선택된 영상 재사용
+        media_fp = media_fingerprint(scene, keyword, scene_duration, provider)
+        cached_selection = load_media_selection(media_fp, draft)
+        if cached_selection and not cached_selection['media_path']:
+            # 다른 모드(초안/본 렌더링)에서 승인된 영상: 검색/검증 없이 이번 규격의 렌디션만 받음
+            video_id = cached_selection['metadata'].get('video_id')
+            update_progress(current_percent + 3, f"장면 {scene_num} 승인된 영상(#{video_id})을 {'초안' if draft else '본 렌더링'} 해상도로 받는 중...")
+            with _pexels_slots:
+                cached_selection['media_path'] = download_pexels_video(video_id, config.DOWNLOADED_MEDIA_DIR, draft)
+            if cached_selection['media_path']:
+                store_media_selection(media_fp, cached_selection['media_path'], cached_selection['metadata'], draft)
+            else:
+                cached_selection = None
+        if cached_selection:
+            update_progress(current_percent + 5, f"장면 {scene_num} ♻️ 변경 없음 - 이전에 선택된 미디어 재사용")
+
+        return {
+            "index": i,
+            "scene": scene,
+            "scene_num": scene_num,
+            "percent": current_percent,
+            "duration": scene_duration,
+            "narration_path": generated_narration_path,
+            "media_fp": media_fp,
+            "cached": bool(cached_selection),
+            "keyword": keyword, # 현재 검색 키워드 (반려되면 AI 제안으로 교체)
+            "tried_keywords": set(), # 이 장면에서 이미 검색한 키워드 (소문자, 로컬 반려 시 다시 제안하지 않음)
+            "media_path": cached_selection['media_path'] if cached_selection else None,
+            "candidate": None, # 이번 라운드에 검증할 (경로, 메타데이터)
+            "last_path": None, # 최후의 수단으로 사용할 파일 경로 (항상 유지)
+            "last_metadata": None,
+            "done": bool(cached_selection),
+            "approved": False, # AI 검증(또는 로컬 사전 판정)으로 실제 승인되었는지
+        }
+
+    def fetch_candidate(state, attempt):
+        """장면의 다음 영상 후보를 검색/다운로드합니다."""
+        scene_num, percent, keyword = state['scene_num'], state['percent'], state['keyword']
+        state['tried_keywords'].add(keyword.lower())
+        update_progress(percent + 3 + attempt, f"장면 {scene_num} 미디어 검색/다운로드 중... (키워드: '{keyword}', 시도 {attempt+1})")
+        with _pexels_slots:
             temp_path, media_metadata = search_and_download_video(
-                keyword=current_keyword,
+                keyword=keyword,
                 output_dir=config.DOWNLOADED_MEDIA_DIR,
-                duration=scene_duration
-            )
-            
-            if not temp_path:
-                update_progress(current_percent + 3 + attempt, f"장면 {scene_num} '{current_keyword}' 검색 결과 없음.")
-                # 검색 실패해도 이전에 다운로드된 파일이 있으면 그것 사용
-                if last_downloaded_path:
-                    update_progress(current_percent + 3 + attempt, f"장면 {scene_num} 이전 시도에서 다운로드된 파일을 사용합니다.")
-                    downloaded_media_path = last_downloaded_path
-                continue  # break 대신 continue로 다음 시도
-
-            # 일단 다운로드 성공하면 마지막 후보로 등록 (삭제 안함)
-            last_downloaded_path = temp_path
-            
-            # AI 검증
-            update_progress(current_percent + 4 + attempt, f"장면 {scene_num} AI 검증관이 영상을 확인 중입니다... (키워드: {current_keyword}, 시도 {attempt+1})")
-            context = f"Scene Script: {scene.get('narration')}. Visual Desc: {scene.get('visual_description')}"
-            
-            is_valid, suggestion = validate_media_relevance(
-                script_context=context,
-                media_metadata=media_metadata,
-                media_type="video",
-                provider=provider # Provider 전달
+                duration=state['duration'],
+                draft=draft
             )
-            
-            if is_valid:
-                update_progress(current_percent + 5 + attempt, f"장면 {scene_num} ✅ 영상 승인 완료!")
-                downloaded_media_path = temp_path
-                break
-            else:
-                update_progress(current_percent + 5 + attempt, f"장면 {scene_num} ❌ 영상 반려됨. AI 재검색 제안: {suggestion}")
-                current_keyword = suggestion 
-                # 파일 삭제하지 않음! 마지막 후보로 유지
-                
-                # 마지막 시도였다면, 그냥 이 파일 쓰자 (ColorClip보다는 나으니까)
-                if attempt == 2:
-                    update_progress(current_percent + 5 + attempt, f"장면 {scene_num} 마지막 시도이므로 반려된 파일이라도 사용합니다.")
-                    downloaded_media_path = temp_path
-
-        # 루프가 끝났는데도 None이면 last_downloaded_path 사용 (검은화면 방지)
-        if downloaded_media_path is None and last_downloaded_path:
-            update_progress(current_percent + 8, f"장면 {scene_num} 📎 마지막으로 다운로드된 파일을 사용합니다: {last_downloaded_path}")
-            downloaded_media_path = last_downloaded_path
+        state['candidate'] = None
+        if not temp_path:
+            update_progress(percent + 3 + attempt, f"장면 {scene_num} '{keyword}' 검색 결과 없음.")
+            # 검색 실패해도 이전에 다운로드된 파일이 있으면 마지막에 그것 사용
+            if state['last_path']:
+                update_progress(percent + 3 + attempt, f"장면 {scene_num} 이전 시도에서 다운로드된 파일을 사용합니다.")
+            return
+
+        # 일단 다운로드 성공하면 마지막 후보로 등록 (삭제 안함)
+        state['last_path'], state['last_metadata'] = temp_path, media_metadata
+        state['candidate'] = (temp_path, media_metadata)
+        # 릴스 규격 변환을 AI 검증과 겹쳐 백그라운드에서 시작 (초안은 작은 렌디션을 바로 쓰므로 생략)
+        if not draft:
+            schedule_normalization(temp_path, state['duration'])
+
+    def apply_verdict(state, attempt, is_valid, suggestion):
+        scene_num, percent = state['scene_num'], state['percent']
+        temp_path = state['candidate'][0]
+        if is_valid:
+            update_progress(percent + 5 + attempt, f"장면 {scene_num} ✅ 영상 승인 완료!")
+            state['media_path'] = temp_path
+            state['done'] = True
+            # 쿼터 초과/오류로 통과 처리된(fail open) 경우는 실제 승인이 아니므로 선택 캐시에 남기지 않음
+            state['approved'] = suggestion == "Suitable"
+            return
+
+        update_progress(percent + 5 + attempt, f"장면 {scene_num} ❌ 영상 반려됨. AI 재검색 제안: {suggestion}")
+        state['keyword'] = suggestion
+        # 파일 삭제하지 않음! 마지막 후보로 유지
+        if attempt < 2 and not draft:
+            cancel_normalization(temp_path)
+        
+        # 마지막 시도였다면, 그냥 이 파일 쓰자 (ColorClip보다는 나으니까)
+        if attempt == 2:
+            update_progress(percent + 5 + attempt, f"장면 {scene_num} 마지막 시도이므로 반려된 파일이라도 사용합니다.")
+            state['media_path'] = temp_path
+            state['done'] = True
+
+    def finish_scene(state):
+        scene_num = state['scene_num']
+        downloaded_media_path = state['media_path']
+        # 시도가 끝났는데도 None이면 last_path 사용 (검은화면 방지)
+        if downloaded_media_path is None and state['last_path']:
+            update_progress(state['percent'] + 8, f"장면 {scene_num} 📎 마지막으로 다운로드된 파일을 사용합니다: {state['last_path']}")
+            downloaded_media_path = state['last_path']
+        if downloaded_media_path:
+            if not draft:
+                schedule_normalization(downloaded_media_path, state['duration'])  # 취소됐던 후보가 최종 선택된 경우 다시 예약 (진행 중이면 그대로)
+            # 검증에서 실제로 승인된 영상만 저장 (반려됐지만 최후의 수단으로 쓴 영상은 다음 실행에서 다시 검색)
+            if not state['cached'] and state['approved']:
+                store_media_selection(state['media_fp'], downloaded_media_path, state['last_metadata'], draft)
 
         processed_scene = {
-            **scene, 
-            'duration': scene_duration, # 업데이트된 duration 저장
+            **state['scene'], 
+            'duration': state['duration'], # 업데이트된 duration 저장
             'media_path': downloaded_media_path,
-            'audio_path': generated_narration_path
+            'audio_path': state['narration_path']
         }
-        processed_scenes.append(processed_scene)
+        with progress_lock:
+            completed[0] += 1
+            done = completed[0]
+        update_progress(30 + int((done / total_scenes) * 50), f"장면 {scene_num} 준비 완료 ({done}/{total_scenes})")
+        return processed_scene
+
+    # 장면별 미디어 검색/다운로드는 병렬로, AI 검증은 라운드마다 모든 장면 후보와 BGM을 한 번의 LLM 호출로 처리
+    # (최대 3회 시도: 반려된 장면은 AI가 제안한 키워드로 다음 라운드에서 다시 검색)
+    if scenes:
+        max_workers = max(1, min(total_scenes, getattr(config, 'SCENE_MAX_WORKERS', 4)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scene") as executor:
+            states = list(executor.map(prepare_scene, range(total_scenes), scenes))
+
+            for attempt in range(3):
+                pending = [state for state in states if not state['done']]
+                bgm_round = bgm_pending and attempt < 2 # BGM은 최대 2회 시도
+                if not pending and not bgm_round:
+                    break
+                list(executor.map(lambda state: fetch_candidate(state, attempt), pending))
+
+                candidates = [state for state in pending if state['candidate']]
+                items = [
+                    {
+                        "script_context": f"Scene Script: {state['scene'].get('narration')}. Visual Desc: {state['scene'].get('visual_description')}",
+                        "media_metadata": state['candidate'][1],
+                        "media_type": "video",
+                        "keywords": state['scene'].get('visual_keywords', []),
+                        "description": state['scene'].get('visual_description', ''),
+                        "tried_keywords": state['tried_keywords'],
+                    }
+                    for state in candidates
+                ]
+                if bgm_round:
+                    items.append({
+                        "script_context": f"Theme: {theme}. Mood: {music_mood}",
+                        "media_metadata": bgm_metadata,
+                        "media_type": "audio",
+                        "keywords": [music_mood],
+                    })
+                if not items:
+                    continue
+
+                update_progress(30 + attempt * 15, f"AI 검증관이 미디어 {len(items)}개를 한 번에 확인 중입니다... (시도 {attempt+1})")
+                verdicts = validate_media_batch(items, provider=provider)
+                for state, (is_valid, suggestion) in zip(candidates, verdicts):
+                    apply_verdict(state, attempt, is_valid, suggestion)
+
+                if bgm_round:
+                    is_valid, suggestion = verdicts[-1]
+                    if is_valid:
+                        update_progress(29, "✅ BGM 승인 완료!")
+                        bgm_pending = False
+                    else:
+                        update_progress(28 + attempt, f"❌ BGM 반려됨. AI 재검색 제안: {suggestion}")
+                        if os.path.exists(bgm_path):
+                            os.remove(bgm_path)
+                        bgm_path = None
+                        bgm_pending = False
+                        if attempt == 0:
+                            fetch_bgm(suggestion)
+
+            processed_scenes = [finish_scene(state) for state in states]
+    elif bgm_pending:
+        is_valid, suggestion = validate_media_batch([{
+            "script_context": f"Theme: {theme}. Mood: {music_mood}",
+            "media_metadata": bgm_metadata,
+            "media_type": "audio",
+        }], provider=provider)[0]
+        if not is_valid and os.path.exists(bgm_path):
+            os.remove(bgm_path)
+            bgm_path = None
+
+    if align_thread:
+        update_progress(80, "나레이션 타이밍 추출 마무리 중...")
+        align_thread.join()
 
     update_progress(80, "미디어 및 나레이션 생성 완료.")
 
@@ -251,14 +446,15 @@ def generate_video_pipeline(script_data: dict, target_duration: int = None, mood
     # output file name setting
     topic = script_data.get('metadata', {}).get('topic', 'reels').replace(" ", "_")
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_filename = f"reel_{topic}_{timestamp}.mp4"
+    output_filename = f"reel_{topic}_{timestamp}{'_draft' if draft else ''}.mp4"
     output_filepath = os.path.join(config.FINAL_REELS_DIR, output_filename)
 
     final_video_path = assemble_reel(
         scenes_data=processed_scenes,
         output_filepath=output_filepath,
         final_duration=target_duration,
-        bgm_path=bgm_path
+        bgm_path=bgm_path,
+        draft=draft
     )
     
     if final_video_path:
@@ -1,21 +1,226 @@
 from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import config
 import os
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-def search_and_download_video(keyword: str, output_dir: str, duration: int) -> Optional[tuple[str, dict]]:
+# 다운로드 엔진 설정
+DOWNLOAD_READ_SIZE = 64 * 1024       # 소켓에서 읽는 단위 (끊겨도 받은 만큼은 .part에 남도록 작게)
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024   # 파일 쓰기 버퍼 (디스크에는 1MB 단위로 기록)
+DOWNLOAD_MAX_RETRIES = 3           # 연결 끊김 시 Range 요청으로 이어받기 재시도 횟수
+PARALLEL_DOWNLOAD_THRESHOLD = getattr(config, 'PARALLEL_DOWNLOAD_THRESHOLD_MB', 16) * 1024 * 1024
+PARALLEL_DOWNLOAD_PARTS = getattr(config, 'PARALLEL_DOWNLOAD_PARTS', 4)
+DOWNLOAD_LATENCY_WINDOW = 500        # p50/p95 계산에 쓰는 최근 다운로드 수 (오래 실행돼도 메모리/정렬 비용 고정)
+
+_session = None
+_session_lock = threading.Lock()
+_download_stats_lock = threading.Lock()
+_download_stats = {"files": 0, "bytes": 0, "seconds": 0.0, "latencies": deque(maxlen=DOWNLOAD_LATENCY_WINDOW)}
+
+def get_http_session() -> requests.Session:
     """
-    requests 라이브러리를 사용하여 Pexels API를 직접 호출하고,
-    keyword에 맞는 세로형 영상을 검색하여 다운로드합니다.
+    Pexels 검색과 영상 다운로드가 함께 쓰는 프로세스 전역 HTTP 세션을 반환합니다.
+    (Keep-Alive 연결 풀 재사용, 일시적인 5xx 오류 자동 재시도)
     """
-    if not config.PEXELS_API_KEY:
-        print("Error: Pexels API Key가 설정되지 않았습니다.")
-        return None, None
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+                          allowed_methods=["GET", "HEAD"])
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
 
-    headers = {
-        "Authorization": config.PEXELS_API_KEY
+def _probe_remote_file(url: str) -> tuple:
+    """HEAD 요청으로 (파일 크기, Range 지원 여부)를 확인합니다. 실패하면 (None, False)."""
+    try:
+        response = get_http_session().head(url, allow_redirects=True, timeout=10)
+        response.raise_for_status()
+        size = int(response.headers.get("Content-Length", 0)) or None
+        return size, response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    except (requests.exceptions.RequestException, ValueError):
+        return None, False
+
+def _download_resumable(url: str, partial_path: str, total_size: Optional[int]) -> tuple:
+    """
+    단일 연결로 다운로드하되, 연결이 끊기면 받은 부분부터 Range 요청으로 이어받습니다.
+    Returns: (성공 여부, 서버가 알려준 전체 크기 또는 None)
+    """
+    session = get_http_session()
+    for attempt in range(DOWNLOAD_MAX_RETRIES):
+        existing = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+        if total_size and existing >= total_size:
+            return True, total_size
+        headers = {"Range": f"bytes={existing}-"} if existing else {}
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                if existing and response.status_code != 206:
+                    existing = 0  # 서버가 Range를 무시함 -> 처음부터 다시 받기
+                if response.status_code == 206:
+                    content_range = response.headers.get("Content-Range", "")
+                    if "/" in content_range and content_range.rsplit("/", 1)[1].isdigit():
+                        total_size = int(content_range.rsplit("/", 1)[1])
+                elif response.headers.get("Content-Length"):
+                    total_size = int(response.headers["Content-Length"])
+
+                with open(partial_path, "ab" if existing else "wb", buffering=DOWNLOAD_BUFFER_SIZE) as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_READ_SIZE):
+                        f.write(chunk)
+            return True, total_size
+        except requests.exceptions.RequestException as e:
+            received = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+            print(f"  ⚠️ 다운로드 중단 ({received / 1024 / 1024:.1f}MB 수신): {e} - 이어받기 재시도 ({attempt+1}/{DOWNLOAD_MAX_RETRIES})")
+    return False, total_size
+
+def _download_ranges_parallel(url: str, partial_path: str, total_size: int) -> bool:
+    """큰 파일을 여러 바이트 구간으로 나눠 동시에 받습니다. 구간별로 끊긴 지점부터 이어받습니다."""
+    session = get_http_session()
+    with open(partial_path, "wb") as f:
+        f.truncate(total_size)
+
+    part_size = -(-total_size // PARALLEL_DOWNLOAD_PARTS)
+    ranges = [(start, min(start + part_size, total_size) - 1) for start in range(0, total_size, part_size)]
+
+    def fetch_range(byte_range):
+        pos, end = byte_range
+        for attempt in range(DOWNLOAD_MAX_RETRIES):
+            try:
+                with session.get(url, headers={"Range": f"bytes={pos}-{end}"}, stream=True, timeout=30) as response:
+                    if response.status_code != 206:
+                        return False
+                    with open(partial_path, "r+b", buffering=DOWNLOAD_BUFFER_SIZE) as f:
+                        f.seek(pos)
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_READ_SIZE):
+                            f.write(chunk)
+                            pos += len(chunk)
+                if pos > end:
+                    return True
+            except requests.exceptions.RequestException as e:
+                print(f"  ⚠️ 구간 다운로드 중단 ({pos}-{end}): {e} - 재시도 ({attempt+1}/{DOWNLOAD_MAX_RETRIES})")
+        return pos > end
+
+    with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="download") as executor:
+        return all(executor.map(fetch_range, ranges))
+
+def _record_download(size: int, elapsed: float) -> None:
+    with _download_stats_lock:
+        _download_stats["files"] += 1
+        _download_stats["bytes"] += size
+        _download_stats["seconds"] += elapsed
+        _download_stats["latencies"].append(elapsed)
+
+def get_download_stats() -> dict:
+    """누적 다운로드 통계: 파일 수, 총 MB, 평균 MB/s, 최근 DOWNLOAD_LATENCY_WINDOW개 다운로드의 지연 시간 p50/p95(초)"""
+    with _download_stats_lock:
+        latencies = sorted(_download_stats["latencies"])
+        total_mb = _download_stats["bytes"] / 1024 / 1024
+        seconds = _download_stats["seconds"]
+        files = _download_stats["files"]
+
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+
+    return {
+        "files": files,
+        "megabytes": total_mb,
+        "mb_per_second": total_mb / seconds if seconds > 0 else 0.0,
+        "p50_seconds": percentile(0.5),
+        "p95_seconds": percentile(0.95),
     }
-    
+
+def download_file(url: str, filepath: str) -> bool:
+    """
+    URL을 filepath로 다운로드합니다.
+    - 공유 세션으로 연결 재사용, 1MB 버퍼링 쓰기
+    - 끊기면 .part 파일에서 Range 요청으로 이어받기 (이전 실행에서 남은 .part도 이어받음)
+    - 큰 파일은 바이트 구간을 나눠 병렬 다운로드
+    - 완료 후 Content-Length와 실제 크기가 다르면 실패 처리
+    """
+    start = time.perf_counter()
+    partial_path = filepath + ".part"
+    total_size, accepts_ranges = _probe_remote_file(url)
+
+    done = False
+    if total_size and accepts_ranges and total_size >= PARALLEL_DOWNLOAD_THRESHOLD and not os.path.exists(partial_path):
+        done = _download_ranges_parallel(url, partial_path, total_size)
+        if not done and os.path.exists(partial_path):
+            os.remove(partial_path)  # 구간이 비어있는 파일은 이어받을 수 없으므로 단일 연결로 다시 받기
+    if not done:
+        done, total_size = _download_resumable(url, partial_path, total_size)
+    if not done:
+        return False
+
+    actual_size = os.path.getsize(partial_path)
+    if total_size and actual_size != total_size:
+        print(f"  ❌ 다운로드 크기 불일치 (기대 {total_size}B, 실제 {actual_size}B) - 파일 폐기")
+        os.remove(partial_path)
+        return False
+    os.replace(partial_path, filepath)
+
+    elapsed = time.perf_counter() - start
+    _record_download(actual_size, elapsed)
+    print(f"  다운로드 완료: {actual_size / 1024 / 1024:.1f}MB, {elapsed:.2f}s "
+          f"({actual_size / 1024 / 1024 / max(elapsed, 1e-6):.1f}MB/s)")
+    return True
+
+# --- Pexels 검색 캐시 / 영상 ID 기반 다운로드 저장소 ---
+_media_cache_stats_lock = threading.Lock()
+_media_cache_stats = {"search_hits": 0, "search_misses": 0, "download_hits": 0, "download_misses": 0}
+_download_path_locks = {}
+_download_path_locks_guard = threading.Lock()
+
+def _count(stat: str) -> None:
+    with _media_cache_stats_lock:
+        _media_cache_stats[stat] += 1
+
+def get_media_cache_stats() -> dict:
+    """검색 캐시/다운로드 저장소 적중·미스 횟수를 반환합니다."""
+    with _media_cache_stats_lock:
+        return dict(_media_cache_stats)
+
+def _search_cache_path(params: dict) -> str:
+    key = hashlib.sha256(json.dumps(params, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return os.path.join(getattr(config, 'PEXELS_SEARCH_CACHE_DIR', os.path.join("assets", "cache", "pexels_search")), f"{key}.json")
+
+def _load_cached_search(params: dict) -> Optional[dict]:
+    """TTL 이내의 검색 결과가 캐시에 있으면 반환합니다."""
+    path = _search_cache_path(params)
+    ttl = getattr(config, 'PEXELS_SEARCH_CACHE_TTL_HOURS', 72) * 3600
+    if not os.path.exists(path) or time.time() - os.path.getmtime(path) > ttl:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _store_cached_search(params: dict, data: dict) -> None:
+    path = _search_cache_path(params)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"  ⚠️ Pexels 검색 캐시 저장 실패: {e}")
+
+def search_pexels_videos(keyword: str) -> Optional[dict]:
+    """
+    Pexels 영상 검색 API를 호출합니다. (query, orientation, size, per_page)가 같은 검색은
+    PEXELS_SEARCH_CACHE_TTL_HOURS 동안 디스크 캐시에서 반환하여 API 호출을 생략합니다.
+    """
     params = {
         "query": keyword,
         "orientation": config.PEXELS_SEARCH_ORIENTATION,
@@ -23,16 +228,135 @@ def search_and_download_video(keyword: str, output_dir: str, duration: int) -> O
         "per_page": config.PEXELS_SEARCH_PER_PAGE
     }
 
+    data = _load_cached_search(params)
+    if data is not None:
+        _count("search_hits")
+        print(f"Pexels 검색 캐시 적중: '{keyword}'")
+        return data
+    _count("search_misses")
+
+    headers = {
+        "Authorization": config.PEXELS_API_KEY
+    }
+
     try:
         print(f"Pexels API로 '{keyword}' 영상 검색 중...")
-        response = requests.get(config.PEXELS_API_URL, headers=headers, params=params, timeout=10)
+        response = get_http_session().get(config.PEXELS_API_URL, headers=headers, params=params, timeout=10)
         response.raise_for_status() # HTTP 오류 발생 시 예외 발생
         data = response.json()
     except requests.exceptions.RequestException as e:
         print(f"Pexels API 요청 중 오류 발생: {e}")
-        return None, None
+        return None
     except Exception as e:
         print(f"Pexels API 응답 처리 중 오류 발생: {e}")
+        return None
+
+    if data.get('videos'):
+        _store_cached_search(params, data)
+    return data
+
+def _stored_video_path(output_dir: str, video_item: dict, video_file: dict) -> str:
+    """Pexels 영상 ID와 렌디션(파일 ID 또는 해상도)으로 저장 경로를 정합니다. 같은 영상은 한 번만 저장됩니다."""
+    rendition = video_file.get('id') or f"{video_file.get('width', 0)}x{video_file.get('height', 0)}"
+    return os.path.join(output_dir, f"pexels_{video_item.get('id')}_{rendition}.mp4")
+
+def _download_path_lock(filepath: str) -> threading.Lock:
+    # 병렬 장면이 같은 영상을 동시에 받지 않도록 경로별 잠금
+    with _download_path_locks_guard:
+        return _download_path_locks.setdefault(filepath, threading.Lock())
+
+def select_rendition(video_files: list, target_width: int, target_height: int, target_fps: float) -> Optional[dict]:
+    """
+    렌더 해상도/프레임레이트를 만족하는 렌디션 중 가장 가벼운 파일을 고릅니다.
+
+    - 해상도: 화면을 꽉 채우도록(scale-to-fill) 맞췄을 때 업스케일 배율이 RENDITION_MAX_UPSCALE 이하여야 충분
+    - 프레임레이트: 원본 fps가 target_fps 이상이어야 충분 (정보가 없으면 충분으로 간주)
+    - 비용: 디코딩량(가로 x 세로 x 원본 fps)이 가장 작은 파일 선택 (4K 대신 1080p)
+    만족하는 파일이 없으면 업스케일이 가장 적은(가장 큰) 파일을 반환합니다.
+    """
+    candidates = [f for f in video_files if f.get('link') and f.get('width') and f.get('height')]
+    if not candidates:
+        return None
+
+    max_upscale = getattr(config, 'RENDITION_MAX_UPSCALE', 1.05)
+
+    def upscale(f):
+        return max(target_width / f['width'], target_height / f['height'])
+
+    def fps(f):
+        return f.get('fps') or target_fps
+
+    def decode_cost(f):
+        return f['width'] * f['height'] * fps(f)
+
+    sharp_enough = [f for f in candidates if upscale(f) <= max_upscale]
+    smooth_enough = [f for f in sharp_enough if fps(f) >= target_fps * 0.95]
+    if smooth_enough:
+        return min(smooth_enough, key=decode_cost)
+    if sharp_enough:
+        return max(sharp_enough, key=lambda f: (fps(f), -decode_cost(f)))
+    return min(candidates, key=lambda f: (upscale(f), decode_cost(f)))
+
+def _rendition_target(draft: bool) -> tuple:
+    """렌디션 선택 기준 (가로, 세로, fps). 초안은 초안 규격을 만족하는 가장 작은 렌디션을 받습니다."""
+    if draft:
+        return (getattr(config, 'DRAFT_WIDTH', 360), getattr(config, 'DRAFT_HEIGHT', 640), getattr(config, 'DRAFT_FPS', 12))
+    return (config.REELS_WIDTH, config.REELS_HEIGHT, config.REELS_FPS)
+
+def _download_selected(label: str, output_dir: str, video_item: dict, selected_file: dict) -> Optional[str]:
+    """선택한 렌디션을 저장소에 받습니다 (이미 있으면 재사용). 실패 시 None."""
+    filepath = _stored_video_path(output_dir, video_item, selected_file)
+    with _download_path_lock(filepath):
+        if os.path.exists(filepath):
+            _count("download_hits")
+            print(f"'{label}' 영상 저장소 적중 (다운로드 생략): {filepath}")
+            return filepath
+        _count("download_misses")
+        print(f"'{label}' 영상 다운로드 중... ({selected_file['width']}x{selected_file['height']}, {selected_file.get('fps') or '?'}fps)")
+        if not download_file(selected_file['link'], filepath):
+            return None
+        print(f"'{label}' 영상 다운로드 완료: {filepath}")
+        return filepath
+
+def download_pexels_video(video_id, output_dir: str, draft: bool = False) -> Optional[str]:
+    """
+    이미 선택(승인)된 Pexels 영상을 ID로 조회해 현재 렌더링 규격에 맞는 렌디션을 받습니다.
+    초안에서 고른 영상을 본 렌더링에 쓸 때 검색/AI 검증 없이 해상도만 바꿔 받는 용도입니다.
+    """
+    if not config.PEXELS_API_KEY or not video_id:
+        return None
+    try:
+        response = get_http_session().get(
+            config.PEXELS_VIDEO_URL.format(video_id=video_id),
+            headers={"Authorization": config.PEXELS_API_KEY}, timeout=10
+        )
+        response.raise_for_status()
+        video_item = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Pexels 영상 조회 중 오류 발생 (ID {video_id}): {e}")
+        return None
+
+    selected_file = select_rendition(video_item.get('video_files', []), *_rendition_target(draft))
+    if not selected_file:
+        return None
+    try:
+        return _download_selected(f"#{video_id}", output_dir, video_item, selected_file)
+    except Exception as e:
+        print(f"영상 파일 다운로드 중 오류 발생 (ID {video_id}): {e}")
+        return None
+
+def search_and_download_video(keyword: str, output_dir: str, duration: int, draft: bool = False) -> Optional[tuple[str, dict]]:
+    """
+    requests 라이브러리를 사용하여 Pexels API를 직접 호출하고,
+    keyword에 맞는 세로형 영상을 검색하여 다운로드합니다.
+    draft=True면 초안 규격(DRAFT_WIDTH/HEIGHT/FPS)을 만족하는 가장 작은 렌디션을 받습니다.
+    """
+    if not config.PEXELS_API_KEY:
+        print("Error: Pexels API Key가 설정되지 않았습니다.")
+        return None, None
+
+    data = search_pexels_videos(keyword)
+    if data is None:
         return None, None
 
     if not data.get('videos'):
@@ -40,37 +364,27 @@ def search_and_download_video(keyword: str, output_dir: str, duration: int) -> O
         # Self-Healing: 단어가 여러개면 마지막 단어로 재검색 시도
         words = keyword.split()
         if len(words) > 1:
-            return search_and_download_video(words[-1], output_dir, duration)
+            return search_and_download_video(words[-1], output_dir, duration, draft)
         return None, None
 
-    for video_item in data['videos']:
-        # 다운로드할 비디오 파일 링크 선택
-        selected_link = None
-        best_quality = 0
-        for file in video_item.get('video_files', []):
-            # 1080p 이상 화질의 'hd' 링크를 우선적으로 찾음
-            if file.get('quality') == 'hd' and file.get('height', 0) >= 1080 and file.get('link'):
-                if file['height'] > best_quality:
-                    selected_link = file['link']
-                    best_quality = file['height']
+    # 장면 길이를 채우는 영상을 먼저 시도 (짧은 영상은 뒷부분이 검은 화면이 됨), 그 외에는 Pexels 관련도 순서 유지
+    videos = sorted(data['videos'], key=lambda item: (item.get('duration') or 0) < duration)
+
+    for video_item in videos:
+        # 렌더 해상도/fps를 만족하는 가장 가벼운 렌디션 선택
+        selected_file = select_rendition(video_item.get('video_files', []), *_rendition_target(draft))
         
-        if selected_link:
+        if selected_file:
             try:
-                filename = f"{keyword.replace(' ', '_')}_{os.urandom(4).hex()}.mp4"
-                filepath = os.path.join(output_dir, filename)
-                
-                print(f"'{keyword}' 영상 다운로드 중...")
-                video_response = requests.get(selected_link, stream=True, timeout=30)
-                video_response.raise_for_status()
-
-                with open(filepath, 'wb') as f:
-                    for chunk in video_response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                print(f"'{keyword}' 영상 다운로드 완료: {filepath}")
+                filepath = _download_selected(keyword, output_dir, video_item, selected_file)
+                if not filepath:
+                    print(f"'{keyword}' 영상 다운로드 실패, 다음 영상을 시도합니다.")
+                    continue
                 
                 # 메타데이터 추출
                 metadata = {
                     "query": keyword,
+                    "video_id": video_item.get('id'),
                     "tags": video_item.get('tags', []),
                     "url": video_item.get('url', ''),
                     "duration": video_item.get('duration', 0)
@@ -0,0 +1,188 @@
+# media_normalizer.py
+# 이 파일은 다운로드된 스톡 영상을 릴스 규격(REELS_WIDTH x REELS_HEIGHT, REELS_FPS, 중앙 크롭, 짧은 GOP)의
+# 중간(mezzanine) 파일로 미리 변환하는 인제스트 모듈입니다.
+# 다운로드 직후 백그라운드에서 변환을 시작해 AI 검증 등 나머지 파이프라인과 겹쳐 실행되고,
+# 결과는 원본 옆에 캐시되어 같은 영상을 다시 쓸 때 재사용됩니다.
+# 장면에 쓰이는 앞부분(장면 길이 + INGEST_TRIM_MARGIN_SECONDS)만 변환하고, 렌더링 시점에는 장면 길이 이상으로
+# 변환된 파일을 찾아 쓰며, 변환이 끝나지 않았으면 기다리지 않고 원본을 그대로 사용합니다.
+
+import os
+import re
+import glob
+import math
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import config
+from ffmpeg_renderer import get_ffmpeg_binary
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.webm', '.mkv')
+MEZZANINE_TAG = "reel"
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = {}  # (원본 경로, 변환 길이) -> Future (완료되면 제거)
+_pending_lock = threading.Lock()
+
+
+def _normalize_enabled() -> bool:
+    return getattr(config, 'INGEST_NORMALIZE_ENABLED', True)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, getattr(config, 'INGEST_MAX_WORKERS', 2))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest")
+        return _executor
+
+
+def trim_seconds(duration: float) -> int:
+    """장면 길이에 여유를 더한 변환 길이(초). 같은 장면 길이면 같은 파일 이름이 되도록 정수로 올림"""
+    return int(math.ceil(max(duration or 0, 1) + getattr(config, 'INGEST_TRIM_MARGIN_SECONDS', 1.0)))
+
+
+def _mezzanine_prefix(source_path: str) -> str:
+    stem, _ = os.path.splitext(source_path)
+    return f"{stem}.{MEZZANINE_TAG}_{config.REELS_WIDTH}x{config.REELS_HEIGHT}_{config.REELS_FPS}_t"
+
+
+def mezzanine_path(source_path: str, duration: float) -> str:
+    """원본 옆에 위치할 정규화 파일 경로 (출력 규격이나 변환 길이가 바뀌면 다른 파일이 됨)"""
+    return f"{_mezzanine_prefix(source_path)}{trim_seconds(duration)}.mp4"
+
+
+def _mezzanines_on_disk(source_path: str) -> list:
+    """원본보다 최신인 같은 규격의 변환본 [(변환 길이, 경로)] (짧은 것부터)"""
+    prefix = _mezzanine_prefix(source_path)
+    found = []
+    for path in glob.glob(glob.escape(prefix) + "*.mp4"):
+        match = re.fullmatch(r"(\d+)\.mp4", path[len(prefix):])
+        if match and _is_fresh(source_path, path):
+            found.append((int(match.group(1)), path))
+    return sorted(found)
+
+
+def _is_fresh(source_path: str, target_path: str) -> bool:
+    try:
+        return os.path.getmtime(target_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+
+def normalize_clip(source_path: str, duration: float) -> Optional[str]:
+    """
+    영상의 앞부분(장면 길이 + 여유)을 릴스 규격 mezzanine 파일로 변환합니다. (동기 실행)
+    이미 최신 변환본이 있으면 그대로 반환하고, 실패하면 None을 반환합니다.
+    """
+    target_path = mezzanine_path(source_path, duration)
+    if _is_fresh(source_path, target_path):
+        return target_path
+
+    ffmpeg_binary = get_ffmpeg_binary()
+    if not ffmpeg_binary:
+        return None
+
+    width, height, fps = config.REELS_WIDTH, config.REELS_HEIGHT, config.REELS_FPS
+    temp_path = target_path + ".part"
+    cmd = [
+        ffmpeg_binary, "-y", "-hide_banner", "-loglevel", "error",
+        "-i", source_path,
+        "-t", str(trim_seconds(duration)),  # 스톡 영상 전체가 아니라 장면에 쓰이는 부분만 변환
+        "-vf", f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height},fps={fps},setsar=1",
+        "-an",  # 스톡 영상 오디오는 사용하지 않음
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "18", "-pix_fmt", "yuv420p",
+        # 1초 GOP: 장면 길이에 맞춰 자를 때 키프레임 탐색 비용을 줄임
+        "-g", str(fps), "-keyint_min", str(fps), "-sc_threshold", "0",
+        "-movflags", "+faststart", "-f", "mp4",
+        temp_path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except OSError as e:
+        print(f"    ⚠️ 영상 정규화 실행 실패 ({os.path.basename(source_path)}): {e}")
+        return None
+
+    if result.returncode != 0 or not os.path.exists(temp_path):
+        error_tail = result.stderr.strip().splitlines()[-1:] or [""]
+        print(f"    ⚠️ 영상 정규화 실패 ({os.path.basename(source_path)}): {error_tail[0]}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+    os.replace(temp_path, target_path)
+    print(f"    [인제스트] 정규화 완료: {os.path.basename(target_path)}")
+    return target_path
+
+
+def schedule_normalization(source_path: str, duration: float) -> Optional[Future]:
+    """다운로드된 영상의 정규화를 백그라운드에서 시작합니다. (이미지/비활성화 시 None)"""
+    if not _normalize_enabled() or not source_path or not source_path.lower().endswith(VIDEO_EXTENSIONS):
+        return None
+    key = (os.path.abspath(source_path), trim_seconds(duration))
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is not None and not future.cancelled():
+            return future
+        future = _get_executor().submit(normalize_clip, source_path, duration)
+        _pending[key] = future
+
+    def _forget(done: Future) -> None:
+        # 결과는 디스크에 있으므로 완료(성공/실패/취소)된 항목은 제거
+        with _pending_lock:
+            if _pending.get(key) is done:
+                del _pending[key]
+
+    # 이미 끝난 Future면 콜백이 즉시 이 스레드에서 실행되므로 잠금 밖에서 등록
+    future.add_done_callback(_forget)
+    return future
+
+
+def cancel_normalization(source_path: str) -> None:
+    """반려된 영상처럼 더 이상 필요 없는 정규화를 (아직 시작 전이라면) 취소합니다."""
+    if not source_path:
+        return
+    path = os.path.abspath(source_path)
+    with _pending_lock:
+        futures = [future for (pending_path, _), future in _pending.items() if pending_path == path]
+    for future in futures:
+        future.cancel()  # 취소되면 done 콜백이 _pending에서 제거
+
+
+def get_normalized_clip(source_path: str, duration: float) -> Optional[str]:
+    """
+    정규화된 영상 경로를 반환합니다.
+    장면 길이 이상으로 변환된 것이면 어느 것이든 사용합니다. (총 길이에 맞춰 장면이 줄어든 경우에도
+    다운로드 시점의 장면 길이로 만든 변환본을 찾도록) 쓸 수 있는 변환이 아직 끝나지 않았으면
+    렌더링을 막지 않도록 기다리지 않고 None(원본 사용)을 반환합니다.
+    """
+    if not _normalize_enabled() or not source_path:
+        return None
+    path = os.path.abspath(source_path)
+    needed = trim_seconds(duration)
+    with _pending_lock:
+        futures = sorted((trim, future) for (pending_path, trim), future in _pending.items()
+                         if pending_path == path and trim >= needed)
+    in_progress = False
+    for _, future in futures:
+        if not future.done():
+            in_progress = True
+            continue
+        if future.cancelled():
+            continue
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"    ⚠️ 영상 정규화 실패 ({os.path.basename(source_path)}): {e}")
+            continue
+        if result:
+            return result
+    for trim, target_path in _mezzanines_on_disk(source_path):
+        if trim >= needed:
+            return target_path
+    if in_progress:
+        print(f"    [인제스트] 정규화 진행 중 - 원본 사용: {os.path.basename(source_path)}")
+    return None
@@ -0,0 +1,214 @@
+# media_prefilter.py
+# 이 파일은 미디어 후보를 LLM에 보내기 전에 로컬에서 먼저 판정하는 사전 필터입니다.
+# 장면의 영어 키워드/장면 설명과 후보의 태그·URL 슬러그(BGM은 제목·태그·설명)를 표제어 단위로 맞춰 보고,
+# 지금까지 본 메타데이터 전체를 문서 집합으로 한 BM25 점수로 확실한 통과/반려만 로컬에서 결정합니다.
+# 애매한 중간 구간만 LLM 검증으로 넘어갑니다.
+
+import os
+import re
+import json
+import math
+import hashlib
+import threading
+from typing import Optional
+
+import config
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+KEYWORD_WEIGHT = 1.0      # visual_keywords (검색에 실제로 쓰는 단어)
+DESCRIPTION_WEIGHT = 0.3  # visual_description (문장이라 덜 중요한 단어가 섞임)
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "in", "on", "at", "to", "for", "with", "by", "from", "into", "over",
+    "is", "are", "be", "it", "its", "this", "that", "as", "up", "out", "while", "some", "very",
+    # 스톡 영상/BGM 메타데이터에 흔한, 내용과 무관한 단어
+    "video", "footage", "stock", "free", "hd", "uhd", "k", "shot", "clip", "no", "copyright", "music",
+    "background", "royalty", "official", "audio", "bgm",
+}
+
+
+def lemmatize(word: str) -> str:
+    """
+    영어 단어를 간단한 규칙으로 같은 형태로 줄입니다 (pills -> pill, running -> run, smile/smiled/smiling -> smil).
+    질의와 문서에 똑같이 적용되므로 사전적인 표제어가 아니어도 같은 단어끼리만 맞으면 됩니다.
+    """
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "ches", "shes", "xes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    else:
+        for suffix in ("ing", "ed"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                if word[-1] == word[-2] and word[-1] not in "ls":
+                    word = word[:-1]  # running -> run
+                break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list:
+    return [lemmatize(word) for word in re.findall(r"[a-z]+", (text or "").lower())
+            if word not in STOPWORDS and len(word) > 1]
+
+
+def document_terms(media_metadata: dict) -> list:
+    """후보 메타데이터에서 내용 단어를 뽑습니다: 태그, URL 슬러그(/video/<설명>-<id>/), BGM 제목/설명"""
+    parts = list(media_metadata.get("tags") or [])
+    url = media_metadata.get("url") or ""
+    slug = url.rstrip("/").rsplit("/", 1)[-1] if url else ""
+    parts.append(slug.replace("-", " "))
+    parts.append(media_metadata.get("title") or "")
+    parts.append(media_metadata.get("description") or "")
+    return tokenize(" ".join(str(part) for part in parts))
+
+
+class MetadataCorpus:
+    """지금까지 본 후보 메타데이터의 문서 빈도(DF). BM25의 IDF 계산에 쓰이며 실행 간 디스크에 누적됩니다."""
+    def __init__(self, path: str):
+        self.path = path
+        self.documents = 0
+        self.total_terms = 0
+        self.df = {}
+        self.seen = set()
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.documents = data.get("documents", 0)
+            self.total_terms = data.get("total_terms", 0)
+            self.df = data.get("df", {})
+            self.seen = set(data.get("seen", []))
+        except (OSError, ValueError):
+            pass
+
+    def add(self, doc_id: str, terms: list) -> None:
+        with self._lock:
+            self._load()
+            if doc_id in self.seen:
+                return
+            self.seen.add(doc_id)
+            self.documents += 1
+            self.total_terms += len(terms)
+            for term in set(terms):
+                self.df[term] = self.df.get(term, 0) + 1
+            self._dirty = True
+
+    def idf(self, term: str) -> float:
+        n = max(self.documents, 1)
+        return math.log((n - self.df.get(term, 0) + 0.5) / (self.df.get(term, 0) + 0.5) + 1)
+
+    def avg_length(self) -> float:
+        return self.total_terms / self.documents if self.documents else 1.0
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, "w", encoding='utf-8') as f:
+                    json.dump({"documents": self.documents, "total_terms": self.total_terms,
+                               "df": self.df, "seen": sorted(self.seen)}, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+                self._dirty = False
+            except OSError as e:
+                print(f"  ⚠️ 사전 필터 말뭉치 저장 실패: {e}")
+
+
+corpus = MetadataCorpus(
+    getattr(config, 'PREFILTER_CORPUS_PATH', os.path.join("assets", "cache", "prefilter_corpus.json"))
+)
+
+_stats_lock = threading.Lock()
+_stats = {"accepted": 0, "rejected": 0, "ambiguous": 0}
+
+
+def prefilter_enabled() -> bool:
+    return getattr(config, 'PREFILTER_ENABLED', True)
+
+
+def relevance_score(keywords: list, description: str, media_metadata: dict) -> Optional[float]:
+    """
+    키워드/설명과 후보 메타데이터의 BM25 점수를 0~1로 정규화해 반환합니다.
+    (1.0 = 모든 질의 단어가 평균 길이 문서에 한 번씩 등장한 수준) 후보의 내용 단어가 너무 적으면 None.
+    """
+    terms = document_terms(media_metadata)
+    # 같은 영상/BGM은 검색어가 달라도 한 문서로 셈
+    identity = media_metadata.get("video_id") or [media_metadata.get("title"), media_metadata.get("url")]
+    doc_id = hashlib.sha256(json.dumps(identity, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()[:16]
+    corpus.add(doc_id, terms)
+    if len(set(terms)) < getattr(config, 'PREFILTER_MIN_TERMS', 4):
+        return None
+
+    weights = {}
+    for term in tokenize(" ".join(keywords or [])):
+        weights[term] = KEYWORD_WEIGHT
+    for term in tokenize(description):
+        weights.setdefault(term, DESCRIPTION_WEIGHT)
+    if not weights:
+        return None
+
+    counts = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    length_norm = 1 - BM25_B + BM25_B * len(terms) / corpus.avg_length()
+    score = ideal = 0.0
+    for term, weight in weights.items():
+        idf = corpus.idf(term)
+        tf = counts.get(term, 0)
+        score += weight * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * length_norm)
+        ideal += weight * idf
+    return min(1.0, score / ideal) if ideal > 0 else None
+
+
+def prefilter_verdict(item: dict) -> Optional[tuple]:
+    """
+    validate_media_batch 항목 하나를 로컬에서 판정합니다.
+    item: {"media_metadata", "media_type", "keywords", "description", "tried_keywords"(선택: 장면에서 이미 검색한 키워드)}
+    Returns: 확실하면 (is_valid, suggestion), 애매하면 None (LLM 검증 필요)
+    """
+    if not item.get("keywords"):
+        return None
+    metadata = item["media_metadata"] or {}
+    score = relevance_score(item["keywords"], item.get("description", ""), metadata)
+    verdict = None
+    if score is not None and score >= getattr(config, 'PREFILTER_ACCEPT_SCORE', 0.5):
+        verdict = (True, "Suitable")
+    elif score is not None and score <= getattr(config, 'PREFILTER_REJECT_SCORE', 0.05) \
+            and item.get("media_type", "video") == "video":
+        # 반려에는 다음 검색어가 필요: 아직 검색하지 않은 장면 키워드가 있을 때만 로컬에서 반려
+        # (이번 검색어뿐 아니라 이전 라운드에서 검색했다가 반려된 키워드도 다시 제안하지 않음)
+        tried = {keyword.lower() for keyword in item.get("tried_keywords") or ()}
+        tried.add((metadata.get("query") or "").lower())
+        untried = [keyword for keyword in item["keywords"] if keyword.lower() not in tried]
+        if untried:
+            verdict = (False, untried[0])
+
+    with _stats_lock:
+        _stats["ambiguous" if verdict is None else ("accepted" if verdict[0] else "rejected")] += 1
+    return verdict
+
+
+def save_corpus() -> None:
+    corpus.save()
+
+
+def get_prefilter_stats() -> dict:
+    """로컬 판정 통계. accepted + rejected가 절약한 LLM 검증 수입니다."""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,175 @@
+# scene_cache.py
+# 이 파일은 장면 단위 결과물을 지문(fingerprint)으로 캐시하여, 스크립트 일부만 수정하고 다시 제작할 때
+# 바뀐 장면만 다시 만들도록 하는 모듈입니다.
+#  - 미디어 선택 캐시: 키워드/나레이션/장면 설명/길이가 같으면 Pexels 검색과 AI 검증을 건너뛰고 이전에 승인된 영상을 재사용
+#    (초안에서 승인된 영상은 본 렌더링에서 해상도만 바꿔 다시 받음)
+#  - 세그먼트 캐시: 자막/미디어/길이/스타일 설정이 같으면 렌더링된 장면 세그먼트를 재사용
+
+import os
+import json
+import hashlib
+import threading
+from typing import Optional
+
+import config
+
+SCENE_CACHE_VERSION = 2  # 지문 구성이나 세그먼트 형식이 바뀌면 올려서 기존 캐시 무효화
+
+_lock = threading.Lock()
+_stats = {"media_hits": 0, "media_misses": 0, "segment_hits": 0, "segment_misses": 0}
+
+
+def scene_cache_enabled() -> bool:
+    return getattr(config, 'SCENE_CACHE_ENABLED', True)
+
+
+def _media_dir() -> str:
+    return os.path.join(config.SCENE_CACHE_DIR, "media")
+
+
+def _segment_dir() -> str:
+    return os.path.join(config.SCENE_CACHE_DIR, "segments")
+
+
+def _fingerprint(payload: dict) -> str:
+    data = json.dumps({"version": SCENE_CACHE_VERSION, **payload}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:32]
+
+
+def file_identity(path: Optional[str]) -> Optional[list]:
+    """큰 미디어 파일의 식별자 (절대 경로, 크기, 수정 시각)"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+# ---------------------------------------------------------------------------
+# 미디어 선택 캐시
+# ---------------------------------------------------------------------------
+
+def media_fingerprint(scene: dict, keyword: str, duration: float, provider: str) -> str:
+    return _fingerprint({
+        "kind": "media",
+        "keyword": keyword,
+        "narration": scene.get('narration', ''),
+        "visual_description": scene.get('visual_description', ''),
+        "duration": duration,
+        "provider": provider,
+    })
+
+
+def _read_media_selection(fingerprint: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(_media_dir(), f"{fingerprint}.json"), encoding='utf-8') as f:
+            selection = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # 초안/본 렌더링은 같은 영상의 다른 렌디션을 쓰므로 모드별 경로를 따로 기록 (예전 형식은 본 렌더링 경로)
+    selection.setdefault("renditions", {"full": selection.get("media_path")})
+    return selection
+
+
+def load_media_selection(fingerprint: str, draft: bool = False) -> Optional[dict]:
+    """
+    이전 실행에서 이 장면에 선택된 미디어 정보 {"media_path", "metadata"}. 선택 기록이 없으면 None.
+    이번 모드(초안/본 렌더링)의 파일이 없으면 media_path가 None이며, metadata의 video_id로 같은 영상을 다시 받을 수 있습니다.
+    """
+    if not scene_cache_enabled():
+        return None
+    selection = _read_media_selection(fingerprint)
+    media_path = selection["renditions"].get("draft" if draft else "full") if selection else None
+    if media_path and not os.path.exists(media_path):
+        media_path = None
+    metadata = (selection or {}).get("metadata") or {}
+    hit = bool(media_path or metadata.get("video_id"))
+    with _lock:
+        _stats["media_hits" if hit else "media_misses"] += 1
+    return {"media_path": media_path, "metadata": metadata} if hit else None
+
+
+def store_media_selection(fingerprint: str, media_path: str, metadata: Optional[dict] = None,
+                          draft: bool = False) -> None:
+    if not scene_cache_enabled() or not media_path:
+        return
+    os.makedirs(_media_dir(), exist_ok=True)
+    path = os.path.join(_media_dir(), f"{fingerprint}.json")
+    temp_path = f"{path}.{threading.get_ident()}.part"
+    previous = _read_media_selection(fingerprint) or {}
+    renditions = previous.get("renditions", {})
+    renditions["draft" if draft else "full"] = media_path
+    try:
+        with open(temp_path, "w", encoding='utf-8') as f:
+            json.dump({"renditions": renditions, "metadata": metadata or previous.get("metadata") or {}},
+                      f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except (OSError, TypeError) as e:
+        print(f"    Warning: 장면 미디어 캐시 저장 실패: {e}")
+
+
+# ---------------------------------------------------------------------------
+# 렌더링 세그먼트 캐시
+# ---------------------------------------------------------------------------
+
+def segment_fingerprint(scene: dict, overlay_path: Optional[str], render_settings: dict) -> str:
+    """
+    장면 세그먼트 지문: 자막 이미지(텍스트+스타일 내용 해시), 미디어 파일, 길이, 전환 효과,
+    렌더링 설정(해상도/fps/코덱/자막 위치 등). 오디오는 릴스 전체를 따로 믹싱하므로 포함하지 않습니다.
+    """
+    return _fingerprint({
+        "kind": "segment",
+        "overlay": os.path.basename(overlay_path) if overlay_path else None,
+        "media": file_identity(scene.get('media_path')),
+        "normalized": bool(scene.get('normalized')),
+        "duration": round(scene.get('duration', 5), 4),
+        "transition": scene.get('transition', 'cut'),
+        "render": render_settings,
+    })
+
+
+def segment_path(fingerprint: str) -> str:
+    os.makedirs(_segment_dir(), exist_ok=True)
+    return os.path.join(_segment_dir(), f"scene_{fingerprint}.mkv")
+
+
+def lookup_segment(fingerprint: str) -> Optional[str]:
+    """캐시된 세그먼트 경로 (없으면 None). 사용 시각을 갱신해 LRU 정리 대상에서 뒤로 보냅니다."""
+    path = os.path.join(_segment_dir(), f"scene_{fingerprint}.mkv")
+    hit = os.path.exists(path)
+    with _lock:
+        _stats["segment_hits" if hit else "segment_misses"] += 1
+    if not hit:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return path
+
+
+def evict_segments(max_mb: Optional[float] = None) -> None:
+    """세그먼트 캐시 용량이 max_mb를 넘으면 가장 오래 사용하지 않은 세그먼트부터 삭제합니다."""
+    max_bytes = (max_mb or getattr(config, 'SEGMENT_CACHE_MAX_MB', 2000)) * 1024 * 1024
+    try:
+        entries = [entry for entry in os.scandir(_segment_dir()) if entry.name.endswith(".mkv")]
+    except OSError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    total = sum(entry.stat().st_size for entry in entries)
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        try:
+            size = entry.stat().st_size
+            os.remove(entry.path)
+            total -= size
+        except OSError:
+            pass
+
+
+def get_scene_cache_stats() -> dict:
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,31 @@
+# align_narrations 결과 순서 테스트 (edge-tts / whisper / torch 필요)
+import json
+
+import pytest
+
+pytest.importorskip("edge_tts")
+pytest.importorskip("whisper")
+pytest.importorskip("torch")
+
+import tts_generator
+
+
+def test_result_matches_input_order_with_cached_clips(tmp_path, monkeypatch):
+    paths = [str(tmp_path / f"narration_{i}.mp3") for i in range(3)]
+    cached = [{"word": "캐시", "start": 0.0, "end": 0.4, "duration": 0.4}]
+    with open(paths[1].replace(".mp3", ".json"), "w", encoding="utf-8") as f:
+        json.dump(cached, f)
+
+    monkeypatch.setattr(tts_generator, "_use_forced_alignment", lambda: False)
+    monkeypatch.setattr(tts_generator.narration_cache, "has_timings", lambda path: path == paths[1])
+    monkeypatch.setattr(tts_generator.narration_cache, "store_timings", lambda path, timings: None)
+    monkeypatch.setattr(tts_generator, "extract_timings_batched",
+                        lambda batch: [[{"word": path, "start": 0.0, "end": 1.0, "duration": 1.0}] for path in batch])
+
+    timings = tts_generator.align_narrations([paths[0], paths[1], None, paths[2]])
+
+    assert len(timings) == 4
+    assert timings[0][0]["word"] == paths[0]
+    assert timings[1] == cached
+    assert timings[2] == []
+    assert timings[3][0]["word"] == paths[2]
@@ -0,0 +1,56 @@
+# 인제스트 변환본 조회 테스트 (ffmpeg 필요: 시스템 ffmpeg 또는 imageio-ffmpeg)
+import os
+import subprocess
+from concurrent.futures import wait
+
+import pytest
+
+import config
+import media_normalizer
+from ffmpeg_renderer import get_ffmpeg_binary
+
+pytestmark = pytest.mark.skipif(not get_ffmpeg_binary(), reason="ffmpeg 없음")
+
+
+@pytest.fixture
+def small_format(monkeypatch):
+    # 변환 시간을 줄이기 위해 작은 출력 규격 사용
+    monkeypatch.setattr(config, "REELS_WIDTH", 90)
+    monkeypatch.setattr(config, "REELS_HEIGHT", 160)
+    monkeypatch.setattr(config, "REELS_FPS", 10)
+    monkeypatch.setattr(config, "INGEST_NORMALIZE_ENABLED", True)
+    monkeypatch.setattr(config, "INGEST_TRIM_MARGIN_SECONDS", 1.0)
+
+
+def make_source(path, seconds=10):
+    subprocess.run([get_ffmpeg_binary(), "-y", "-loglevel", "error", "-f", "lavfi",
+                    "-i", f"testsrc=size=160x120:rate=10:duration={seconds}", "-pix_fmt", "yuv420p", str(path)],
+                   check=True)
+    return str(path)
+
+
+def test_rescaled_scenes_find_mezzanine_scheduled_before_rescale(tmp_path, small_format):
+    # 다운로드 시점(main.py)에는 대본의 정수 장면 길이로 변환을 예약
+    scenes = [{"media_path": make_source(tmp_path / f"clip{i}.mp4"), "duration": d}
+              for i, d in enumerate([7, 6, 8, 5])]
+    futures = [media_normalizer.schedule_normalization(s["media_path"], s["duration"]) for s in scenes]
+    wait(futures)
+
+    # assemble_reel과 같은 방식으로 총 길이(20s)에 맞춰 장면 길이를 줄인 뒤 조회
+    final_duration = 20
+    ratio = final_duration / sum(s["duration"] for s in scenes)
+    for scene in scenes:
+        scene["duration"] *= ratio
+
+    for scene, future in zip(scenes, futures):
+        normalized = media_normalizer.get_normalized_clip(scene["media_path"], scene["duration"])
+        assert normalized == future.result()
+        assert os.path.exists(normalized)
+
+
+def test_shorter_mezzanine_is_not_used_for_longer_scene(tmp_path, small_format):
+    source = make_source(tmp_path / "clip.mp4")
+    wait([media_normalizer.schedule_normalization(source, 3)])
+
+    assert media_normalizer.get_normalized_clip(source, 3) is not None
+    assert media_normalizer.get_normalized_clip(source, 6) is None
@@ -0,0 +1,34 @@
+# 로컬 사전 판정 테스트
+import pytest
+
+import config
+import media_prefilter
+
+KEYWORDS = ["pills", "medicine bottle", "pharmacy"]
+DESCRIPTION = "Close up of a hand taking pills from a medicine bottle"
+OFF_TOPIC = {"video_id": 4, "tags": ["beach", "ocean", "waves", "sunset"],
+             "url": "https://www.pexels.com/video/waves-crashing-on-beach-1093662/"}
+
+
+@pytest.fixture(autouse=True)
+def local_corpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_prefilter.corpus, "path", str(tmp_path / "corpus.json"))
+    monkeypatch.setattr(config, "PREFILTER_REJECT_SCORE", 0.05)
+
+
+def verdict(query, tried_keywords=None):
+    item = {"keywords": KEYWORDS, "description": DESCRIPTION, "media_type": "video",
+            "media_metadata": {**OFF_TOPIC, "query": query}}
+    if tried_keywords is not None:
+        item["tried_keywords"] = tried_keywords
+    return media_prefilter.prefilter_verdict(item)
+
+
+def test_reject_suggests_keyword_not_tried_in_earlier_rounds():
+    # 1라운드 "pills" 반려 -> 2라운드 "medicine bottle"도 반려: "pills"를 다시 제안하면 안 됨
+    assert verdict("pills", {"pills"}) == (False, "medicine bottle")
+    assert verdict("medicine bottle", {"pills", "medicine bottle"}) == (False, "pharmacy")
+
+
+def test_no_local_reject_when_every_keyword_was_tried():
+    assert verdict("pharmacy", {"pills", "medicine bottle", "pharmacy"}) is None
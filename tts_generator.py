@@ -9,8 +9,93 @@ import asyncio
 import config
 
 import json
+import glob
+import hashlib
+import shutil
+import threading
+import time
+import numpy as np
 import whisper
 import torch
+from forced_aligner import align_text_to_audio
+from audio_probe import get_audio_duration
+
+# --- Whisper 모델 풀 ---
+# (모델 크기, 디바이스)별로 프로세스당 1회만 로드하고 이후 호출에서는 재사용합니다.
+_whisper_models = {}
+_whisper_models_lock = threading.Lock() # 풀과 _whisper_stats 갱신을 함께 보호
+# Whisper/torch 모델은 동시 추론에 안전하지 않으므로 공유 모델의 전사는 한 번에 하나씩만 실행
+_whisper_transcribe_lock = threading.Lock()
+_whisper_stats = {"loads": 0, "load_seconds": 0.0, "transcribes": 0, "transcribe_seconds": 0.0}
+
+def _resolve_whisper_device(device: Optional[str] = None) -> str:
+    if device:
+        return device
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def get_whisper_model(model_size: Optional[str] = None, device: Optional[str] = None):
+    """
+    프로세스 전역 풀에서 Whisper 모델을 가져옵니다. 풀에 없으면 로드 후 등록합니다.
+    (최초 1회만 다운로드됨, base 모델 ~140MB)
+    """
+    model_size = model_size or getattr(config, 'WHISPER_MODEL_SIZE', "base")
+    device = _resolve_whisper_device(device)
+    key = (model_size, device)
+
+    with _whisper_models_lock:
+        model = _whisper_models.get(key)
+        if model is None:
+            start = time.perf_counter()
+            model = whisper.load_model(model_size, device=device)
+            elapsed = time.perf_counter() - start
+            _whisper_models[key] = model
+            _whisper_stats["loads"] += 1
+            _whisper_stats["load_seconds"] += elapsed
+            print(f"    Whisper 모델 로드 완료 ({model_size}, {device}): {elapsed:.2f}s")
+    return model
+
+def warmup_whisper_model(model_size: Optional[str] = None, device: Optional[str] = None,
+                         background: bool = True) -> Optional[threading.Thread]:
+    """
+    Whisper 모델을 미리 로드해 둡니다. background=True면 데몬 스레드에서 로드하고 스레드를 반환합니다.
+    """
+    def _load():
+        try:
+            get_whisper_model(model_size, device)
+        except Exception as e:
+            print(f"    Warning: Whisper 모델 사전 로드 실패: {e}")
+
+    if not background:
+        _load()
+        return None
+
+    thread = threading.Thread(target=_load, name="whisper-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def get_whisper_stats() -> dict:
+    """모델 로드/전사 누적 횟수와 시간(초)을 반환합니다."""
+    with _whisper_models_lock:
+        return dict(_whisper_stats)
+
+def _transcribe(model, audio) -> tuple:
+    """
+    공유 모델로 전사합니다. (정렬 스레드/미리 준비 작업 등 여러 스레드에서 불려도 순서대로 실행)
+    Returns: (transcribe 결과, 전사 소요 시간(초) - 대기 시간 제외)
+    """
+    with _whisper_transcribe_lock:
+        start = time.perf_counter()
+        result = model.transcribe(
+            audio,
+            language="ko",  # 한국어 지정
+            word_timestamps=True,  # 단어별 타이밍 활성화
+            verbose=False
+        )
+        elapsed = time.perf_counter() - start
+    with _whisper_models_lock:
+        _whisper_stats["transcribes"] += 1
+        _whisper_stats["transcribe_seconds"] += elapsed
+    return result, elapsed
 
 def extract_timing_with_whisper(audio_path: str) -> list:
     """
@@ -25,67 +110,348 @@ def extract_timing_with_whisper(audio_path: str) -> list:
     try:
         print("    Whisper로 타이밍 데이터 추출 중...")
         
-        # Whisper 모델 로드 (base 모델 사용, 빠르고 정확도 충분)
-        # 최초 1회만 다운로드됨 (~140MB)
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        model = whisper.load_model("base", device=device)
+        # 풀에서 모델 가져오기 (최초 호출 시에만 실제 로드 발생)
+        load_start = time.perf_counter()
+        model = get_whisper_model()
+        load_elapsed = time.perf_counter() - load_start
         
         # 음성 인식 (word_timestamps=True로 단어별 타이밍 활성화)
-        result = model.transcribe(
-            audio_path,
-            language="ko",  # 한국어 지정
-            word_timestamps=True,
-            verbose=False
-        )
+        result, transcribe_elapsed = _transcribe(model, audio_path)
+        print(f"    Whisper 소요 시간: 모델 준비 {load_elapsed:.2f}s / 전사 {transcribe_elapsed:.2f}s")
         
         # 타이밍 데이터 추출
-        word_timings = []
-        for segment in result.get("segments", []):
-            for word_info in segment.get("words", []):
-                word_timings.append({
-                    "word": word_info["word"].strip(),
-                    "start": word_info["start"],
-                    "end": word_info["end"],
-                    "duration": word_info["end"] - word_info["start"]
-                })
-        
-        return word_timings
+        return _parse_word_timings(result)
         
     except Exception as e:
         print(f"    Warning: Whisper 타이밍 추출 실패: {e}")
         return []
 
+def _parse_word_timings(result: dict) -> list:
+    """Whisper transcribe 결과에서 [{word, start, end, duration}] 목록을 만듭니다."""
+    word_timings = []
+    for segment in result.get("segments", []):
+        for word_info in segment.get("words", []):
+            word_timings.append({
+                "word": word_info["word"].strip(),
+                "start": word_info["start"],
+                "end": word_info["end"],
+                "duration": word_info["end"] - word_info["start"]
+            })
+    return word_timings
+
+# 릴스 단위 일괄 정렬 시 클립 사이에 넣는 무음 길이 (경계 단어가 섞이지 않도록)
+REEL_ALIGN_GAP_SECONDS = 0.6
+
+def extract_timings_batched(audio_paths: list) -> list:
+    """
+    릴스의 모든 나레이션 클립을 하나의 버퍼로 이어 붙여 Whisper를 1회만 실행하고,
+    단어 타이밍을 클립별로 다시 나눠 반환합니다.
+
+    Returns:
+        List[list]: audio_paths와 같은 순서의 클립별 단어 타이밍 목록 (실패한 클립은 빈 리스트)
+    """
+    if not audio_paths:
+        return []
+
+    try:
+        print(f"    Whisper 일괄 정렬 중... (클립 {len(audio_paths)}개)")
+        load_start = time.perf_counter()
+        model = get_whisper_model()
+        load_elapsed = time.perf_counter() - load_start
+
+        sample_rate = whisper.audio.SAMPLE_RATE
+        gap = np.zeros(int(REEL_ALIGN_GAP_SECONDS * sample_rate), dtype=np.float32)
+
+        # 클립을 이어 붙이며 각 클립의 (시작, 끝) 오프셋(초)을 기록
+        buffers = []
+        offsets = []
+        cursor = 0
+        for path in audio_paths:
+            audio = whisper.load_audio(path)
+            offsets.append((cursor / sample_rate, (cursor + len(audio)) / sample_rate))
+            buffers.append(audio)
+            buffers.append(gap)
+            cursor += len(audio) + len(gap)
+        reel_audio = np.concatenate(buffers)
+
+        result, transcribe_elapsed = _transcribe(model, reel_audio)
+        print(f"    Whisper 소요 시간: 모델 준비 {load_elapsed:.2f}s / 일괄 전사 {transcribe_elapsed:.2f}s")
+
+        return _split_word_timings(_parse_word_timings(result), offsets)
+
+    except Exception as e:
+        print(f"    Warning: Whisper 일괄 타이밍 추출 실패: {e}")
+        return [[] for _ in audio_paths]
+
+def _split_word_timings(word_timings: list, offsets: list) -> list:
+    """
+    릴스 전체 기준 단어 타이밍을 클립별 상대 타이밍으로 나눕니다.
+    단어의 중간 지점이 속한 클립(앞뒤 무음 절반 포함)에 배정합니다.
+    """
+    half_gap = REEL_ALIGN_GAP_SECONDS / 2
+    per_clip = [[] for _ in offsets]
+    for timing in word_timings:
+        mid = (timing["start"] + timing["end"]) / 2
+        for idx, (clip_start, clip_end) in enumerate(offsets):
+            if clip_start - half_gap <= mid < clip_end + half_gap:
+                clip_duration = clip_end - clip_start
+                start = min(max(timing["start"] - clip_start, 0.0), clip_duration)
+                end = min(max(timing["end"] - clip_start, start), clip_duration)
+                per_clip[idx].append({
+                    "word": timing["word"],
+                    "start": start,
+                    "end": end,
+                    "duration": end - start
+                })
+                break
+    return per_clip
+
+def extract_timing_with_forced_alignment(text: str, audio_path: str) -> list:
+    """
+    대본 텍스트를 오디오에 강제 정렬하여 단어별 타이밍을 추출합니다.
+    신뢰도가 FORCED_ALIGN_MIN_CONFIDENCE 미만이거나 실패하면 빈 리스트를 반환합니다.
+    """
+    try:
+        start = time.perf_counter()
+        word_timings, confidence = align_text_to_audio(text, audio_path)
+        elapsed = time.perf_counter() - start
+        min_confidence = getattr(config, 'FORCED_ALIGN_MIN_CONFIDENCE', 0.6)
+        if word_timings and confidence >= min_confidence:
+            print(f"    강제 정렬 완료: {elapsed:.3f}s (신뢰도 {confidence:.2f})")
+            return word_timings
+        print(f"    강제 정렬 신뢰도 낮음 ({confidence:.2f} < {min_confidence}), Whisper로 폴백")
+    except Exception as e:
+        print(f"    Warning: 강제 정렬 실패: {e}")
+    return []
+
+def _use_forced_alignment() -> bool:
+    return getattr(config, 'TIMING_ENGINE', "whisper") == "forced"
+
+def _save_word_timings(audio_path: str, word_timings: list) -> None:
+    """단어 타이밍을 오디오 파일 옆 .json 파일로 저장합니다."""
+    json_filename = audio_path.replace(".mp3", ".json")
+    with open(json_filename, "w", encoding='utf-8') as f:
+        json.dump(word_timings, f, ensure_ascii=False, indent=2)
+    print(f"    ✅ 타이밍 정보 저장 완료: {json_filename} ({len(word_timings)}개 단어)")
+    narration_cache.store_timings(audio_path, word_timings)
+
+def _load_word_timings(audio_path: str) -> list:
+    """오디오 파일 옆 .json에 저장된 단어 타이밍 (없거나 읽을 수 없으면 빈 리스트)"""
+    try:
+        with open(audio_path.replace(".mp3", ".json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def align_narrations(audio_paths: list, texts: Optional[list] = None) -> list:
+    """
+    여러 나레이션 클립의 타이밍을 추출해 클립별 .json으로 저장합니다.
+    texts가 주어지면 강제 정렬을 먼저 시도하고, 신뢰도가 낮은 클립만 모아 한 번의 Whisper 실행으로 처리합니다.
+    일괄 정렬에서 단어를 하나도 얻지 못한 클립은 개별 Whisper 실행으로 재시도합니다.
+    Returns: audio_paths와 같은 순서·개수의 클립별 단어 타이밍 (캐시된 클립은 저장된 타이밍, 경로 없음/실패는 빈 리스트)
+    """
+    all_timings = [[] for _ in audio_paths]
+    # 캐시에서 타이밍까지 복원된 클립은 다시 정렬하지 않고 저장된 타이밍을 읽음
+    targets = []
+    for idx, path in enumerate(audio_paths):
+        if not path:
+            continue
+        if narration_cache.has_timings(path):
+            all_timings[idx] = _load_word_timings(path)
+        else:
+            targets.append(idx)
+
+    if texts and _use_forced_alignment():
+        for idx in targets:
+            if texts[idx]:
+                all_timings[idx] = extract_timing_with_forced_alignment(texts[idx], audio_paths[idx])
+
+    pending = [idx for idx in targets if not all_timings[idx]]
+    if pending:
+        batched = extract_timings_batched([audio_paths[idx] for idx in pending])
+        for idx, word_timings in zip(pending, batched):
+            all_timings[idx] = word_timings
+
+    for idx in targets:
+        path = audio_paths[idx]
+        if not all_timings[idx] and idx in pending:
+            print(f"    ⚠️ 일괄 정렬 결과 없음, 개별 추출 재시도: {os.path.basename(path)}")
+            all_timings[idx] = extract_timing_with_whisper(path)
+        if all_timings[idx]:
+            _save_word_timings(path, all_timings[idx])
+        else:
+            print("    ⚠️ Whisper 타이밍 추출 실패, 기존 방식(글자수 비례) 사용")
+    return all_timings
+
+# --- 나레이션 캐시 ---
+# (텍스트, 보이스, 속도) 해시를 키로 MP3, 단어 타이밍 JSON, 오디오 길이를 디스크에 보관합니다.
+# 용량이 NARRATION_CACHE_MAX_MB를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다. (LRU)
+class NarrationCache:
+    """
+    동일한 나레이션(CTA, 재렌더링, 배치 재실행)을 edge-tts/Whisper 없이 즉시 돌려주는 디스크 캐시입니다.
+    항목 구성: <key>.mp3, <key>.json(단어 타이밍, 선택), <key>.meta.json(길이 등)
+    """
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # 출력 경로 -> (캐시 키, 길이). 나중에 저장되는 타이밍을 같은 항목에 연결하기 위함
+        self._entries_by_path = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, voice: str, rate: str) -> str:
+        return hashlib.sha256(f"{voice}\n{rate}\n{text}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def restore(self, text: str, voice: str, rate: str, output_path: str) -> Optional[dict]:
+        """
+        캐시 적중 시 MP3(와 타이밍 JSON)를 output_path로 복사하고 메타데이터를 반환합니다.
+        반환값의 "has_timings"로 타이밍 JSON까지 복원되었는지 알 수 있습니다.
+        """
+        key = self.make_key(text, voice, rate)
+        meta_path = self._path(key, ".meta.json")
+        audio_path = self._path(key, ".mp3")
+        if not (os.path.exists(meta_path) and os.path.exists(audio_path)):
+            self.misses += 1
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            shutil.copyfile(audio_path, output_path)
+            timings_path = self._path(key, ".json")
+            meta["has_timings"] = os.path.exists(timings_path)
+            if meta["has_timings"]:
+                shutil.copyfile(timings_path, output_path.replace(".mp3", ".json"))
+            os.utime(meta_path) # LRU 사용 시각 갱신
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"    Warning: 나레이션 캐시 복원 실패 ({key[:12]}): {e}")
+            self.misses += 1
+            return None
+
+        with self._lock:
+            self._entries_by_path[output_path] = (key, meta.get("duration"))
+            self.hits += 1
+        return meta
+
+    def store(self, text: str, voice: str, rate: str, audio_path: str, duration: Optional[float]) -> None:
+        """새로 합성한 MP3와 길이를 캐시에 저장합니다. 타이밍은 store_timings로 따로 추가됩니다."""
+        key = self.make_key(text, voice, rate)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            shutil.copyfile(audio_path, self._path(key, ".mp3"))
+            meta = {"voice": voice, "rate": rate, "text": text, "duration": duration, "created": time.time()}
+            with open(self._path(key, ".meta.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"    Warning: 나레이션 캐시 저장 실패 ({key[:12]}): {e}")
+            return
+
+        with self._lock:
+            self._entries_by_path[audio_path] = (key, duration)
+        self.evict()
+
+    def store_timings(self, audio_path: str, word_timings: list) -> None:
+        """audio_path에 연결된 캐시 항목에 단어 타이밍을 추가합니다."""
+        entry = self._entries_by_path.get(audio_path)
+        if not entry or not os.path.exists(self._path(entry[0], ".meta.json")):
+            return
+        try:
+            with open(self._path(entry[0], ".json"), 'w', encoding='utf-8') as f:
+                json.dump(word_timings, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"    Warning: 나레이션 캐시 타이밍 저장 실패: {e}")
+
+    def has_timings(self, audio_path: str) -> bool:
+        entry = self._entries_by_path.get(audio_path)
+        return bool(entry) and os.path.exists(self._path(entry[0], ".json"))
+
+    def get_duration(self, audio_path: str) -> Optional[float]:
+        entry = self._entries_by_path.get(audio_path)
+        return entry[1] if entry else None
+
+    def evict(self) -> None:
+        """캐시 전체 용량이 max_bytes 이하가 될 때까지 가장 오래 사용하지 않은 항목을 삭제합니다."""
+        with self._lock:
+            entries = []
+            total = 0
+            for meta_path in glob.glob(os.path.join(self.cache_dir, "*.meta.json")):
+                key = os.path.basename(meta_path)[:-len(".meta.json")]
+                files = [self._path(key, suffix) for suffix in (".mp3", ".json", ".meta.json")]
+                size = sum(os.path.getsize(f) for f in files if os.path.exists(f))
+                entries.append((os.path.getmtime(meta_path), size, files))
+                total += size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            removed = 0
+            for _, size, files in entries:
+                if total <= self.max_bytes:
+                    break
+                for f in files:
+                    if os.path.exists(f):
+                        os.remove(f)
+                total -= size
+                removed += 1
+            print(f"    나레이션 캐시 정리: {removed}개 항목 삭제 (현재 {total / 1024 / 1024:.1f}MB)")
+
+narration_cache = NarrationCache(
+    getattr(config, 'NARRATION_CACHE_DIR', os.path.join("assets", "cache", "narration")),
+    int(getattr(config, 'NARRATION_CACHE_MAX_MB', 500) * 1024 * 1024)
+)
+
+def _narration_cache_enabled() -> bool:
+    return getattr(config, 'NARRATION_CACHE_ENABLED', True)
+
+def _cache_narration(text: str, voice: str, rate: str, audio_path: str) -> None:
+    if _narration_cache_enabled():
+        narration_cache.store(text, voice, rate, audio_path, get_audio_duration(audio_path))
+
+def get_narration_duration(audio_path: str) -> Optional[float]:
+    """나레이션 캐시에 기록된 오디오 길이(초)를 반환합니다. 모르면 None."""
+    return narration_cache.get_duration(audio_path)
+
 async def _generate_audio_async(text: str, filename: str, voice: str, rate: str) -> None:
     """
     edge-tts를 사용하여 오디오 파일과 타이밍 정보(JSON)를 생성합니다.
+    오디오 청크는 메모리에 모으지 않고 디스크에 바로 기록합니다.
     """
     communicate = edge_tts.Communicate(text, voice, rate=rate)
     
     # 2. 스트림 처리 및 메타데이터 수집
-    audio_data = bytearray()
     word_timings = [] # List of {word, start, end}
     
-    # WordBoundary 이벤트는 없을 수도 있음 (언어/보이스에 따라 다름).
-    # 없을 경우 문장 단위라도 최대한 매칭.
-    async for chunk in communicate.stream():
-        if chunk["type"] == "audio":
-            audio_data.extend(chunk["data"])
-        elif chunk["type"] == "WordBoundary":
-            # WordBoundary: {'offset': 1230000, 'duration': 500000, 'text': 'Hello'} (nano-seconds/100ns units usually)
-            # Edge-TTS offset/duration is in 100ns units (0.1 microseconds).
-            # Convert to seconds: value / 10,000,000
-            start_sec = chunk["offset"] / 10_000_000
-            end_sec = (chunk["offset"] + chunk["duration"]) / 10_000_000
-            word_timings.append({
-                "word": chunk["text"],
-                "start": start_sec,
-                "end": end_sec,
-                "duration": end_sec - start_sec
-            })
-
-    # 오디오 파일 저장
-    with open(filename, "wb") as f:
-        f.write(audio_data)
+    # 스트리밍 중에는 임시 파일에 기록하고, 완료되면 원자적으로 교체 (중단 시 깨진 mp3 방지)
+    partial_filename = filename + ".part"
+    try:
+        with open(partial_filename, "wb") as audio_file:
+            # WordBoundary 이벤트는 없을 수도 있음 (언어/보이스에 따라 다름).
+            # 없을 경우 문장 단위라도 최대한 매칭.
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio_file.write(chunk["data"])
+                elif chunk["type"] == "WordBoundary":
+                    # WordBoundary: {'offset': 1230000, 'duration': 500000, 'text': 'Hello'} (nano-seconds/100ns units usually)
+                    # Edge-TTS offset/duration is in 100ns units (0.1 microseconds).
+                    # Convert to seconds: value / 10,000,000
+                    start_sec = chunk["offset"] / 10_000_000
+                    end_sec = (chunk["offset"] + chunk["duration"]) / 10_000_000
+                    word_timings.append({
+                        "word": chunk["text"],
+                        "start": start_sec,
+                        "end": end_sec,
+                        "duration": end_sec - start_sec
+                    })
+        os.replace(partial_filename, filename)
+    finally:
+        if os.path.exists(partial_filename):
+            os.remove(partial_filename)
 
     # 타이밍 정보 저장 (.json)
     if word_timings:
@@ -96,10 +462,44 @@ async def _generate_audio_async(text: str, filename: str, voice: str, rate: str)
     else:
         print("Info: WordBoundary 이벤트가 반환되지 않았습니다. (타이밍 정보 없음)")
 
-def create_narration(text: str, output_path: str) -> Optional[str]:
+async def _generate_audios_async(jobs: list, voice: str, rate: str, max_concurrency: int) -> list:
+    """
+    하나의 이벤트 루프에서 여러 나레이션을 동시에 합성합니다. (동시 실행 수는 max_concurrency로 제한)
+    실패한 항목은 None으로 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _run(text: str, path: str) -> Optional[str]:
+        async with semaphore:
+            try:
+                await _generate_audio_async(text, path, voice, rate)
+                print(f"나레이션 생성 완료 (edge-tts): {path}")
+                return path
+            except Exception as e:
+                print(f"Error creating narration with edge-tts ({os.path.basename(path)}): {e}")
+                return None
+
+    return await asyncio.gather(*(_run(text, path) for text, path in jobs))
+
+def _extract_and_save_timings(text: str, audio_path: str) -> None:
+    """대본 강제 정렬로 타이밍을 추출하고, 신뢰도가 낮으면 Whisper로 폴백하여 .json으로 저장합니다."""
+    word_timings = []
+    if _use_forced_alignment():
+        word_timings = extract_timing_with_forced_alignment(text, audio_path)
+    if not word_timings:
+        word_timings = extract_timing_with_whisper(audio_path)
+    
+    if word_timings:
+        # JSON 파일로 저장
+        _save_word_timings(audio_path, word_timings)
+    else:
+        print("    ⚠️ Whisper 타이밍 추출 실패, 기존 방식(글자수 비례) 사용")
+
+def create_narration(text: str, output_path: str, extract_timing: bool = True) -> Optional[str]:
     """
     텍스트를 입력받아 MP3 파일로 저장하고 경로를 반환합니다.
     (gTTS 대신 고품질 edge-tts 사용)
+    extract_timing=False면 Whisper 타이밍 추출을 건너뜁니다. (align_narrations로 일괄 처리할 때)
     """
     try:
         # 출력 디렉토리가 없으면 생성
@@ -112,28 +512,96 @@ def create_narration(text: str, output_path: str) -> Optional[str]:
         # ko-KR-SunHiNeural은 지원한다고 알려져 있음.
         voice = getattr(config, 'TTS_VOICE', "ko-KR-SunHiNeural")
         rate = getattr(config, 'TTS_RATE', "+0%")
+
+        # 같은 (텍스트, 보이스, 속도)로 만든 나레이션이 있으면 캐시에서 바로 복원
+        cached = narration_cache.restore(text, voice, rate, output_path) if _narration_cache_enabled() else None
+        if cached:
+            print(f"나레이션 캐시 적중: {output_path}")
+            if extract_timing and not cached["has_timings"]:
+                _extract_and_save_timings(text, output_path)
+            return output_path
         
         asyncio.run(_generate_audio_async(text, output_path, voice, rate))
         print(f"나레이션 생성 완료 (edge-tts): {output_path}")
+        _cache_narration(text, voice, rate, output_path)
         
-        # Whisper로 타이밍 추출 (새로 추가)
-        word_timings = extract_timing_with_whisper(output_path)
-        
-        if word_timings:
-            # JSON 파일로 저장
-            json_filename = output_path.replace(".mp3", ".json")
-            with open(json_filename, "w", encoding='utf-8') as f:
-                json.dump(word_timings, f, ensure_ascii=False, indent=2)
-            print(f"    ✅ Whisper 타이밍 정보 저장 완료: {json_filename} ({len(word_timings)}개 단어)")
-        else:
-            print("    ⚠️ Whisper 타이밍 추출 실패, 기존 방식(글자수 비례) 사용")
-        
+        if not extract_timing:
+            return output_path
+
+        _extract_and_save_timings(text, output_path)
         return output_path
     
     except Exception as e:
         print(f"Error creating narration with edge-tts: {e}")
         return None
 
+def create_narrations(items: list, extract_timing: bool = True, max_concurrency: Optional[int] = None) -> list:
+    """
+    여러 나레이션을 하나의 이벤트 루프에서 동시에 생성합니다.
+    (장면별로 asyncio.run을 반복하지 않으므로 전체 시간이 가장 긴 클립 수준으로 줄어듭니다)
+
+    Args:
+        items: [(text, output_path), ...]
+        extract_timing: True면 합성 후 단어 타이밍 .json까지 생성
+                        (WHISPER_ALIGN_MODE가 "reel"이면 align_narrations로 일괄 처리)
+        max_concurrency: 동시 합성 수 (기본값: config.TTS_MAX_CONCURRENCY)
+
+    Returns:
+        List[Optional[str]]: items와 같은 순서의 생성된 파일 경로 (실패 시 None)
+    """
+    if not items:
+        return []
+
+    for _, output_path in items:
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    voice = getattr(config, 'TTS_VOICE', "ko-KR-SunHiNeural")
+    rate = getattr(config, 'TTS_RATE', "+0%")
+    if max_concurrency is None:
+        max_concurrency = getattr(config, 'TTS_MAX_CONCURRENCY', 6)
+
+    # 캐시 적중 항목은 복원만 하고, 나머지만 합성
+    results = [None] * len(items)
+    needs_timing = []
+    misses = []
+    for idx, (text, output_path) in enumerate(items):
+        cached = narration_cache.restore(text, voice, rate, output_path) if _narration_cache_enabled() else None
+        if cached:
+            results[idx] = output_path
+            if not cached["has_timings"]:
+                needs_timing.append(idx)
+        else:
+            misses.append(idx)
+    if len(misses) < len(items):
+        print(f"나레이션 캐시 적중: {len(items) - len(misses)}/{len(items)}개")
+
+    if misses:
+        start = time.perf_counter()
+        try:
+            synthesized = asyncio.run(_generate_audios_async([items[idx] for idx in misses], voice, rate, max_concurrency))
+        except Exception as e:
+            print(f"Error creating narrations with edge-tts: {e}")
+            synthesized = [None] * len(misses)
+        print(f"나레이션 {sum(1 for r in synthesized if r)}/{len(misses)}개 동시 생성 완료: {time.perf_counter() - start:.2f}s")
+
+        for idx, path in zip(misses, synthesized):
+            results[idx] = path
+            if path:
+                _cache_narration(items[idx][0], voice, rate, path)
+                needs_timing.append(idx)
+
+    if extract_timing:
+        done = [(items[idx][0], results[idx]) for idx in sorted(needs_timing)]
+        if getattr(config, 'WHISPER_ALIGN_MODE', "reel") == "reel":
+            align_narrations([path for _, path in done], texts=[text for text, _ in done])
+        else:
+            for text, path in done:
+                _extract_and_save_timings(text, path)
+
+    return results
+
 if __name__ == "__main__":
     # 테스트를 위한 임시 출력 디렉토리 생성
     test_output_dir = "temp_narration_audio"
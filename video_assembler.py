@@ -6,12 +6,16 @@ from PIL import Image, ImageDraw, ImageFont
 if not hasattr(Image, 'ANTIALIAS'):
     Image.ANTIALIAS = Image.LANCZOS
 
-from moviepy.editor import VideoFileClip, ImageClip, ColorClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip, CompositeAudioClip, vfx, afx
+from moviepy.editor import VideoFileClip, VideoClip, ImageClip, ColorClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip, CompositeAudioClip, vfx, afx
 import os
 import math
 import random
 import glob
 import uuid # For unique filenames
+import json
+import hashlib
+import threading
+import functools
 import numpy as np
 import sys
 import traceback
@@ -20,20 +24,113 @@ import moviepy
 import config
 from typing import List, Optional
 from sfx_downloader import download_sfx
+from audio_probe import get_audio_duration
+from ffmpeg_renderer import (render_reel_ffmpeg, render_reel_segments, quantize_scene_durations,
+                             get_encoder_profile, encoder_quality_args, get_render_format)
+from audio_mixer import mix_reel_audio
+from media_normalizer import get_normalized_clip
 
 # 릴스 표준 해상도 (9:16 비율) - config에서 로드
 REELS_ASPECT_RATIO = config.REELS_WIDTH / config.REELS_HEIGHT
 
+# Ken Burns 프레임 샘플링 품질 (속도 <-> 화질)
+KEN_BURNS_RESAMPLE = {
+    "high": Image.LANCZOS,
+    "fast": Image.BILINEAR,
+    "draft": Image.NEAREST,
+}
+
+class KenBurnsRenderer:
+    """
+    Ken Burns(줌/팬) 프레임 생성기.
+
+    원본 이미지는 최대 줌 구간에서도 출력 해상도를 채울 만큼만 한 번 축소해 두고
+    (JPEG는 디코딩 단계에서 축소), 프레임마다 잘라내기와 리사이즈를 한 번의 affine(확대+이동) 샘플링으로 처리합니다.
+    """
+    def __init__(self, image_path: str, duration: float, target_resolution: tuple,
+                 start_zoom: float = 1.0, end_zoom: float = 1.2,
+                 start_x_rel: float = 0.5, start_y_rel: float = 0.5,
+                 end_x_rel: float = 0.5, end_y_rel: float = 0.5,
+                 quality: Optional[str] = None):
+        img = Image.open(image_path)
+        img_width, img_height = img.size
+        self.duration = duration
+        self.target_resolution = target_resolution
+        quality = quality or getattr(config, 'KEN_BURNS_QUALITY', "high")
+        self.resample = KEN_BURNS_RESAMPLE.get(quality, Image.LANCZOS)
+
+        # Calculate initial and final viewport sizes based on zoom levels
+        # Viewport size = original size / zoom (larger zoom means smaller viewport = zoomed in)
+        start_viewport_width = img_width / start_zoom
+        end_viewport_width = img_width / end_zoom
+
+        # Ensure viewport maintains aspect ratio of target resolution
+        target_width, target_height = target_resolution
+        target_aspect = target_width / target_height
+        start_viewport_height = start_viewport_width / target_aspect
+        end_viewport_height = end_viewport_width / target_aspect
+
+        # Ensure viewport doesn't exceed image bounds
+        if start_viewport_height > img_height:
+            start_viewport_height = img_height
+            start_viewport_width = start_viewport_height * target_aspect
+        if end_viewport_height > img_height:
+            end_viewport_height = img_height
+            end_viewport_width = end_viewport_height * target_aspect
+
+        # Calculate start and end viewport positions (top-left coordinates)
+        start_left = max(0, img_width * start_x_rel - start_viewport_width / 2)
+        start_top = max(0, img_height * start_y_rel - start_viewport_height / 2)
+        end_left = max(0, img_width * end_x_rel - end_viewport_width / 2)
+        end_top = max(0, img_height * end_y_rel - end_viewport_height / 2)
+
+        # Ensure viewport doesn't go beyond right/bottom edges
+        start_left = min(start_left, img_width - start_viewport_width)
+        start_top = min(start_top, img_height - start_viewport_height)
+        end_left = min(end_left, img_width - end_viewport_width)
+        end_top = min(end_top, img_height - end_viewport_height)
+
+        # 작업 해상도: 가장 작은 뷰포트가 출력 너비를 채우는 데 필요한 만큼만 (업스케일은 하지 않음)
+        scale = min(1.0, target_width / min(start_viewport_width, end_viewport_width))
+        if scale < 1.0:
+            working_size = (max(1, round(img_width * scale)), max(1, round(img_height * scale)))
+            img.draft("RGB", working_size)  # JPEG: 1/2, 1/4, 1/8 축소 디코딩
+            img = img.convert("RGB")
+            if img.size != working_size:
+                img = img.resize(working_size, Image.LANCZOS)
+        else:
+            img = img.convert("RGB")
+        img.load()
+        self.image = img
+
+        # 뷰포트 좌표를 작업 해상도 기준으로 변환
+        sx = img.size[0] / img_width
+        sy = img.size[1] / img_height
+        self._start = (start_left * sx, start_top * sy, start_viewport_width * sx, start_viewport_height * sy)
+        self._end = (end_left * sx, end_top * sy, end_viewport_width * sx, end_viewport_height * sy)
+
+    def frame(self, t: float) -> np.ndarray:
+        # Linear interpolation for position and size
+        progress = min(max(t / self.duration, 0.0), 1.0) if self.duration > 0 else 0.0
+        left, top, width, height = (s + (e - s) * progress for s, e in zip(self._start, self._end))
+
+        # 출력 픽셀 (x, y) -> 작업 이미지 (left + x * width / W, top + y * height / H)
+        # resize(box=...)는 소수점 뷰포트를 잘라내기 없이 분리형(separable) 필터 한 번으로 샘플링함
+        frame = self.image.resize(self.target_resolution, self.resample,
+                                  box=(left, top, left + width, top + height))
+        return np.asarray(frame)
+
 def create_ken_burns_clip(image_path: str, duration: float, target_resolution: tuple,
                            start_zoom: float = 1.0, end_zoom: float = 1.2,
                            start_x_rel: float = 0.5, start_y_rel: float = 0.5, # relative center position 0 to 1
-                           end_x_rel: float = 0.5, end_y_rel: float = 0.5) -> ImageClip:
+                           end_x_rel: float = 0.5, end_y_rel: float = 0.5,
+                           quality: Optional[str] = None) -> VideoClip:
     """
     Creates a Ken Burns effect clip from an image by smoothly zooming and panning.
 
-    This optimized version calculates a viewport to crop from the original image
-    and then resizes the cropped portion to the target resolution, which is
-    generally more efficient than resizing the entire image and then positioning.
+    The source image is downsampled once to a working resolution just large enough
+    for the maximum zoom, and each frame is produced with a single affine resample
+    (see KenBurnsRenderer).
 
     Args:
         image_path (str): Path to the input image file.
@@ -46,77 +143,108 @@ def create_ken_burns_clip(image_path: str, duration: float, target_resolution: t
         start_y_rel (float): Relative Y-coordinate (0.0 to 1.0) of the viewport center at the start.
         end_x_rel (float): Relative X-coordinate (0.0 to 1.0) of the viewport center at the end.
         end_y_rel (float): Relative Y-coordinate (0.0 to 1.0) of the viewport center at the end.
+        quality (str): "high" (lanczos), "fast" (bilinear) or "draft" (nearest).
+                       Defaults to config.KEN_BURNS_QUALITY.
     
     Returns:
-        ImageClip: The resulting clip with the Ken Burns effect applied.
+        VideoClip: The resulting clip with the Ken Burns effect applied.
     """
-    # Load the image once using PIL for efficiency
-    img = Image.open(image_path)
-    img_width, img_height = img.size
-
-    # Calculate initial and final viewport sizes based on zoom levels
-    # Viewport size = original size / zoom (larger zoom means smaller viewport = zoomed in)
-    start_viewport_width = img_width / start_zoom
-    start_viewport_height = img_height / start_zoom
-    end_viewport_width = img_width / end_zoom
-    end_viewport_height = img_height / end_zoom
-
-    # Ensure viewport maintains aspect ratio of target resolution
-    target_width, target_height = target_resolution
-    target_aspect = target_width / target_height
-
-    # Adjust viewport heights to match target aspect ratio (assuming width is limiting)
-    start_viewport_height = start_viewport_width / target_aspect
-    end_viewport_height = end_viewport_width / target_aspect
-
-    # Ensure viewport doesn't exceed image bounds
-    if start_viewport_height > img_height:
-        start_viewport_height = img_height
-        start_viewport_width = start_viewport_height * target_aspect
-    if end_viewport_height > img_height:
-        end_viewport_height = img_height
-        end_viewport_width = end_viewport_height * target_aspect
-
-    # Calculate start and end viewport positions (top-left coordinates)
-    start_center_x = img_width * start_x_rel
-    start_center_y = img_height * start_y_rel
-    end_center_x = img_width * end_x_rel
-    end_center_y = img_height * end_y_rel
-
-    start_left = max(0, start_center_x - start_viewport_width / 2)
-    start_top = max(0, start_center_y - start_viewport_height / 2)
-    end_left = max(0, end_center_x - end_viewport_width / 2)
-    end_top = max(0, end_center_y - end_viewport_height / 2)
-
-    # Ensure viewport doesn't go beyond right/bottom edges
-    if start_left + start_viewport_width > img_width:
-        start_left = img_width - start_viewport_width
-    if start_top + start_viewport_height > img_height:
-        start_top = img_height - start_viewport_height
-    if end_left + end_viewport_width > img_width:
-        end_left = img_width - end_viewport_width
-    if end_top + end_viewport_height > img_height:
-        end_top = img_height - end_viewport_height
-
-    def make_frame(t):
-        # Linear interpolation for position and size
-        progress = t / duration
-        current_left = start_left + (end_left - start_left) * progress
-        current_top = start_top + (end_top - start_top) * progress
-        current_width = start_viewport_width + (end_viewport_width - start_viewport_width) * progress
-        current_height = start_viewport_height + (end_viewport_height - start_viewport_height) * progress
+    renderer = KenBurnsRenderer(image_path, duration, target_resolution,
+                                start_zoom, end_zoom, start_x_rel, start_y_rel,
+                                end_x_rel, end_y_rel, quality=quality)
+    return VideoClip(renderer.frame, duration=duration)
+
+OVERLAY_CACHE_VERSION = 1  # 자막 렌더링 방식이 바뀌면 올려서 기존 캐시 무효화
+WRAP_EXACT_MARGIN_RATIO = 0.5  # 줄 너비가 한계 ±(글자 크기 x 비율) 이내면 bbox로 정확히 재측정
 
-        # Crop the viewport from the original image
-        cropped_img = img.crop((current_left, current_top, current_left + current_width, current_top + current_height))
+_overlay_paths = {}  # 캐시 키 -> 자막 PNG 경로 (메모리)
+_overlay_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=32)
+def get_font(font_path: str, font_size: int):
+    """TrueType 폰트 객체를 (경로, 크기)별로 한 번만 로드합니다."""
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except IOError:
+        print(f"Warning: Font '{font_path}' not found. Using default font.")
+        return ImageFont.load_default()
 
-        # Resize to target resolution using LANCZOS for high quality
-        resized_img = cropped_img.resize(target_resolution, Image.LANCZOS)
+@functools.lru_cache(maxsize=8192)
+def _text_advance(font, text: str) -> float:
+    return font.getlength(text)
 
-        # Convert to numpy array for MoviePy
-        return np.array(resized_img)
+@functools.lru_cache(maxsize=8192)
+def _text_bbox(font, text: str) -> tuple:
+    return font.getbbox(text)
 
-    # Create the ImageClip with the make_frame function
-    return ImageClip(make_frame, duration=duration)
+def _wrap_words(font, words: list, limit: float, font_size: int) -> list:
+    """
+    단어 너비(메모이즈)를 누적해 줄바꿈합니다. 줄마다 앞부분 전체를 다시 측정하지 않으므로 단어 수에 선형이고,
+    한계에 가까운 경우에만 기존과 같은 bbox 측정으로 판정해 줄바꿈 결과를 동일하게 유지합니다.
+    """
+    space = _text_advance(font, ' ')
+    margin = font_size * WRAP_EXACT_MARGIN_RATIO
+    lines = []
+    current_line = []
+    current_width = 0.0
+
+    for word in words:
+        word_width = _text_advance(font, word.replace('*', ''))
+        width = current_width + space + word_width if current_line else word_width
+        if abs(width - limit) <= margin:
+            bbox = _text_bbox(font, ' '.join(current_line + [word]).replace('*', ''))
+            fits = (bbox[2] - bbox[0]) <= limit
+        else:
+            fits = width <= limit
+
+        if fits:
+            current_line.append(word)
+            current_width = width
+        elif current_line:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+        else:
+            lines.append(word)
+            current_line = []
+            current_width = 0.0
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+def _overlay_cache_key(text: str, font_path: str, style: dict) -> str:
+    """자막 텍스트 + 폰트 파일 + 스타일 설정으로 만든 내용 해시"""
+    try:
+        font_mtime = os.path.getmtime(font_path)
+    except OSError:
+        font_mtime = None
+    payload = json.dumps({
+        "version": OVERLAY_CACHE_VERSION,
+        "text": text,
+        "font": os.path.abspath(font_path),
+        "font_mtime": font_mtime,
+        **style,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def prune_overlay_cache(max_files: Optional[int] = None) -> None:
+    """자막 캐시 파일 수가 max_files를 넘으면 가장 오래 사용하지 않은 것부터 삭제합니다."""
+    max_files = max_files or getattr(config, 'OVERLAY_CACHE_MAX_FILES', 1000)
+    try:
+        entries = [entry for entry in os.scandir(config.OVERLAY_CACHE_DIR) if entry.name.endswith(".png")]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    with _overlay_lock:
+        for entry in entries[:len(entries) - max_files]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        for key in [k for k, path in _overlay_paths.items() if not os.path.exists(path)]:
+            del _overlay_paths[key]
 
 def generate_text_overlay(text: str, font_path: str, font_size: int, color: str = "white",
                           stroke_color: str = "black", stroke_width: int = 2,
@@ -129,34 +257,31 @@ def generate_text_overlay(text: str, font_path: str, font_size: int, color: str
     - 자동 줄바꿈 지원
     - *강조* 텍스트를 인식하여 highlight_color 적용
     - 반투명 둥근 모서리 배경 박스 지원
+    같은 텍스트와 스타일의 자막은 내용 해시로 캐시되어 다시 그리지 않고 기존 PNG 경로를 반환합니다.
     """
-    try:
-        font = ImageFont.truetype(font_path, font_size)
-    except IOError:
-        print(f"Warning: Font '{font_path}' not found. Using default font.")
-        font = ImageFont.load_default()
-
-    # 1. 텍스트 줄바꿈 처리
-    lines = []
-    # 텍스트에서 강조 표시를 무시하고 너비를 계산하기 위해 임시로 제거
-    clean_text = text.replace('*', '')
-    words = text.split()
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word]).replace('*', '')
-        bbox = font.getbbox(test_line)
-        if (bbox[2] - bbox[0]) <= max_width - (bg_padding * 2):
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-            else:
-                lines.append(word)
-                current_line = []
-    if current_line:
-        lines.append(' '.join(current_line))
+    style = {
+        "font_size": font_size, "color": color, "stroke_color": stroke_color, "stroke_width": stroke_width,
+        "highlight_color": highlight_color, "bg_enabled": bg_enabled, "bg_color": bg_color,
+        "bg_padding": bg_padding, "border_radius": border_radius,
+        "max_width": max_width, "line_spacing": line_spacing,
+    }
+    cache_key = _overlay_cache_key(text, font_path, style)
+    overlay_path = os.path.join(config.OVERLAY_CACHE_DIR, f"overlay_{cache_key}.png")
+
+    with _overlay_lock:
+        cached_path = _overlay_paths.get(cache_key)
+    if cached_path and os.path.exists(cached_path):
+        return cached_path
+    if os.path.exists(overlay_path):
+        os.utime(overlay_path)  # LRU 정리를 위해 사용 시각 갱신
+        with _overlay_lock:
+            _overlay_paths[cache_key] = overlay_path
+        return overlay_path
+
+    font = get_font(font_path, font_size)
+
+    # 1. 텍스트 줄바꿈 처리 (강조 표시는 무시하고 너비 계산)
+    lines = _wrap_words(font, text.split(), max_width - (bg_padding * 2), font_size)
 
     # 2. 텍스트 크기 측정 (최대 너비와 총 높이)
     line_infos = []
@@ -165,7 +290,7 @@ def generate_text_overlay(text: str, font_path: str, font_size: int, color: str
     
     for line in lines:
         clean_line = line.replace('*', '')
-        bbox = font.getbbox(clean_line)
+        bbox = _text_bbox(font, clean_line)
         w = bbox[2] - bbox[0]
         h = bbox[3] - bbox[1]
         line_infos.append({'text': line, 'width': w, 'height': h})
@@ -237,16 +362,19 @@ def generate_text_overlay(text: str, font_path: str, font_size: int, color: str
                 draw.text((x_cursor, current_y), part_text, font=font, fill=current_color)
             
             # 다음 파트를 위해 x_cursor 이동
-            part_bbox = font.getbbox(part_text)
+            part_bbox = _text_bbox(font, part_text)
             x_cursor += part_bbox[2] - part_bbox[0]
             
         current_y += info['height'] * line_spacing
 
-    # 6. 저장 및 경로 반환
-    temp_dir = "temp_overlays"
-    os.makedirs(temp_dir, exist_ok=True)
-    overlay_path = os.path.join(temp_dir, f"overlay_{uuid.uuid4().hex}.png")
-    img.save(overlay_path)
+    # 6. 캐시에 저장 및 경로 반환 (임시 파일에 쓴 뒤 교체해 동시 생성에도 안전)
+    os.makedirs(config.OVERLAY_CACHE_DIR, exist_ok=True)
+    temp_path = f"{overlay_path}.{uuid.uuid4().hex}.part"
+    img.save(temp_path, format="PNG")
+    os.replace(temp_path, overlay_path)
+    with _overlay_lock:
+        _overlay_paths[cache_key] = overlay_path
+    prune_overlay_cache()
     
     return overlay_path
 
@@ -261,14 +389,47 @@ def apply_transition(clip: VideoFileClip, transition_type: str, duration: float
     else:
         return clip  # 기본: 컷
 
+def create_scene_overlay(on_screen_text: str, scale: float = 1.0) -> Optional[str]:
+    """
+    장면 자막을 설정된 스타일의 PNG로 렌더링합니다. 자막이 없거나 실패하면 None.
+    scale: 출력 해상도 배율 (초안 렌더링은 글꼴/여백을 줄여 작은 이미지로 직접 래스터화)
+    """
+    if not on_screen_text:
+        return None
+
+    def scaled(value):
+        return max(1, round(value * scale)) if value else value
+
+    try:
+        return generate_text_overlay(
+            on_screen_text,
+            font_path=getattr(config, 'FONT_PATH', "assets/fonts/NotoSansKR-Regular.ttf"),
+            font_size=scaled(config.DEFAULT_FONT_SIZE),
+            stroke_width=scaled(config.TEXT_STROKE_WIDTH),
+            color=config.TEXT_COLOR,
+            stroke_color=config.TEXT_STROKE_COLOR,
+            highlight_color=getattr(config, 'HIGHLIGHT_TEXT_COLOR', 'yellow'),
+            bg_enabled=getattr(config, 'TEXT_BG_ENABLED', True),
+            bg_color=getattr(config, 'TEXT_BG_COLOR', (0, 0, 0, 180)),
+            bg_padding=scaled(getattr(config, 'TEXT_BG_PADDING', 40)),
+            border_radius=scaled(getattr(config, 'TEXT_BORDER_RADIUS', 25)),
+            max_width=scaled(1000)
+        )
+    except Exception as e:
+        print(f"  ⚠️ 텍스트 오버레이 생성 실패: {e}")
+        return None
+
 def assemble_reel(scenes_data: List[dict], output_filepath: str,
                   final_duration: Optional[float] = None,
-                  bgm_path: Optional[str] = None) -> Optional[str]:
+                  bgm_path: Optional[str] = None,
+                  backend: Optional[str] = None,
+                  draft: bool = False) -> Optional[str]:
     """
     장면 데이터를 받아 최종 릴스 영상을 조립합니다.
+    backend: "segments"(장면별 병렬 렌더링 후 연결), "ffmpeg"(단일 filter_complex 렌더링) 또는 "moviepy".
+             ffmpeg 계열이 실패하면 MoviePy로 폴백합니다. 기본값은 config.RENDER_BACKEND
+    draft: True면 미리보기용 저해상도 초안으로 렌더링합니다 (ffmpeg 백엔드 전용, 같은 믹싱 오디오 사용)
     """
-    processed_clips = []
-    
     # 1. 길이 정규화 (사용자가 지정한 총 길이에 맞춤)
     total_scene_duration = sum(scene.get('duration', 0) for scene in scenes_data)
     if final_duration and total_scene_duration > 0:
@@ -277,14 +438,59 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
         for scene in scenes_data:
             scene['duration'] = scene.get('duration', 0) * ratio
 
-    # 2. 개별 클립 생성
-    current_time_offset = 0.0
+    # 2. 자막 이미지 생성 (두 렌더링 백엔드 공용)
+    render_format = get_render_format(draft)
+    overlay_scale = render_format["width"] / config.REELS_WIDTH
+    overlay_paths = [create_scene_overlay(scene.get('on_screen_text', ''), overlay_scale) for scene in scenes_data]
 
+    # 인제스트 단계에서 릴스 규격으로 변환된 영상이 있으면 사용 (아직 변환 중이면 기다리지 않고 원본 사용)
+    # 초안은 원본(작은 렌디션)을 바로 축소하는 편이 빠르므로 사용하지 않음
+    render_scenes = []
     for scene in scenes_data:
+        normalized_path = None if draft else get_normalized_clip(scene.get('media_path'), scene.get('duration', 5))
+        if normalized_path:
+            scene = {**scene, 'media_path': normalized_path, 'normalized': True}
+        render_scenes.append(scene)
+    normalized_count = sum(1 for scene in render_scenes if scene.get('normalized'))
+    if normalized_count:
+        print(f"  [인제스트] 정규화된 영상 {normalized_count}/{len(render_scenes)}개 사용")
+
+    # 장면 길이를 프레임 단위로 맞춰 영상과 믹싱 오디오의 장면 경계를 일치시킴
+    render_scenes = quantize_scene_durations(render_scenes, render_format["fps"])
+
+    # 3. 최종 오디오 믹싱 (나레이션 + 더킹된 배경음악 + 효과음, 모든 백엔드 공용)
+    mixed_audio_path = mix_reel_audio(render_scenes, output_filepath + ".mix.wav", bgm_path=bgm_path)
+    try:
+        backend = backend or getattr(config, 'RENDER_BACKEND', "segments")
+        if draft and backend not in ("segments", "ffmpeg"):
+            backend = "segments"
+        if backend in ("segments", "ffmpeg") and mixed_audio_path:
+            render = render_reel_segments if backend == "segments" else render_reel_ffmpeg
+            rendered = render(render_scenes, output_filepath, overlay_paths=overlay_paths,
+                              audio_path=mixed_audio_path, draft=draft)
+            if rendered:
+                print(f"릴스 {'초안' if draft else '영상'} 생성 완료: {rendered}")
+                return rendered
+            if draft:
+                print("  ❌ 초안 렌더링 실패 (초안은 ffmpeg 렌더러 전용)")
+                return None
+            print("  ⚠️ ffmpeg 렌더링 실패, MoviePy로 다시 렌더링합니다.")
+
+        return _assemble_with_moviepy(render_scenes, overlay_paths, output_filepath, bgm_path, mixed_audio_path)
+    finally:
+        if mixed_audio_path and os.path.exists(mixed_audio_path):
+            os.remove(mixed_audio_path)
+
+def _assemble_with_moviepy(render_scenes: List[dict], overlay_paths: List[Optional[str]], output_filepath: str,
+                           bgm_path: Optional[str] = None, mixed_audio_path: Optional[str] = None) -> Optional[str]:
+    """MoviePy로 클립을 합성해 렌더링합니다. mixed_audio_path가 있으면 최종 오디오로 그대로 사용합니다."""
+    processed_clips = []
+
+    # 4. 개별 클립 생성 (MoviePy)
+    for scene, overlay_path in zip(render_scenes, overlay_paths):
         media_path = scene.get('media_path')
         duration = scene.get('duration', 5)
         narration_path = scene.get('audio_path')
-        on_screen_text = scene.get('on_screen_text', '')
         transition = scene.get('transition', 'cut')
 
         if media_path and os.path.exists(media_path):
@@ -296,12 +502,13 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
                     )
                 else:
                     clip = VideoFileClip(media_path).subclip(0, duration)
-                    # 모든 영상을 9:16 비율로 강제 조정
-                    clip = clip.resize(height=config.REELS_HEIGHT)
-                    if clip.w < config.REELS_WIDTH:
-                        clip = clip.resize(width=config.REELS_WIDTH)
-                    clip = clip.crop(x_center=clip.w / 2, y_center=clip.h / 2,
-                                     width=config.REELS_WIDTH, height=config.REELS_HEIGHT)
+                    # 모든 영상을 9:16 비율로 강제 조정 (정규화된 영상은 이미 규격에 맞음)
+                    if not scene.get('normalized'):
+                        clip = clip.resize(height=config.REELS_HEIGHT)
+                        if clip.w < config.REELS_WIDTH:
+                            clip = clip.resize(width=config.REELS_WIDTH)
+                        clip = clip.crop(x_center=clip.w / 2, y_center=clip.h / 2,
+                                         width=config.REELS_WIDTH, height=config.REELS_HEIGHT)
             except Exception as e:
                 print(f"  ⚠️ 미디어 로딩 실패 ({media_path}): {e}")
                 clip = ColorClip((config.REELS_WIDTH, config.REELS_HEIGHT), color=(0,0,0), duration=duration)
@@ -309,11 +516,13 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
             print(f"  ⚠️ 미디어 파일 없음, 검은 화면으로 대체: {media_path}")
             clip = ColorClip((config.REELS_WIDTH, config.REELS_HEIGHT), color=(0,0,0), duration=duration)
 
-        if narration_path and os.path.exists(narration_path):
+        if not mixed_audio_path and narration_path and os.path.exists(narration_path):
             try:
                 # 볼륨 3.0배 증폭, 샘플레이트 44100Hz 고정
+                # (길이는 MP3 헤더 기준 정확한 값 사용 - ffmpeg 메타데이터 추정치보다 정확)
+                narration_duration = get_audio_duration(narration_path)
                 audio = AudioFileClip(narration_path).volumex(3.0).set_fps(44100)
-                if audio.duration > duration:
+                if (narration_duration or audio.duration) > duration:
                     audio = audio.subclip(0, duration)
                 
                 # [복구] 클립에 오디오 즉시 입히기 (가장 안정적인 방식)
@@ -323,21 +532,8 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
                 print(f"    ⚠️ 나레이션 로드 실패: {e}")
         
         # 자막 추가
-        if on_screen_text:
+        if overlay_path:
             try:
-                overlay_path = generate_text_overlay(
-                    on_screen_text,
-                    font_path=getattr(config, 'FONT_PATH', "assets/fonts/NotoSansKR-Regular.ttf"),
-                    font_size=config.DEFAULT_FONT_SIZE,
-                    stroke_width=config.TEXT_STROKE_WIDTH,
-                    color=config.TEXT_COLOR,
-                    stroke_color=config.TEXT_STROKE_COLOR,
-                    highlight_color=getattr(config, 'HIGHLIGHT_TEXT_COLOR', 'yellow'),
-                    bg_enabled=getattr(config, 'TEXT_BG_ENABLED', True),
-                    bg_color=getattr(config, 'TEXT_BG_COLOR', (0, 0, 0, 180)),
-                    bg_padding=getattr(config, 'TEXT_BG_PADDING', 40),
-                    border_radius=getattr(config, 'TEXT_BORDER_RADIUS', 25)
-                )
                 text_position = ("center", config.REELS_HEIGHT * config.TEXT_POSITION_Y_RATIO)
                 text_clip = ImageClip(overlay_path).set_duration(duration).set_position(text_position)
                 
@@ -352,7 +548,6 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
         clip = apply_transition(clip, transition)
         # 비디오 클립 오디오는 일단 제거 (나중에 통합 합성)
         processed_clips.append(clip)
-        current_time_offset += duration
 
     try:
         final_video = concatenate_videoclips(processed_clips, method="chain")
@@ -361,8 +556,11 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
         print(f"  ❌ 클립 연결 실패: {e}")
         return None
 
-    # 3. 배경음악 및 SFX 합성 (최종 연결된 비디오에 믹싱)
-    if bgm_path and os.path.exists(bgm_path):
+    # 5. 최종 오디오: 믹싱된 WAV 사용 (믹싱에 실패한 경우에만 배경음악 및 SFX 레이어 합성)
+    if mixed_audio_path:
+        final_video = final_video.set_audio(AudioFileClip(mixed_audio_path).set_duration(final_video.duration))
+        print("  [오디오] 믹싱된 최종 오디오 적용")
+    elif bgm_path and os.path.exists(bgm_path):
         try:
             print(f"  [배경음악] {bgm_path} 로드 중...")
             bgm_clip = AudioFileClip(bgm_path).volumex(0.6).set_fps(44100).audio_loop(duration=final_video.duration).set_start(0)
@@ -378,7 +576,7 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
                         whoosh_clip_base = whoosh_clip_base.subclip(0, 1.5)
                     
                     sfx_time = 0
-                    for idx, scene in enumerate(scenes_data):
+                    for idx, scene in enumerate(render_scenes):
                         if idx > 0:
                             sfx_layers.append(whoosh_clip_base.set_start(sfx_time - 0.2))
                         sfx_time += scene.get('duration', 0)
@@ -420,9 +618,11 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
 
         print(f"  [최종 인코딩 준비] 길이: {final_video.duration:.2f}s, 오디오 존재: {final_video.audio is not None}")
         
-        # ffmpeg_params로 오디오 비트레이트 강제 지정
+        # ffmpeg_params로 오디오 비트레이트 강제 지정 + 인코더 프로필의 CRF/비트레이트/tune 적용
+        profile = get_encoder_profile()
+        quality_params = encoder_quality_args({**profile, "preset": None})
         final_video.write_videofile(output_filepath, 
-                                     codec=getattr(config, 'FFMPEG_VIDEO_CODEC', config.REELS_CODEC), 
+                                     codec=profile["codec"], 
                                      audio_codec=config.REELS_AUDIO_CODEC, 
                                      audio=True,
                                      temp_audiofile="temp-audio.m4a",
@@ -430,9 +630,9 @@ def assemble_reel(scenes_data: List[dict], output_filepath: str,
                                      fps=config.REELS_FPS,
                                      verbose=False,
                                      logger=None,
-                                     ffmpeg_params=["-b:a", "192k"], # 오디오 비트레이트 상향
-                                     preset="ultrafast" if not getattr(config, 'GPU_ACCELERATION', False) else None,
-                                     threads=os.cpu_count())
+                                     ffmpeg_params=["-b:a", "192k", *quality_params], # 오디오 비트레이트 상향
+                                     preset=profile["preset"],
+                                     threads=profile["threads"] or os.cpu_count())
         
         # 생성된 파일의 오디오 존재 여부 즉시 확인 (ffprobe 활용)
         import subprocess